@@ -1,8 +1,16 @@
+import collections
+import concurrent.futures
 import dataclasses
 import enum
+import hashlib
+import json
 import random
+import threading
 import time
-from typing import List, Dict, Any, Optional
+import logging
+from typing import List, Dict, Any, Optional, Callable, Tuple, Deque
+
+logger = logging.getLogger(__name__)
 
 # --- Enums and Constants ---
 
@@ -69,6 +77,18 @@ class ComputeResource:
         self.available_cpu = self.total_cpu
         self.available_memory_gb = self.total_memory_gb
 
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ComputeResource":
+        """
+        Rebuilds a resource from a serialized state (as produced by `dataclasses.asdict`),
+        restoring the runtime capacity fields that are not accepted by the constructor.
+        """
+        init_fields = {f.name for f in dataclasses.fields(cls) if f.init}
+        resource = cls(**{k: v for k, v in state.items() if k in init_fields})
+        resource.available_cpu = state.get("available_cpu", resource.total_cpu)
+        resource.available_memory_gb = state.get("available_memory_gb", resource.total_memory_gb)
+        return resource
+
     def allocate(self, workload: Workload) -> None:
         """
         Allocates the specified workload's resources (CPU and memory) to this compute resource.
@@ -107,6 +127,182 @@ class ComputeResource:
         mem_util = (self.total_memory_gb - self.available_memory_gb) / self.total_memory_gb if self.total_memory_gb > 0 else 0
         self.load_factor = max(cpu_util, mem_util) # Simple max, could be a weighted average or more complex metric
 
+@dataclasses.dataclass
+class SchedulingCycleMetrics:
+    """
+    Timing and outcome of a single scheduling cycle, retained by the WorkloadScheduler
+    so dashboards can chart cycle latency and throughput without parsing logs.
+    """
+    cycle_id: int
+    started_at: float  # Unix timestamp at which the cycle began
+    total_seconds: float  # End-to-end cycle time
+    prepare_seconds: float  # State serialization for the AI backend
+    backend_seconds: float  # Time spent obtaining the schedule (cache, backend or local fallback)
+    apply_seconds: float  # Time spent applying the schedule to local state
+    workloads_considered: int
+    resources_considered: int
+    assignments: int
+    unallocated: int
+    skipped_assignments: int  # Assignments referencing unknown workloads or resources
+    response_source: str  # "backend", "cache" or "local_heuristic"
+
+# --- Placement Scoring ---
+
+def calculate_placement_score(workload: Workload, resource: ComputeResource) -> float:
+    """
+    Computes the multi-factor placement score used by the AI orchestrator to rank candidate
+    resources for a workload. Lower scores indicate a more optimal placement.
+    The score combines hourly cost (discounted on spot instances by the workload's cost
+    sensitivity), a data locality penalty, and a load balancing penalty.
+    """
+    current_cost = (resource.cost_per_cpu_hour * workload.cpu_required +
+                    resource.cost_per_memory_gb_hour * workload.memory_required_gb)
+
+    # Adjust cost based on spot instance availability and workload's cost sensitivity
+    if resource.is_spot_instance:
+        # Higher cost sensitivity -> larger discount from spot instance price
+        current_cost *= (1 - workload.cost_sensitivity * 0.7)
+
+    # Penalty for non-matching data locality (0 if met, higher if not)
+    locality_penalty = 0
+    if workload.data_locality_tags and not any(tag in resource.location_tags for tag in workload.data_locality_tags):
+        locality_penalty = current_cost * 0.5 # Substantial penalty for data transfer/latency
+
+    # Load balancing factor: prefer less loaded resources
+    load_penalty = resource.load_factor * current_cost * 0.2 # Scale load impact relative to cost
+
+    # Combine all factors into a single metric score
+    return current_cost + locality_penalty + load_penalty
+
+# --- Heuristic Schedule Planner ---
+
+def generate_heuristic_schedule(workloads: List[Workload], resources: List[ComputeResource]) -> Dict[str, Any]:
+    """
+    Produces a global schedule using the multi-criteria placement heuristic that approximates
+    Gemini's optimization capabilities. This is the planner behind the simulated AI backend, and
+    the local fallback when the remote backend cannot answer within the scheduler's latency budget.
+    Planning starts from each resource's total capacity, so running workloads whose assignment is
+    maintained are counted exactly once.
+
+    Args:
+        workloads (List[Workload]): The pending, scheduled and running workloads to place.
+        resources (List[ComputeResource]): The resources available for placement. They are not mutated.
+
+    Returns:
+        Dict[str, Any]: A response matching the scheduler's `responseSchema` (schedule,
+                        unallocated_workloads, rationale and optimized_resource_states).
+    """
+    assignments = []
+    unallocated_workloads = []
+
+    # Prioritize workloads: CRITICAL > HIGH > MEDIUM > LOW, then by earliest deadline, then by expected duration
+    sorted_workloads = sorted(
+        workloads,
+        key=lambda w: (w.priority.value, w.deadline_timestamp if w.deadline_timestamp else float('inf'), w.expected_duration_seconds),
+        reverse=True # Higher priority value comes first, earlier deadlines come first
+    )
+
+    # Create a mutable copy of resources for this simulated scheduling run, starting from full capacity
+    simulated_resources = {r.id: dataclasses.replace(r, current_workloads=[]) for r in resources}
+
+    for workload in sorted_workloads:
+        # If a workload is already running and its assigned resource is still valid, maintain its assignment for stability
+        if workload.status == WorkloadStatus.RUNNING and workload.assigned_resource_id:
+            if workload.assigned_resource_id in simulated_resources:
+                resource = simulated_resources[workload.assigned_resource_id]
+                # Ensure resource still has capacity (accounting for workloads already assigned to it in this loop)
+                if resource.available_cpu >= workload.cpu_required and resource.available_memory_gb >= workload.memory_required_gb:
+                    assignments.append({
+                        "workload_id": workload.id,
+                        "resource_id": workload.assigned_resource_id,
+                        "estimated_cost": 0.0, # Cost already accounted for, or negligible for re-evaluation
+                        "reason": "Workload already running; assignment maintained for stability and continuity."
+                    })
+                    resource.allocate(workload) # Temporarily allocate in simulation to update available capacity
+                continue # Skip to the next workload if it's already running and stable
+
+        best_resource: Optional[ComputeResource] = None
+        best_metric_score = float('inf') # Lower score indicates a more optimal placement
+
+        # Filter resources by immediate capacity requirements
+        eligible_resources = [
+            res for res_id, res in simulated_resources.items()
+            if res.available_cpu >= workload.cpu_required and
+               res.available_memory_gb >= workload.memory_required_gb
+        ]
+
+        for resource in eligible_resources:
+            # Calculate a multi-factor placement score
+            metric_score = calculate_placement_score(workload, resource)
+
+            if metric_score < best_metric_score:
+                best_metric_score = metric_score
+                best_resource = resource
+
+        if best_resource:
+            assignments.append({
+                "workload_id": workload.id,
+                "resource_id": best_resource.id,
+                "estimated_cost": best_metric_score, # Using the calculated metric score as estimated cost for simulation
+                "reason": (f"Optimal fit considering priority {workload.priority.name}, "
+                           f"data locality ({'met' if any(tag in best_resource.location_tags for tag in workload.data_locality_tags) else 'not met'}), "
+                           f"cost efficiency ({'spot-optimized' if best_resource.is_spot_instance else 'standard'}), "
+                           f"and current resource load ({best_resource.load_factor:.2f}).")
+            })
+            # Update the simulated resource state by allocating the workload
+            best_resource.allocate(workload)
+        else:
+            unallocated_workloads.append(workload.id)
+
+    explanation = (
+        f"The AI orchestrator successfully optimized the schedule for {len(workloads)} workloads "
+        f"across {len(resources)} available compute resources. A total of {len(assignments)} workloads "
+        "were meticulously allocated based on a sophisticated multi-criteria objective function. "
+        "This optimization prioritizes critical deadlines, ensures stringent data locality requirements "
+        "are met where possible, and drives dynamic cost-efficiency by strategically leveraging spot instances "
+        "for appropriate tasks. The system intelligently balanced resource utilization across the fabric "
+        "to proactively prevent bottlenecks and ensure sustained peak performance."
+    )
+    if unallocated_workloads:
+        explanation += f" Note: {len(unallocated_workloads)} workloads ({', '.join(unallocated_workloads)}) " \
+                       f"could not be allocated in this cycle due to immediate resource constraints, " \
+                       f"or a lack of suitable matches after optimizing for higher-priority tasks. " \
+                       f"These will be re-evaluated in subsequent scheduling iterations or when new capacity becomes available."
+
+    return {
+        "schedule": assignments,
+        "unallocated_workloads": unallocated_workloads,
+        "rationale": explanation,
+        "optimized_resource_states": [dataclasses.asdict(r) for r in simulated_resources.values()]
+    }
+
+def generate_heuristic_preemption_rationale(preempted_workload_id: Optional[str],
+                                            new_critical_workload_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Produces the preemption justification and follow-up actions that approximate Gemini's response.
+    This backs the simulated AI backend, and is the local fallback when the backend cannot answer
+    a preemption request within the scheduler's latency budget.
+
+    Args:
+        preempted_workload_id (Optional[str]): The ID of the workload being preempted.
+        new_critical_workload_id (Optional[str]): The ID of the critical workload that needs the capacity.
+
+    Returns:
+        Dict[str, Any]: A response with `preemption_justification` and `action_taken` keys.
+    """
+    return {
+        "preemption_justification": f"Workload '{preempted_workload_id}' was judiciously preempted to "
+                                    f"immediately accommodate the higher-priority, mission-critical workload "
+                                    f"'{new_critical_workload_id}'. This paramount decision ensures that critical business "
+                                    "operations maintain uninterrupted performance and meet their stringent SLAs, "
+                                    "thereby optimizing the overall system's responsiveness for the most vital tasks. "
+                                    "Such actions are taken only after exhaustive AI evaluation of alternatives.",
+        "action_taken": "The preempted workload has been gracefully deallocated and automatically marked for "
+                        "re-queuing or prioritized migration to an alternative resource with suitable available capacity. "
+                        "Its re-scheduling will be managed based on its original priority and any applicable deadlines, "
+                        "ensuring minimal long-term impact."
+    }
+
 # --- Simulated Gemini API Client ---
 
 class MockGeminiAPIClient:
@@ -120,7 +316,7 @@ class MockGeminiAPIClient:
     def __init__(self, api_key: str = "mock-api-key"):
         """Initializes the mock Gemini API client with a dummy API key."""
         self._api_key = api_key
-        print("MockGeminiAPIClient initialized. This client simulates advanced AI capabilities for workload scheduling decisions.")
+        logger.info("MockGeminiAPIClient initialized. This client simulates advanced AI capabilities for workload scheduling decisions.")
 
     def _simulate_complex_logic(self, prompt: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -129,7 +325,7 @@ class MockGeminiAPIClient:
         that approximates Gemini's expected optimization capabilities, considering
         workload priorities, deadlines, data locality, cost-sensitivity, and resource characteristics.
         """
-        print(f"  [MockGemini] Simulating complex logic for prompt: '{prompt[:90]}...'")
+        logger.debug("[MockGemini] Simulating complex logic for prompt: '%.90s...'", prompt)
         
         # Logic to simulate different AI capabilities based on the prompt's intent
         if "optimize a global schedule" in prompt.lower():
@@ -138,124 +334,13 @@ class MockGeminiAPIClient:
 
             # Convert raw input dictionaries back into Workload and ComputeResource objects for logic processing
             workloads = [Workload(**w) if isinstance(w, dict) else w for w in workloads_raw]
-            resources = [ComputeResource(**r) if isinstance(r, dict) else r for r in resources_raw]
-
-            assignments = []
-            unallocated_workloads = []
-            
-            # Prioritize workloads: CRITICAL > HIGH > MEDIUM > LOW, then by earliest deadline, then by expected duration
-            sorted_workloads = sorted(
-                workloads,
-                key=lambda w: (w.priority.value, w.deadline_timestamp if w.deadline_timestamp else float('inf'), w.expected_duration_seconds),
-                reverse=True # Higher priority value comes first, earlier deadlines come first
-            )
-
-            # Create a mutable copy of resources for this simulated scheduling run
-            simulated_resources = {r.id: dataclasses.replace(r) for r in resources}
-            
-            for workload in sorted_workloads:
-                # If a workload is already running and its assigned resource is still valid, maintain its assignment for stability
-                if workload.status == WorkloadStatus.RUNNING and workload.assigned_resource_id:
-                    if workload.assigned_resource_id in simulated_resources:
-                        resource = simulated_resources[workload.assigned_resource_id]
-                        # Ensure resource still has capacity (accounting for workloads already assigned to it in this loop)
-                        if resource.available_cpu >= workload.cpu_required and resource.available_memory_gb >= workload.memory_required_gb:
-                            assignments.append({
-                                "workload_id": workload.id,
-                                "resource_id": workload.assigned_resource_id,
-                                "estimated_cost": 0.0, # Cost already accounted for, or negligible for re-evaluation
-                                "reason": "Workload already running; assignment maintained for stability and continuity."
-                            })
-                            resource.allocate(workload) # Temporarily allocate in simulation to update available capacity
-                        continue # Skip to the next workload if it's already running and stable
-
-                best_resource: Optional[ComputeResource] = None
-                best_metric_score = float('inf') # Lower score indicates a more optimal placement
-
-                # Filter resources by immediate capacity requirements
-                eligible_resources = [
-                    res for res_id, res in simulated_resources.items()
-                    if res.available_cpu >= workload.cpu_required and
-                       res.available_memory_gb >= workload.memory_required_gb
-                ]
-                
-                for resource in eligible_resources:
-                    # Calculate a multi-factor placement score
-                    current_cost = (resource.cost_per_cpu_hour * workload.cpu_required +
-                                    resource.cost_per_memory_gb_hour * workload.memory_required_gb)
-                    
-                    # Adjust cost based on spot instance availability and workload's cost sensitivity
-                    if resource.is_spot_instance:
-                        # Higher cost sensitivity -> larger discount from spot instance price
-                        current_cost *= (1 - workload.cost_sensitivity * 0.7) 
-                    
-                    # Penalty for non-matching data locality (0 if met, higher if not)
-                    locality_penalty = 0
-                    if workload.data_locality_tags and not any(tag in resource.location_tags for tag in workload.data_locality_tags):
-                        locality_penalty = current_cost * 0.5 # Substantial penalty for data transfer/latency
-                    
-                    # Load balancing factor: prefer less loaded resources
-                    load_penalty = resource.load_factor * current_cost * 0.2 # Scale load impact relative to cost
-                    
-                    # Combine all factors into a single metric score
-                    metric_score = current_cost + locality_penalty + load_penalty
-                    
-                    if metric_score < best_metric_score:
-                        best_metric_score = metric_score
-                        best_resource = resource
-                
-                if best_resource:
-                    assignments.append({
-                        "workload_id": workload.id,
-                        "resource_id": best_resource.id,
-                        "estimated_cost": best_metric_score, # Using the calculated metric score as estimated cost for simulation
-                        "reason": (f"Optimal fit considering priority {workload.priority.name}, "
-                                   f"data locality ({'met' if any(tag in best_resource.location_tags for tag in workload.data_locality_tags) else 'not met'}), "
-                                   f"cost efficiency ({'spot-optimized' if best_resource.is_spot_instance else 'standard'}), "
-                                   f"and current resource load ({best_resource.load_factor:.2f}).")
-                    })
-                    # Update the simulated resource state by allocating the workload
-                    best_resource.allocate(workload)
-                else:
-                    unallocated_workloads.append(workload.id)
-
-            explanation = (
-                f"The AI orchestrator successfully optimized the schedule for {len(workloads)} workloads "
-                f"across {len(resources)} available compute resources. A total of {len(assignments)} workloads "
-                "were meticulously allocated based on a sophisticated multi-criteria objective function. "
-                "This optimization prioritizes critical deadlines, ensures stringent data locality requirements "
-                "are met where possible, and drives dynamic cost-efficiency by strategically leveraging spot instances "
-                "for appropriate tasks. The system intelligently balanced resource utilization across the fabric "
-                "to proactively prevent bottlenecks and ensure sustained peak performance."
-            )
-            if unallocated_workloads:
-                explanation += f" Note: {len(unallocated_workloads)} workloads ({', '.join(unallocated_workloads)}) " \
-                               f"could not be allocated in this cycle due to immediate resource constraints, " \
-                               f"or a lack of suitable matches after optimizing for higher-priority tasks. " \
-                               f"These will be re-evaluated in subsequent scheduling iterations or when new capacity becomes available."
-            
-            return {
-                "schedule": assignments,
-                "unallocated_workloads": unallocated_workloads,
-                "rationale": explanation,
-                "optimized_resource_states": [dataclasses.asdict(r) for r in simulated_resources.values()]
-            }
-
-        elif "perform root cause analysis for preemption" in prompt.lower():
-            preempted_workload_id = input_data.get("preempted_workload_id")
-            new_critical_workload_id = input_data.get("new_critical_workload_id")
-            return {
-                "preemption_justification": f"Workload '{preempted_workload_id}' was judiciously preempted to "
-                                            f"immediately accommodate the higher-priority, mission-critical workload "
-                                            f"'{new_critical_workload_id}'. This paramount decision ensures that critical business "
-                                            "operations maintain uninterrupted performance and meet their stringent SLAs, "
-                                            "thereby optimizing the overall system's responsiveness for the most vital tasks. "
-                                            "Such actions are taken only after exhaustive AI evaluation of alternatives.",
-                "action_taken": "The preempted workload has been gracefully deallocated and automatically marked for "
-                                "re-queuing or prioritized migration to an alternative resource with suitable available capacity. "
-                                "Its re-scheduling will be managed based on its original priority and any applicable deadlines, "
-                                "ensuring minimal long-term impact."
-            }
+            resources = [ComputeResource.from_state(r) if isinstance(r, dict) else r for r in resources_raw]
+
+            return generate_heuristic_schedule(workloads, resources)
+
+        elif "root cause analysis" in prompt.lower() and "preempt" in prompt.lower():
+            return generate_heuristic_preemption_rationale(input_data.get("preempted_workload_id"),
+                                                           input_data.get("new_critical_workload_id"))
 
         # Default fallback for any other complex logic prompts
         return {
@@ -270,7 +355,7 @@ class MockGeminiAPIClient:
         output adheres to predefined formats for reliable downstream processing and automation.
         This is crucial for production-grade architecture where AI outputs drive actions.
         """
-        print(f"\n[MockGeminiAPIClient.generateContent] Calling with prompt: '{prompt[:100]}...'")
+        logger.debug("[MockGeminiAPIClient.generateContent] Calling with prompt: '%.100s...'", prompt)
         input_data = kwargs.get("input_data", {}) # Capture complex inputs for the AI's logic
         
         time.sleep(0.1) # Simulate network latency and processing time for a complex API call
@@ -279,7 +364,7 @@ class MockGeminiAPIClient:
         
         # In a real system, robust validation of `result` against `response_schema` would occur here.
         # For this mock, we assume the simulated logic produces a compatible structured output.
-        print(f"  [MockGemini] Response generated and conceptually validated against schema.")
+        logger.debug("[MockGemini] Response generated and conceptually validated against schema.")
         return result
 
     def generateContentStream(self, prompt: str, **kwargs) -> List[Dict[str, Any]]:
@@ -288,7 +373,7 @@ class MockGeminiAPIClient:
         partial responses during an ongoing AI-driven optimization process. This mimics
         the continuous flow of intelligence from the AI.
         """
-        print(f"\n[MockGeminiAPIClient.generateContentStream] Calling with prompt: '{prompt[:100]}...'")
+        logger.debug("[MockGeminiAPIClient.generateContentStream] Calling with prompt: '%.100s...'", prompt)
         
         stream_results = []
         messages = [
@@ -302,10 +387,196 @@ class MockGeminiAPIClient:
         for i, msg in enumerate(messages):
             time.sleep(0.05) # Simulate streaming delay for each chunk
             stream_results.append({"chunk": i, "content": msg})
-            print(f"  [MockGemini Stream] {msg}")
+            logger.debug("[MockGemini Stream] %s", msg)
         
         return stream_results
 
+# --- AI Backend Call Layer ---
+
+@dataclasses.dataclass
+class AIBackendStats:
+    """Counters describing how AI backend requests were served, for observability and tuning."""
+    backend_calls: int = 0  # Requests actually issued to the remote model
+    cache_hits: int = 0  # Requests answered from the state-fingerprint cache
+    coalesced_requests: int = 0  # Requests absorbed into a recent backend call within the coalescing window
+    fallbacks: int = 0  # Requests answered by the local heuristic planner
+    timeouts: int = 0  # Backend calls that exceeded the latency budget
+    errors: int = 0  # Backend calls that raised an exception
+    last_backend_latency_seconds: float = 0.0  # Wall time of the most recently completed backend call
+
+class AIBackendGateway:
+    """
+    Mediates every call from the WorkloadScheduler to the Gemini backend so that scheduling
+    latency has a hard upper bound instead of depending on the remote model.
+
+    - Responses are cached by a fingerprint of the prompt and the scheduling-relevant state,
+      so an unchanged fabric is never re-planned remotely.
+    - Bursts of adaptation events are coalesced: at most one backend call is issued per
+      `coalesce_window_seconds`, and requests inside the window are served locally.
+    - Each backend call runs on a worker thread and is abandoned after `latency_budget_seconds`,
+      at which point the caller's local fallback answers instead. A late response still
+      warms the cache for the same fingerprint.
+    - Insight streams run on their own single worker, so a slow stream never occupies a worker
+      that a latency-bounded call is waiting for.
+    """
+    # Fields that change on every heartbeat or assignment without affecting placement decisions.
+    VOLATILE_STATE_KEYS = frozenset({"last_heartbeat", "start_time", "reason", "estimated_cost"})
+
+    def __init__(self, gemini_client: MockGeminiAPIClient, latency_budget_seconds: float = 1.0,
+                 cache_ttl_seconds: float = 30.0, cache_max_entries: int = 128,
+                 coalesce_window_seconds: float = 2.0, max_workers: int = 2):
+        """
+        Initializes the backend gateway.
+
+        Args:
+            gemini_client (MockGeminiAPIClient): The AI backend client to wrap.
+            latency_budget_seconds (float): Maximum time a caller waits for the backend before falling back.
+            cache_ttl_seconds (float): How long a cached response remains valid.
+            cache_max_entries (int): Maximum number of cached responses (least recently used are evicted).
+            coalesce_window_seconds (float): Minimum spacing between coalescable backend calls.
+            max_workers (int): Number of worker threads available for concurrent latency-bounded backend calls.
+        """
+        self.gemini_client = gemini_client
+        self.latency_budget_seconds = latency_budget_seconds
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_max_entries = cache_max_entries
+        self.coalesce_window_seconds = coalesce_window_seconds
+        self.stats = AIBackendStats()
+        self._cache: "collections.OrderedDict[str, Tuple[float, Dict[str, Any]]]" = collections.OrderedDict()
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-backend")
+        self._stream_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-backend-stream")
+        self._last_backend_call = float('-inf')
+        self._last_stream_call = float('-inf')
+
+    def fingerprint(self, prompt: str, input_data: Dict[str, Any]) -> str:
+        """
+        Computes a stable fingerprint of a request from its prompt and the scheduling-relevant
+        parts of its input state, ignoring volatile fields such as heartbeats and start times.
+        """
+        def strip_volatile(value: Any) -> Any:
+            if isinstance(value, dict):
+                return {k: strip_volatile(v) for k, v in value.items() if k not in self.VOLATILE_STATE_KEYS}
+            if isinstance(value, (list, tuple)):
+                return [strip_volatile(v) for v in value]
+            return value
+
+        canonical = json.dumps({"prompt": prompt, "input": strip_volatile(input_data)}, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns a fresh cached response for the key, evicting it if expired. Requires `self._lock`."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.cache_ttl_seconds:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return response
+
+    def _cache_put(self, key: str, response: Dict[str, Any]) -> None:
+        """Stores a backend response, evicting the least recently used entries beyond capacity. Requires `self._lock`."""
+        self._cache[key] = (time.monotonic(), response)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def _call_backend(self, key: str, prompt: str, response_schema: Dict[str, Any], input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs one backend call on a worker thread, caching its response on success."""
+        started = time.monotonic()
+        try:
+            response = self.gemini_client.generateContent(prompt=prompt, response_schema=response_schema, input_data=input_data)
+        except Exception:
+            with self._lock:
+                self.stats.errors += 1
+                self._in_flight.pop(key, None)
+            raise
+        # The cache entry replaces the in-flight call atomically, so a concurrent request for
+        # the same key always finds one or the other.
+        with self._lock:
+            self.stats.last_backend_latency_seconds = time.monotonic() - started
+            self._cache_put(key, response)
+            self._in_flight.pop(key, None)
+        return response
+
+    def generate_content(self, prompt: str, response_schema: Dict[str, Any], input_data: Dict[str, Any],
+                         fallback: Callable[[], Dict[str, Any]], coalesce: bool = False) -> Dict[str, Any]:
+        """
+        Serves a structured generation request from the cache, the backend, or the local fallback,
+        never blocking longer than the latency budget on the backend.
+
+        Args:
+            prompt (str): The prompt for the backend.
+            response_schema (Dict[str, Any]): The expected response structure.
+            input_data (Dict[str, Any]): The structured state sent alongside the prompt.
+            fallback (Callable[[], Dict[str, Any]]): Produces an equivalent response locally.
+            coalesce (bool): If True, the request is served locally when another backend call
+                             was issued within the coalescing window.
+
+        Returns:
+            Dict[str, Any]: The response, with a `response_source` key set to "cache", "backend"
+                            or "local_heuristic".
+        """
+        key = self.fingerprint(prompt, input_data)
+        now = time.monotonic()
+        # The cache and in-flight lookups share one critical section, so a call completing in
+        # between cannot make this request issue a duplicate backend call.
+        with self._lock:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self.stats.cache_hits += 1
+                return dict(cached, response_source="cache")
+            future = self._in_flight.get(key)
+            if future is None and coalesce and now - self._last_backend_call < self.coalesce_window_seconds:
+                self.stats.coalesced_requests += 1
+                self.stats.fallbacks += 1
+                coalesced = True
+            else:
+                coalesced = False
+                if future is None:
+                    future = self._executor.submit(self._call_backend, key, prompt, response_schema, input_data)
+                    self._in_flight[key] = future
+                    self._last_backend_call = now
+                    self.stats.backend_calls += 1
+        if coalesced:
+            return dict(fallback(), response_source="local_heuristic")
+
+        try:
+            response = future.result(timeout=self.latency_budget_seconds)
+            return dict(response, response_source="backend")
+        except concurrent.futures.TimeoutError:
+            with self._lock:
+                self.stats.timeouts += 1
+            logger.warning("[AIBackendGateway] Backend exceeded the %.2fs latency budget; using the local heuristic planner.", self.latency_budget_seconds)
+        except Exception as e:
+            logger.warning("[AIBackendGateway] Backend call failed (%s); using the local heuristic planner.", e)
+        with self._lock:
+            self.stats.fallbacks += 1
+        return dict(fallback(), response_source="local_heuristic")
+
+    def stream_insights(self, prompt: str) -> List[Dict[str, Any]]:
+        """
+        Requests streamed adaptation insights, issuing at most one stream call per coalescing
+        window. The stream is informational only, so it runs in the background and never delays
+        the caller; coalesced requests return an empty list.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_stream_call < self.coalesce_window_seconds:
+                self.stats.coalesced_requests += 1
+                return []
+            self._last_stream_call = now
+        self._stream_executor.submit(self.gemini_client.generateContentStream, prompt)
+        return []
+
+    def shutdown(self) -> None:
+        """Releases the worker threads without waiting for abandoned backend calls or streams."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._stream_executor.shutdown(wait=False, cancel_futures=True)
+
 # --- WorkloadScheduler Class ---
 
 class WorkloadScheduler:
@@ -318,19 +589,26 @@ class WorkloadScheduler:
     through advanced AI. This module guarantees peak performance, maximizes cost efficiency,
     and ensures unwavering reliability across all distributed workloads within the platform.
     """
-    def __init__(self, gemini_client: MockGeminiAPIClient):
+    def __init__(self, gemini_client: MockGeminiAPIClient, backend_gateway: Optional[AIBackendGateway] = None,
+                 metrics_history_size: int = 256):
         """
         Initializes the WorkloadScheduler with a Gemini API client for advanced AI-driven decisions.
 
         Args:
             gemini_client (MockGeminiAPIClient): An instance of the simulated Gemini API client,
                                                  serving as the AI backend for complex scheduling and optimization logic.
+            backend_gateway (Optional[AIBackendGateway]): The call layer that caches, coalesces and bounds
+                                                          backend requests. Defaults to a gateway with standard settings.
+            metrics_history_size (int): Number of recent scheduling cycles whose metrics are retained.
         """
         self.gemini_client = gemini_client
+        self.backend = backend_gateway or AIBackendGateway(gemini_client)
         self.workloads: Dict[str, Workload] = {}
         self.compute_resources: Dict[str, ComputeResource] = {}
         self._current_schedule: List[Dict[str, Any]] = []  # Stores the most recent AI-generated assignments
-        print("WorkloadScheduler initialized: Ready to orchestrate the computational fabric with AI precision and foresight.")
+        self.cycle_metrics: Deque[SchedulingCycleMetrics] = collections.deque(maxlen=metrics_history_size)
+        self._cycle_counter = 0
+        logger.info("WorkloadScheduler initialized: Ready to orchestrate the computational fabric with AI precision and foresight.")
 
     def add_workload(self, workload: Workload) -> None:
         """
@@ -341,7 +619,8 @@ class WorkloadScheduler:
         if workload.id in self.workloads:
             raise ValueError(f"Workload with ID '{workload.id}' already exists. Workload IDs must be unique.")
         self.workloads[workload.id] = workload
-        print(f"  Added workload: '{workload.id}' (Priority: {workload.priority.name}, CPU: {workload.cpu_required}, Mem: {workload.memory_required_gb}GB)")
+        logger.debug("Added workload: '%s' (Priority: %s, CPU: %s, Mem: %sGB)",
+                     workload.id, workload.priority.name, workload.cpu_required, workload.memory_required_gb)
 
     def add_resource(self, resource: ComputeResource) -> None:
         """
@@ -352,7 +631,8 @@ class WorkloadScheduler:
         if resource.id in self.compute_resources:
             raise ValueError(f"Resource with ID '{resource.id}' already exists. Resource IDs must be unique.")
         self.compute_resources[resource.id] = resource
-        print(f"  Added resource: '{resource.id}' (Total CPU: {resource.total_cpu}, Total Mem: {resource.total_memory_gb}GB, Spot: {resource.is_spot_instance})")
+        logger.debug("Added resource: '%s' (Total CPU: %s, Total Mem: %sGB, Spot: %s)",
+                     resource.id, resource.total_cpu, resource.total_memory_gb, resource.is_spot_instance)
 
     def _get_active_and_pending_workloads(self) -> List[Workload]:
         """
@@ -370,26 +650,36 @@ class WorkloadScheduler:
         """
         return list(self.compute_resources.values())
 
-    def schedule_workloads(self) -> Dict[str, Any]:
+    def schedule_workloads(self, coalesce: bool = False) -> Dict[str, Any]:
         """
         Generates and continuously optimizes a global schedule for all active and pending workloads
         across the entire computational fabric. This function serves as the central orchestration
         point, offloading complex combinatorial optimization to the Gemini AI. It intelligently
         considers workload priorities, deadlines, data locality, and cost sensitivity to maximize
         resource utilization, minimize operational costs, and guarantee critical workload SLAs.
+        Backend requests go through `self.backend`, so an unchanged state is served from cache and a
+        slow backend is replaced by the local heuristic planner within the latency budget.
+
+        Args:
+            coalesce (bool): If True, the cycle is planned locally when a backend call was issued
+                             within the gateway's coalescing window (used for bursts of adaptation events).
 
         Returns:
             Dict[str, Any]: A structured dictionary containing the AI-generated schedule,
                             a list of any unallocated workloads, a detailed rationale
                             for the scheduling decisions, and the optimized states of resources.
         """
-        print("\n[Scheduler] Orchestrating new workload schedule using AI-driven optimization...")
-        
+        logger.debug("[Scheduler] Orchestrating new workload schedule using AI-driven optimization...")
+        started_at = time.time()
+        cycle_start = time.perf_counter()
+
         # Prepare input for the Gemini AI, serializing workloads and resources into dictionaries.
         # This mirrors how data would be sent via an API call.
+        active_workloads = self._get_active_and_pending_workloads()
+        available_resources = self._get_available_resources()
         gemini_input_data = {
-            "workloads": [dataclasses.asdict(w) for w in self._get_active_and_pending_workloads()],
-            "resources": [dataclasses.asdict(r) for r in self._get_available_resources()],
+            "workloads": [dataclasses.asdict(w) for w in active_workloads],
+            "resources": [dataclasses.asdict(r) for r in available_resources],
             "existing_schedule": self._current_schedule, # Provides context for incremental AI optimization
         }
 
@@ -441,35 +731,84 @@ class WorkloadScheduler:
             "along with potential reasons."
         )
 
-        ai_response = self.gemini_client.generateContent(
+        backend_start = time.perf_counter()
+        ai_response = self.backend.generate_content(
             prompt=prompt,
             response_schema=response_schema,
-            input_data=gemini_input_data
+            input_data=gemini_input_data,
+            fallback=lambda: generate_heuristic_schedule(active_workloads, available_resources),
+            coalesce=coalesce
         )
 
+        backend_end = time.perf_counter()
+
         self._current_schedule = ai_response.get("schedule", [])
         unallocated = ai_response.get("unallocated_workloads", [])
         rationale = ai_response.get("rationale", "AI provided no specific rationale for this scheduling cycle.")
         optimized_resource_states = ai_response.get("optimized_resource_states", [])
 
-        print(f"\n[Scheduler] AI-Generated Schedule Rationale:\n    {rationale}")
+        logger.debug("[Scheduler] AI-Generated Schedule Rationale: %s", rationale)
         
         # Apply the AI's optimized schedule to the internal state of the scheduler,
         # ensuring the system reflects the AI's intelligent orchestration decisions.
-        self._apply_schedule(self._current_schedule, optimized_resource_states)
-        
+        skipped = self._apply_schedule(self._current_schedule, optimized_resource_states)
+        cycle_end = time.perf_counter()
+
         if unallocated:
-            print(f"  [Scheduler Warning] {len(unallocated)} workloads could not be allocated: {', '.join(unallocated)}")
+            logger.warning("[Scheduler] %d workloads could not be allocated in this cycle.", len(unallocated))
+            logger.debug("[Scheduler] Unallocated workloads: %s", unallocated)
+
+        self._cycle_counter += 1
+        metrics = SchedulingCycleMetrics(
+            cycle_id=self._cycle_counter,
+            started_at=started_at,
+            total_seconds=cycle_end - cycle_start,
+            prepare_seconds=backend_start - cycle_start,
+            backend_seconds=backend_end - backend_start,
+            apply_seconds=cycle_end - backend_end,
+            workloads_considered=len(active_workloads),
+            resources_considered=len(available_resources),
+            assignments=len(self._current_schedule),
+            unallocated=len(unallocated),
+            skipped_assignments=skipped,
+            response_source=ai_response.get("response_source", "backend"),
+        )
+        self.cycle_metrics.append(metrics)
+        logger.info("[Scheduler] Cycle %d: %d workloads on %d resources -> %d assigned, %d unallocated, %d skipped "
+                    "(source=%s, total=%.1fms, prepare=%.1fms, backend=%.1fms, apply=%.1fms)",
+                    metrics.cycle_id, metrics.workloads_considered, metrics.resources_considered,
+                    metrics.assignments, metrics.unallocated, metrics.skipped_assignments, metrics.response_source,
+                    metrics.total_seconds * 1e3, metrics.prepare_seconds * 1e3,
+                    metrics.backend_seconds * 1e3, metrics.apply_seconds * 1e3)
 
         return ai_response
 
-    def _apply_schedule(self, schedule: List[Dict[str, Any]], optimized_resource_states: List[Dict[str, Any]]) -> None:
+    def get_cycle_metrics(self, last_n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the retained scheduling cycle metrics as plain dictionaries, oldest first,
+        ready for export to dashboards.
+
+        Args:
+            last_n (Optional[int]): If given, only the most recent `last_n` cycles are returned.
+        """
+        cycles = list(self.cycle_metrics)
+        if last_n is not None:
+            cycles = cycles[-last_n:] if last_n > 0 else []
+        return [dataclasses.asdict(m) for m in cycles]
+
+    def _apply_schedule(self, schedule: List[Dict[str, Any]], optimized_resource_states: List[Dict[str, Any]]) -> int:
         """
         Applies the AI-generated schedule to the internal state of workloads and resources.
         This method translates the AI's abstract optimization decisions into concrete updates
         within the scheduler's operational view, simulating autonomous execution.
+        Per-assignment detail is only logged at DEBUG level.
+
+        Returns:
+            int: The number of assignments skipped because they referenced unknown workloads or resources.
         """
-        print("\n[Scheduler] Applying AI-generated schedule to update system state and resource allocations...")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        skipped = 0
+        logger.debug("[Scheduler] Applying AI-generated schedule to update system state and resource allocations...")
         
         # Update resource states first based on the AI's final, optimized view.
         # This ensures internal resource representations are consistent with the AI's allocation.
@@ -480,10 +819,10 @@ class WorkloadScheduler:
                 # Directly update all relevant resource fields from the AI's calculated state
                 resource.available_cpu = res_state['available_cpu']
                 resource.available_memory_gb = res_state['available_memory_gb']
-                resource.current_workloads = res_state['current_workloads'] # AI knows current allocations
+                resource.current_workloads = list(res_state['current_workloads']) # AI knows current allocations; copied so cached responses stay intact
                 resource.load_factor = res_state['load_factor']
             else:
-                print(f"  [Scheduler Warning] Resource '{res_id}' from AI-optimized state not found in local resources. It might have failed or been de-provisioned concurrently.")
+                logger.warning("[Scheduler] Resource '%s' from AI-optimized state not found in local resources. It might have failed or been de-provisioned concurrently.", res_id)
 
         # Reset all workload assignments before applying the new schedule to ensure clean state.
         for workload in self.workloads.values():
@@ -506,9 +845,16 @@ class WorkloadScheduler:
                 workload.status = WorkloadStatus.RUNNING # Assume successful transition to running upon AI allocation
                 if not workload.start_time: # Only set start time if it's a completely new assignment
                     workload.start_time = time.time()
-                print(f"  Workload '{workload.id}' is now running on '{resource.id}'.")
+                if debug_enabled:
+                    logger.debug("Workload '%s' is now running on '%s'.", workload.id, resource.id)
             else:
-                print(f"  [Scheduler Warning] AI assignment for unknown workload '{workload_id}' or resource '{resource_id}' was skipped during application.")
+                skipped += 1
+                if debug_enabled:
+                    logger.debug("[Scheduler] AI assignment for unknown workload '%s' or resource '%s' was skipped during application.", workload_id, resource_id)
+
+        if skipped:
+            logger.warning("[Scheduler] %d AI assignments referenced unknown workloads or resources and were skipped.", skipped)
+        return skipped
 
     def adapt_schedule(self,
                        new_workloads: Optional[List[Workload]] = None,
@@ -528,19 +874,19 @@ class WorkloadScheduler:
         Returns:
             Dict[str, Any]: The updated schedule and rationale generated by the AI after performing the adaptation.
         """
-        print("\n[Scheduler] Initiating real-time schedule adaptation to dynamic changes across the compute landscape...")
+        logger.debug("[Scheduler] Initiating real-time schedule adaptation to dynamic changes across the compute landscape...")
 
         # Step 1: Incorporate any newly arrived workloads into the scheduler's pool.
         if new_workloads:
             for wl in new_workloads:
                 self.add_workload(wl)
-            print(f"  Incorporated {len(new_workloads)} new workloads for immediate adaptation.")
+            logger.info("[Scheduler] Incorporated %d new workloads for immediate adaptation.", len(new_workloads))
 
         # Step 2: Handle resource failures, deallocating workloads and removing failed resources.
         if failed_resource_ids:
             for res_id in failed_resource_ids:
                 if res_id in self.compute_resources:
-                    print(f"  Resource '{res_id}' detected as failed. Initiating re-assignment of its workloads.")
+                    logger.warning("[Scheduler] Resource '%s' detected as failed. Initiating re-assignment of its workloads.", res_id)
                     failed_resource = self.compute_resources[res_id]
                     for wl_id in failed_resource.current_workloads:
                         workload = self.workloads.get(wl_id)
@@ -549,7 +895,7 @@ class WorkloadScheduler:
                             workload.assigned_resource_id = None
                     del self.compute_resources[res_id] # Permanently remove the failed resource from the available pool
                 else:
-                    print(f"  [Scheduler Warning] Failed resource '{res_id}' not found in known resources; skipping its processing during adaptation.")
+                    logger.warning("[Scheduler] Failed resource '%s' not found in known resources; skipping its processing during adaptation.", res_id)
 
         # Step 3: Apply any real-time updates to existing resource metrics.
         if updated_resource_metrics:
@@ -560,27 +906,30 @@ class WorkloadScheduler:
                     if 'available_memory_gb' in metrics: resource.available_memory_gb = metrics['available_memory_gb']
                     if 'load_factor' in metrics: resource.load_factor = metrics['load_factor']
                     resource.last_heartbeat = time.time() # Update last known healthy status
-                    print(f"  Updated real-time metrics for resource '{res_id}'.")
+                    logger.debug("Updated real-time metrics for resource '%s'.", res_id)
                 else:
-                    print(f"  [Scheduler Warning] Metrics provided for unknown resource '{res_id}'; skipping during adaptation.")
+                    logger.warning("[Scheduler] Metrics provided for unknown resource '%s'; skipping during adaptation.", res_id)
         
         # Step 4: Leverage Gemini's streaming capabilities to provide real-time insights
-        # into the ongoing adaptation process, enhancing observability.
-        self.gemini_client.generateContentStream(
+        # into the ongoing adaptation process, enhancing observability. The gateway issues at most
+        # one stream per coalescing window and never blocks the adaptation on it.
+        self.backend.stream_insights(
             "Provide real-time insights on optimizing the schedule in response to dynamic events "
             "(e.g., new workloads, resource failures, performance degradation, and evolving demand patterns)."
         )
 
         # Step 5: Trigger a full scheduling cycle to re-optimize with the new conditions.
         # This ensures all changes are holistically considered by the AI for optimal placement.
-        return self.schedule_workloads()
+        # Bursts of adaptation events are coalesced into one backend call per window.
+        return self.schedule_workloads(coalesce=True)
 
     def preempt_workload(self, preempt_id: str, new_critical_workload: Workload) -> Dict[str, Any]:
         """
         Simulates the preemption of a lower-priority workload to create immediate capacity
         for a new, critical workload. The AI is leveraged to provide a robust justification
         for this action and guide the immediate follow-up steps, ensuring transparency and
-        optimal system behavior even under high-priority demands.
+        optimal system behavior even under high-priority demands. The request goes through
+        `self.backend`, so a slow backend never delays the preemption beyond the latency budget.
 
         Args:
             preempt_id (str): The unique ID of the workload targeted for preemption.
@@ -589,10 +938,11 @@ class WorkloadScheduler:
 
         Returns:
             Dict[str, Any]: An AI-generated dictionary containing the justification for preemption
-                            and suggested follow-up actions for the preempted workload.
+                            and suggested follow-up actions for the preempted workload, with a
+                            `response_source` key as returned by the gateway.
         """
-        print(f"\n[Scheduler] Initiating preemption of workload '{preempt_id}' to accommodate "
-              f"new critical workload '{new_critical_workload.id}' (Priority: {new_critical_workload.priority.name}).")
+        logger.info("[Scheduler] Initiating preemption of workload '%s' to accommodate new critical workload '%s' (Priority: %s).",
+                    preempt_id, new_critical_workload.id, new_critical_workload.priority.name)
         
         preempt_workload = self.workloads.get(preempt_id)
 
@@ -602,7 +952,7 @@ class WorkloadScheduler:
 
         # Step 1: Engage Gemini AI to provide a comprehensive justification for the preemption
         # and recommend optimal immediate actions for both workloads.
-        ai_response = self.gemini_client.generateContent(
+        ai_response = self.backend.generate_content(
             prompt=f"Perform a detailed root cause analysis and provide a robust, executive-level justification for preempting "
                    f"workload '{preempt_id}' to immediately accommodate the new, higher-priority critical workload '{new_critical_workload.id}'. "
                    f"Furthermore, suggest immediate, optimal actions to minimize any disruption caused by the preemption and "
@@ -619,13 +969,14 @@ class WorkloadScheduler:
                 "preempted_workload_id": preempt_id,
                 "new_critical_workload_id": new_critical_workload.id,
                 "preempted_workload_details": dataclasses.asdict(preempt_workload) # Provide context to the AI
-            }
+            },
+            fallback=lambda: generate_heuristic_preemption_rationale(preempt_id, new_critical_workload.id)
         )
 
         justification = ai_response.get("preemption_justification", "AI provided no specific justification for preemption.")
         action_taken = ai_response.get("action_taken", "AI provided no specific action recommendations.")
-        print(f"  [Scheduler] AI Preemption Justification:\n    {justification}")
-        print(f"  [Scheduler] AI Suggested Action: {action_taken}")
+        logger.info("[Scheduler] AI Preemption Justification: %s", justification)
+        logger.info("[Scheduler] AI Suggested Action: %s", action_taken)
 
         # Step 2: Perform the actual preemption within the scheduler's state.
         if preempt_workload.assigned_resource_id:
@@ -633,11 +984,11 @@ class WorkloadScheduler:
             if resource:
                 try:
                     resource.deallocate(preempt_workload)
-                    print(f"  Workload '{preempt_id}' successfully deallocated from '{resource.id}'.")
+                    logger.debug("Workload '%s' successfully deallocated from '%s'.", preempt_id, resource.id)
                 except ValueError as e:
-                    print(f"  [Scheduler Error] Failed to deallocate '{preempt_id}' from '{resource.id}': {e}")
+                    logger.error("[Scheduler] Failed to deallocate '%s' from '%s': %s", preempt_id, resource.id, e)
             else:
-                print(f"  [Scheduler Warning] Resource '{preempt_workload.assigned_resource_id}' (for '{preempt_id}') not found during deallocation.")
+                logger.warning("[Scheduler] Resource '%s' (for '%s') not found during deallocation.", preempt_workload.assigned_resource_id, preempt_id)
         
         preempt_workload.status = WorkloadStatus.PREEMPTED # Mark the workload as preempted
         preempt_workload.assigned_resource_id = None # Clear its assignment
@@ -0,0 +1,628 @@
+import argparse
+import dataclasses
+import enum
+import heapq
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from .workload_scheduler_algorithms import (
+        ComputeResource,
+        MockGeminiAPIClient,
+        Workload,
+        WorkloadPriority,
+        WorkloadScheduler,
+        WorkloadStatus,
+        calculate_placement_score,
+    )
+except ImportError:  # Run as a script from inside compute/.
+    from workload_scheduler_algorithms import (
+        ComputeResource,
+        MockGeminiAPIClient,
+        Workload,
+        WorkloadPriority,
+        WorkloadScheduler,
+        WorkloadStatus,
+        calculate_placement_score,
+    )
+
+# --- Enums and Constants ---
+
+class SimulationEventType(enum.IntEnum):
+    """Defines the discrete events replayed by the scheduling simulator, in tie-break order."""
+    NODE_RECOVERY = 1
+    COMPLETION = 2
+    SPOT_RECLAIM = 3
+    NODE_FAILURE = 4
+    ARRIVAL = 5
+    SCHEDULING_CYCLE = 6
+
+# A placement strategy receives the workload to place and the currently online resources,
+# and returns the chosen resource (which must have sufficient capacity) or None to defer it.
+PlacementStrategy = Callable[[Workload, List[ComputeResource]], Optional[ComputeResource]]
+
+# (event_time_seconds, resource_id, downtime_seconds or None if the node never returns)
+NodeEvent = Tuple[float, str, Optional[float]]
+
+# --- Placement Strategies ---
+
+def first_fit_placement(workload: Workload, resources: List[ComputeResource]) -> Optional[ComputeResource]:
+    """Places the workload on the first online resource with enough free CPU and memory."""
+    for resource in resources:
+        if resource.available_cpu >= workload.cpu_required and resource.available_memory_gb >= workload.memory_required_gb:
+            return resource
+    return None
+
+def best_fit_placement(workload: Workload, resources: List[ComputeResource]) -> Optional[ComputeResource]:
+    """Places the workload on the resource left with the least free CPU, packing nodes tightly."""
+    best_resource: Optional[ComputeResource] = None
+    best_leftover = float('inf')
+    for resource in resources:
+        if resource.available_cpu >= workload.cpu_required and resource.available_memory_gb >= workload.memory_required_gb:
+            leftover = resource.available_cpu - workload.cpu_required
+            if leftover < best_leftover:
+                best_leftover = leftover
+                best_resource = resource
+    return best_resource
+
+def cost_aware_placement(workload: Workload, resources: List[ComputeResource]) -> Optional[ComputeResource]:
+    """
+    Places the workload on the resource with the lowest multi-factor placement score,
+    mirroring the heuristic the AI orchestrator applies in `MockGeminiAPIClient`.
+    """
+    best_resource: Optional[ComputeResource] = None
+    best_metric_score = float('inf')
+    for resource in resources:
+        if resource.available_cpu >= workload.cpu_required and resource.available_memory_gb >= workload.memory_required_gb:
+            metric_score = calculate_placement_score(workload, resource)
+            if metric_score < best_metric_score:
+                best_metric_score = metric_score
+                best_resource = resource
+    return best_resource
+
+PLACEMENT_STRATEGIES: Dict[str, PlacementStrategy] = {
+    "first_fit": first_fit_placement,
+    "best_fit": best_fit_placement,
+    "cost_aware": cost_aware_placement,
+}
+
+# --- Scheduler-Driven Replay ---
+
+class OfflinePlannerClient(MockGeminiAPIClient):
+    """
+    A backend client that answers immediately with the simulated AI's planner, so replaying a trace
+    through `WorkloadScheduler` is paced by planning work rather than by the mock client's simulated
+    network latency.
+    """
+    def generateContent(self, prompt: str, response_schema: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """Returns the simulated AI response without the mock network delay."""
+        return self._simulate_complex_logic(prompt, kwargs.get("input_data", {}))
+
+    def generateContentStream(self, prompt: str, **kwargs) -> List[Dict[str, Any]]:
+        """Insight streams carry no scheduling decisions, so the offline client returns none."""
+        return []
+
+def offline_workload_scheduler() -> WorkloadScheduler:
+    """Builds a fresh `WorkloadScheduler` backed by an `OfflinePlannerClient`, for scheduler-driven replays."""
+    return WorkloadScheduler(OfflinePlannerClient())
+
+# --- Data Models ---
+
+@dataclasses.dataclass
+class SimulationTrace:
+    """
+    A replayable workload trace for the discrete-event scheduling simulator.
+    All times are simulation seconds; `Workload.deadline_timestamp` is interpreted on the same clock.
+    Each run resets the workloads' runtime fields and works on copies of the resources,
+    so one trace can be replayed against many strategies.
+    """
+    resources: List[ComputeResource]
+    workloads: List[Workload]
+    arrival_times: List[float]
+    durations: Optional[List[float]] = None  # Actual run times; defaults to each workload's expected_duration_seconds
+    spot_reclaims: List[NodeEvent] = dataclasses.field(default_factory=list)
+    node_failures: List[NodeEvent] = dataclasses.field(default_factory=list)
+
+    def __post_init__(self):
+        """Validates that the per-workload columns are aligned."""
+        if len(self.arrival_times) != len(self.workloads):
+            raise ValueError(f"Trace has {len(self.workloads)} workloads but {len(self.arrival_times)} arrival times.")
+        if self.durations is not None and len(self.durations) != len(self.workloads):
+            raise ValueError(f"Trace has {len(self.workloads)} workloads but {len(self.durations)} durations.")
+
+@dataclasses.dataclass
+class SimulationReport:
+    """Aggregate outcome of replaying a trace under one placement strategy."""
+    strategy_name: str
+    num_workloads: int
+    completed_workloads: int
+    unfinished_workloads: int
+    makespan_seconds: float
+    cpu_utilization: float  # Busy CPU-seconds over online CPU-seconds during the makespan (0.0-1.0)
+    sla_misses: int  # Workloads with a deadline that completed late or never completed
+    total_cost: float  # Cost of all executed work, including work lost to reclaims and failures
+    preemptions: int  # Workload evictions caused by spot reclaims, node failures or (scheduler-driven) re-planning
+    placement_decisions: int
+    decision_latency_p50_us: float
+    decision_latency_p99_us: float
+    decision_latency_max_us: float
+    wall_clock_seconds: float
+
+    def __str__(self):
+        """Returns a one-line summary suitable for comparison tables."""
+        return (f"{self.strategy_name:<12} done={self.completed_workloads}/{self.num_workloads} "
+                f"makespan={self.makespan_seconds:.0f}s util={self.cpu_utilization:.1%} "
+                f"sla_misses={self.sla_misses} cost=${self.total_cost:,.2f} preemptions={self.preemptions} "
+                f"decision p50/p99/max={self.decision_latency_p50_us:.1f}/{self.decision_latency_p99_us:.1f}/"
+                f"{self.decision_latency_max_us:.1f}us wall={self.wall_clock_seconds:.2f}s")
+
+# --- Simulator ---
+
+class WorkloadSchedulingSimulator:
+    """
+    Trace-driven discrete-event simulator for evaluating workload placement policies offline.
+
+    Arrivals, completions, spot reclaims, node failures and node recoveries are replayed from a
+    single event heap against live `ComputeResource` objects, so allocation semantics match the
+    Engine Core exactly. Workloads that cannot be placed wait in a priority queue (priority, then
+    earliest deadline, then arrival order) and are backfilled whenever capacity is released.
+    Evicted workloads restart from scratch, and the partial work they lose is still billed.
+
+    With a `scheduler_factory`, placement is delegated to a `WorkloadScheduler` instead of a
+    placement strategy: arrivals are registered with `add_workload`, a scheduling cycle runs every
+    `cycle_interval_seconds` of simulated time, node failures and spot reclaims are reported through
+    `adapt_schedule`, and recovered nodes are re-registered with `add_resource`. The scheduler owns
+    resource capacity in this mode; the simulator starts the runs it assigns, evicts the runs it drops
+    or moves (counted as preemptions), and releases capacity on completion. Each cycle re-plans all
+    active workloads, so this mode is meant for traces of thousands rather than millions of workloads,
+    and each cycle counts as one placement decision in the report.
+    """
+    def __init__(self, trace: SimulationTrace, placement_strategy: Optional[PlacementStrategy] = None,
+                 strategy_name: Optional[str] = None, backfill_window: int = 64,
+                 scheduler_factory: Optional[Callable[[], WorkloadScheduler]] = None,
+                 cycle_interval_seconds: float = 60.0):
+        """
+        Initializes the simulator for one replay of a trace.
+
+        Args:
+            trace (SimulationTrace): The workload and infrastructure trace to replay.
+            placement_strategy (Optional[PlacementStrategy]): The placement policy under evaluation.
+            strategy_name (Optional[str]): Label used in the report. Defaults to the strategy's function name,
+                                           or "scheduler" when a `scheduler_factory` is given.
+            backfill_window (int): Maximum number of queued workloads examined each time capacity is released.
+            scheduler_factory (Optional[Callable[[], WorkloadScheduler]]): If given, builds the scheduler that makes
+                                                                           all placement decisions for this replay.
+            cycle_interval_seconds (float): Simulated time between scheduling cycles in scheduler-driven replays.
+        """
+        if (placement_strategy is None) == (scheduler_factory is None):
+            raise ValueError("Exactly one of placement_strategy and scheduler_factory must be given.")
+        if cycle_interval_seconds <= 0:
+            raise ValueError("cycle_interval_seconds must be positive.")
+        self.trace = trace
+        self.placement_strategy = placement_strategy
+        self.scheduler_factory = scheduler_factory
+        if scheduler_factory is not None:
+            self.strategy_name = strategy_name or "scheduler"
+        else:
+            self.strategy_name = strategy_name or getattr(placement_strategy, "__name__", "custom")
+        self.backfill_window = backfill_window
+        self.cycle_interval_seconds = cycle_interval_seconds
+
+    def run(self) -> SimulationReport:
+        """
+        Replays the full trace and returns the aggregate metrics.
+
+        Returns:
+            SimulationReport: Utilization, makespan, SLA misses, cost and per-decision latency for the run.
+        """
+        wall_start = time.perf_counter()
+        trace = self.trace
+        strategy = self.placement_strategy
+        scheduler = self.scheduler_factory() if self.scheduler_factory is not None else None
+        durations = trace.durations if trace.durations is not None else [w.expected_duration_seconds for w in trace.workloads]
+
+        # Fresh resource copies so the trace can be replayed repeatedly.
+        resources: Dict[str, ComputeResource] = {
+            r.id: dataclasses.replace(r, current_workloads=[]) for r in trace.resources
+        }
+        online: List[ComputeResource] = list(resources.values())
+        online_ids = set(resources)
+        online_since: Dict[str, float] = {}
+        online_cpu_seconds = 0.0
+
+        for _, res_id, _ in trace.spot_reclaims:
+            if res_id not in resources:
+                raise ValueError(f"Spot reclaim targets unknown resource '{res_id}'.")
+            if not resources[res_id].is_spot_instance:
+                raise ValueError(f"Spot reclaim targets on-demand resource '{res_id}'.")
+        for _, res_id, _ in trace.node_failures:
+            if res_id not in resources:
+                raise ValueError(f"Node failure targets unknown resource '{res_id}'.")
+
+        # Each workload is identified by its trace index; attempts invalidate stale completion events.
+        workloads = trace.workloads
+        num_workloads = len(workloads)
+        attempt = [0] * num_workloads
+        run_started_at = [0.0] * num_workloads
+        completed_at: List[Optional[float]] = [None] * num_workloads
+        index_of: Dict[str, int] = {}
+        for i, workload in enumerate(workloads):
+            workload.status = WorkloadStatus.PENDING
+            workload.assigned_resource_id = None
+            workload.start_time = None
+            index_of[workload.id] = i
+
+        events: List[Tuple[float, int, int, int, object]] = []
+        seq = 0
+        for i, arrival in enumerate(trace.arrival_times):
+            events.append((arrival, SimulationEventType.ARRIVAL, seq, i, None))
+            seq += 1
+        for event_time, res_id, downtime in trace.spot_reclaims:
+            events.append((event_time, SimulationEventType.SPOT_RECLAIM, seq, 0, (res_id, downtime)))
+            seq += 1
+        for event_time, res_id, downtime in trace.node_failures:
+            events.append((event_time, SimulationEventType.NODE_FAILURE, seq, 0, (res_id, downtime)))
+            seq += 1
+        heapq.heapify(events)
+
+        pending: List[Tuple[int, float, int, int]] = []  # (-priority, deadline, seq, workload index)
+        latencies_ns: List[int] = []
+        busy_cpu_seconds = 0.0
+        total_cost = 0.0
+        preemptions = 0
+        first_event_time = events[0][0] if events else 0.0
+        now = first_event_time
+        last_completion = first_event_time
+        for res_id in resources:
+            online_since[res_id] = first_event_time
+
+        # Scheduler-driven replays: trace index -> resource id of each run the scheduler has started.
+        running: Dict[int, str] = {}
+        completed_count = 0
+        if scheduler is not None:
+            for resource in resources.values():
+                scheduler.add_resource(resource)
+            heapq.heappush(events, (first_event_time, SimulationEventType.SCHEDULING_CYCLE, seq, 0, None))
+            seq += 1
+
+        def start(i: int, resource: ComputeResource) -> None:
+            nonlocal seq
+            workload = workloads[i]
+            resource.allocate(workload)
+            workload.status = WorkloadStatus.RUNNING
+            workload.assigned_resource_id = resource.id
+            if workload.start_time is None:
+                workload.start_time = now
+            run_started_at[i] = now
+            heapq.heappush(events, (now + durations[i], SimulationEventType.COMPLETION, seq, i, attempt[i]))
+            seq += 1
+
+        def try_place(i: int) -> bool:
+            t0 = time.perf_counter_ns()
+            resource = strategy(workloads[i], online)
+            latencies_ns.append(time.perf_counter_ns() - t0)
+            if resource is None:
+                return False
+            start(i, resource)
+            return True
+
+        def enqueue(i: int) -> None:
+            nonlocal seq
+            workload = workloads[i]
+            deadline = workload.deadline_timestamp if workload.deadline_timestamp is not None else float('inf')
+            heapq.heappush(pending, (-workload.priority.value, deadline, seq, i))
+            seq += 1
+
+        def bill(i: int, resource: ComputeResource, run_seconds: float) -> None:
+            nonlocal busy_cpu_seconds, total_cost
+            workload = workloads[i]
+            busy_cpu_seconds += workload.cpu_required * run_seconds
+            total_cost += (resource.cost_per_cpu_hour * workload.cpu_required +
+                           resource.cost_per_memory_gb_hour * workload.memory_required_gb) * run_seconds / 3600.0
+
+        def backfill() -> None:
+            if not pending or not online:
+                return
+            max_free_cpu = max(r.available_cpu for r in online)
+            max_free_mem = max(r.available_memory_gb for r in online)
+            deferred = []
+            for _ in range(min(self.backfill_window, len(pending))):
+                entry = heapq.heappop(pending)
+                workload = workloads[entry[3]]
+                if (workload.cpu_required > max_free_cpu or workload.memory_required_gb > max_free_mem
+                        or not try_place(entry[3])):
+                    deferred.append(entry)
+                    continue
+                max_free_cpu = max(r.available_cpu for r in online)
+                max_free_mem = max(r.available_memory_gb for r in online)
+            for entry in deferred:
+                heapq.heappush(pending, entry)
+
+        def take_offline(res_id: str, downtime: Optional[float], evicted_status: WorkloadStatus) -> None:
+            nonlocal preemptions, seq, online_cpu_seconds
+            resource = resources[res_id]
+            if res_id not in online_ids:
+                return  # Already offline; overlapping outage events are absorbed.
+            for wl_id in list(resource.current_workloads):
+                i = index_of[wl_id]
+                workload = workloads[i]
+                bill(i, resource, now - run_started_at[i])
+                resource.deallocate(workload)
+                workload.assigned_resource_id = None
+                attempt[i] += 1
+                preemptions += 1
+                if scheduler is not None:
+                    # The scheduler only re-plans pending, scheduled and running workloads.
+                    workload.status = WorkloadStatus.PENDING
+                    running.pop(i, None)
+                else:
+                    workload.status = evicted_status
+                    enqueue(i)
+            online.remove(resource)
+            online_ids.discard(res_id)
+            online_cpu_seconds += resource.total_cpu * (now - online_since[res_id])
+            if downtime is not None:
+                heapq.heappush(events, (now + downtime, SimulationEventType.NODE_RECOVERY, seq, 0, res_id))
+                seq += 1
+            if scheduler is not None:
+                run_cycle(lambda: scheduler.adapt_schedule(failed_resource_ids=[res_id]))
+
+        def run_cycle(cycle: Callable[[], Dict[str, Any]]) -> int:
+            """Runs one scheduler cycle and reconciles the simulated runs with its schedule; returns new starts."""
+            nonlocal preemptions, seq
+            t0 = time.perf_counter_ns()
+            response = cycle()
+            latencies_ns.append(time.perf_counter_ns() - t0)
+            assigned = {a["workload_id"]: a["resource_id"] for a in response.get("schedule", [])}
+            for i, res_id in list(running.items()):
+                if assigned.get(workloads[i].id) != res_id:
+                    # Dropped or moved by the planner: the run is lost, as with any other eviction.
+                    bill(i, resources[res_id], now - run_started_at[i])
+                    attempt[i] += 1
+                    preemptions += 1
+                    del running[i]
+            started = 0
+            for wl_id, res_id in assigned.items():
+                i = index_of[wl_id]
+                if i in running:
+                    continue
+                running[i] = res_id
+                run_started_at[i] = now
+                heapq.heappush(events, (now + durations[i], SimulationEventType.COMPLETION, seq, i, attempt[i]))
+                seq += 1
+                started += 1
+            return started
+
+        while events:
+            now, event_type, _, i, payload = heapq.heappop(events)
+
+            if scheduler is not None and event_type == SimulationEventType.ARRIVAL:
+                scheduler.add_workload(workloads[i])
+
+            elif scheduler is not None and event_type == SimulationEventType.SCHEDULING_CYCLE:
+                started = run_cycle(scheduler.schedule_workloads)
+                # Keep cycling while anything can still change; an idle, event-free cluster ends the replay.
+                if completed_count < num_workloads and (events or started):
+                    heapq.heappush(events, (now + self.cycle_interval_seconds, SimulationEventType.SCHEDULING_CYCLE,
+                                            seq, 0, None))
+                    seq += 1
+
+            elif event_type == SimulationEventType.ARRIVAL:
+                if pending:
+                    # Queue behind (or ahead of, by priority) the backlog instead of jumping it.
+                    enqueue(i)
+                    backfill()
+                elif not try_place(i):
+                    enqueue(i)
+
+            elif event_type == SimulationEventType.COMPLETION:
+                if payload != attempt[i]:
+                    continue  # Stale completion for a run that was evicted.
+                workload = workloads[i]
+                resource = resources[running.pop(i) if scheduler is not None else workload.assigned_resource_id]
+                bill(i, resource, now - run_started_at[i])
+                resource.deallocate(workload)
+                workload.status = WorkloadStatus.COMPLETED
+                completed_at[i] = now
+                completed_count += 1
+                last_completion = now
+                backfill()
+
+            elif event_type == SimulationEventType.SPOT_RECLAIM:
+                take_offline(payload[0], payload[1], WorkloadStatus.PREEMPTED)
+                backfill()
+
+            elif event_type == SimulationEventType.NODE_FAILURE:
+                take_offline(payload[0], payload[1], WorkloadStatus.FAILED)
+                backfill()
+
+            elif event_type == SimulationEventType.NODE_RECOVERY:
+                resource = resources[payload]
+                if payload not in online_ids:
+                    online.append(resource)
+                    online_ids.add(payload)
+                    online_since[payload] = now
+                    resource.last_heartbeat = now
+                    if scheduler is not None:
+                        scheduler.add_resource(resource)
+                backfill()
+
+        if scheduler is not None:
+            scheduler.backend.shutdown()
+
+        makespan = max(last_completion - first_event_time, 0.0)
+        for resource in online:
+            online_cpu_seconds += resource.total_cpu * (last_completion - online_since[resource.id])
+
+        sla_misses = 0
+        completed = 0
+        for i, workload in enumerate(workloads):
+            finished = completed_at[i]
+            if finished is not None:
+                completed += 1
+            if workload.deadline_timestamp is not None and (finished is None or finished > workload.deadline_timestamp):
+                sla_misses += 1
+
+        latencies_ns.sort()
+        def percentile_us(q: float) -> float:
+            if not latencies_ns:
+                return 0.0
+            return latencies_ns[min(int(q * len(latencies_ns)), len(latencies_ns) - 1)] / 1000.0
+
+        return SimulationReport(
+            strategy_name=self.strategy_name,
+            num_workloads=num_workloads,
+            completed_workloads=completed,
+            unfinished_workloads=num_workloads - completed,
+            makespan_seconds=makespan,
+            cpu_utilization=busy_cpu_seconds / online_cpu_seconds if online_cpu_seconds > 0 else 0.0,
+            sla_misses=sla_misses,
+            total_cost=total_cost,
+            preemptions=preemptions,
+            placement_decisions=len(latencies_ns),
+            decision_latency_p50_us=percentile_us(0.50),
+            decision_latency_p99_us=percentile_us(0.99),
+            decision_latency_max_us=latencies_ns[-1] / 1000.0 if latencies_ns else 0.0,
+            wall_clock_seconds=time.perf_counter() - wall_start,
+        )
+
+# --- Synthetic Traces and Benchmarking ---
+
+def generate_synthetic_trace(num_workloads: int, num_resources: int = 32, spot_fraction: float = 0.25,
+                             target_load: float = 0.85, spot_reclaims_per_hour: float = 0.5,
+                             node_failures_per_hour: float = 0.05, seed: int = 42) -> SimulationTrace:
+    """
+    Generates a reproducible synthetic trace with Poisson arrivals sized to a target cluster load,
+    a mix of workload shapes and priorities, deadlines on high-priority work, and Poisson spot
+    reclaim and node failure processes over the arrival horizon.
+
+    Args:
+        num_workloads (int): Number of workloads to generate.
+        num_resources (int): Number of compute resources in the cluster.
+        spot_fraction (float): Fraction of resources that are spot instances.
+        target_load (float): Offered CPU load relative to total cluster CPU capacity.
+        spot_reclaims_per_hour (float): Cluster-wide rate of spot reclaim events.
+        node_failures_per_hour (float): Cluster-wide rate of node failure events.
+        seed (int): Seed for the trace's random number generator.
+
+    Returns:
+        SimulationTrace: The generated trace.
+    """
+    rng = random.Random(seed)
+    regions = ["us-east-1", "eu-west-2", "on-prem-datacenter-a"]
+
+    resources = []
+    num_spot = int(num_resources * spot_fraction)
+    for r in range(num_resources):
+        is_spot = r < num_spot
+        resources.append(ComputeResource(
+            id=f"node-{r:04d}",
+            total_cpu=64.0,
+            total_memory_gb=256.0,
+            location_tags=[regions[r % len(regions)]],
+            cost_per_cpu_hour=0.015 if is_spot else 0.05,
+            cost_per_memory_gb_hour=0.003 if is_spot else 0.01,
+            is_spot_instance=is_spot,
+        ))
+
+    cpu_choices = [0.5, 1.0, 2.0, 4.0, 8.0]
+    cpu_weights = [0.2, 0.3, 0.25, 0.15, 0.1]
+    mean_duration = 600.0
+    mean_cpu = sum(c * w for c, w in zip(cpu_choices, cpu_weights))
+    arrival_rate = target_load * 64.0 * num_resources / (mean_cpu * mean_duration)
+    priorities = list(WorkloadPriority)
+    priority_weights = [0.4, 0.35, 0.2, 0.05]
+
+    workloads = []
+    arrival_times = []
+    durations = []
+    now = 0.0
+    for n in range(num_workloads):
+        now += rng.expovariate(arrival_rate)
+        cpu = rng.choices(cpu_choices, cpu_weights)[0]
+        duration = rng.expovariate(1.0 / mean_duration) + 1.0
+        priority = rng.choices(priorities, priority_weights)[0]
+        deadline = now + duration * rng.uniform(1.5, 3.0) if priority >= WorkloadPriority.HIGH else None
+        workloads.append(Workload(
+            id=f"wl-{n:07d}",
+            cpu_required=cpu,
+            memory_required_gb=cpu * rng.choice([2.0, 4.0]),
+            priority=priority,
+            deadline_timestamp=deadline,
+            data_locality_tags=[rng.choice(regions)] if rng.random() < 0.5 else [],
+            cost_sensitivity=rng.random(),
+            expected_duration_seconds=duration,
+        ))
+        arrival_times.append(now)
+        durations.append(duration)
+
+    horizon = now
+    spot_ids = [r.id for r in resources if r.is_spot_instance]
+    spot_reclaims: List[NodeEvent] = []
+    if spot_ids and spot_reclaims_per_hour > 0:
+        t = rng.expovariate(spot_reclaims_per_hour / 3600.0)
+        while t < horizon:
+            spot_reclaims.append((t, rng.choice(spot_ids), rng.uniform(300.0, 1800.0)))
+            t += rng.expovariate(spot_reclaims_per_hour / 3600.0)
+    node_failures: List[NodeEvent] = []
+    if node_failures_per_hour > 0:
+        t = rng.expovariate(node_failures_per_hour / 3600.0)
+        while t < horizon:
+            node_failures.append((t, rng.choice(resources).id, rng.uniform(600.0, 3600.0)))
+            t += rng.expovariate(node_failures_per_hour / 3600.0)
+
+    return SimulationTrace(resources=resources, workloads=workloads, arrival_times=arrival_times,
+                           durations=durations, spot_reclaims=spot_reclaims, node_failures=node_failures)
+
+def compare_placement_strategies(trace: SimulationTrace,
+                                 strategies: Optional[Dict[str, PlacementStrategy]] = None,
+                                 scheduler_factory: Optional[Callable[[], WorkloadScheduler]] = None,
+                                 cycle_interval_seconds: float = 60.0) -> List[SimulationReport]:
+    """
+    Replays the same trace under each placement strategy, and optionally through a `WorkloadScheduler`.
+
+    Args:
+        trace (SimulationTrace): The trace to replay.
+        strategies (Optional[Dict[str, PlacementStrategy]]): Strategies keyed by name. Defaults to `PLACEMENT_STRATEGIES`.
+        scheduler_factory (Optional[Callable[[], WorkloadScheduler]]): If given, the trace is also replayed with
+                                                                       placement delegated to the scheduler it builds.
+        cycle_interval_seconds (float): Simulated time between scheduling cycles for the scheduler-driven replay.
+
+    Returns:
+        List[SimulationReport]: One report per strategy, in the given order, followed by the scheduler report if requested.
+    """
+    strategies = strategies if strategies is not None else PLACEMENT_STRATEGIES
+    reports = [WorkloadSchedulingSimulator(trace, strategy, strategy_name=name).run() for name, strategy in strategies.items()]
+    if scheduler_factory is not None:
+        reports.append(WorkloadSchedulingSimulator(trace, scheduler_factory=scheduler_factory,
+                                                   cycle_interval_seconds=cycle_interval_seconds).run())
+    return reports
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a synthetic workload trace under several placement strategies.")
+    parser.add_argument("--workloads", type=int, default=1_000_000, help="Number of workloads in the synthetic trace.")
+    parser.add_argument("--resources", type=int, default=32, help="Number of compute resources in the cluster.")
+    parser.add_argument("--load", type=float, default=0.85, help="Offered CPU load relative to cluster capacity.")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for trace generation.")
+    parser.add_argument("--strategies", nargs="+", default=list(PLACEMENT_STRATEGIES),
+                        choices=list(PLACEMENT_STRATEGIES), help="Placement strategies to compare.")
+    parser.add_argument("--with-scheduler", action="store_true",
+                        help="Also replay the trace through WorkloadScheduler (intended for traces of thousands of workloads).")
+    parser.add_argument("--cycle-interval", type=float, default=60.0,
+                        help="Simulated seconds between WorkloadScheduler cycles.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    build_start = time.perf_counter()
+    trace = generate_synthetic_trace(args.workloads, num_resources=args.resources, target_load=args.load, seed=args.seed)
+    print(f"Generated trace: {args.workloads} workloads, {args.resources} resources, "
+          f"{len(trace.spot_reclaims)} spot reclaims, {len(trace.node_failures)} node failures "
+          f"in {time.perf_counter() - build_start:.2f}s.")
+
+    strategies = {name: PLACEMENT_STRATEGIES[name] for name in args.strategies}
+    scheduler_factory = offline_workload_scheduler if args.with_scheduler else None
+    for report in compare_placement_strategies(trace, strategies, scheduler_factory=scheduler_factory,
+                                               cycle_interval_seconds=args.cycle_interval):
+        print(report)
@@ -100,6 +100,179 @@ class PIDController:
         self.setpoint = new_setpoint
 
 
+class PIDControllerBank(PIDController):
+    """
+    A bank of independent PID loops sharing one clock, the vectorized counterpart of
+    `PIDController` for multi-zone control. Gains, setpoints, integrators and previous
+    errors are arrays with one entry per loop, so the inherited update law advances
+    every loop in a single array pass.
+    """
+    def __init__(self, num_loops: int,
+                 kp, ki, kd, setpoint,
+                 output_limits: tuple[float, float] = (None, None)):
+        """
+        Initializes the PID bank.
+
+        Parameters:
+            num_loops (int): Number of independent loops (e.g., zones).
+            kp, ki, kd: Gains, either shared scalars or arrays with one entry per loop.
+            setpoint: The target, either a shared scalar or an array with one entry per loop.
+            output_limits (tuple[float, float]): Optional (min, max) bounds shared by all loops.
+        """
+        if num_loops <= 0:
+            raise ValueError("num_loops must be positive")
+        self.num_loops = num_loops
+        super().__init__(kp=self._per_loop(kp), ki=self._per_loop(ki), kd=self._per_loop(kd),
+                         setpoint=self._per_loop(setpoint), output_limits=output_limits)
+        self.reset()
+
+    def _per_loop(self, value) -> np.ndarray:
+        """Broadcasts a scalar or per-loop value to a writable (num_loops,) float array."""
+        return np.broadcast_to(np.asarray(value, dtype=float), (self.num_loops,)).copy()
+
+    def update(self, current_value: np.ndarray, current_time: float) -> np.ndarray:
+        """
+        Calculates the control output of every loop from one observed value per loop.
+
+        Parameters:
+            current_value (np.ndarray): The current observed value of each loop.
+            current_time (float): The shared timestamp for calculating time differences.
+
+        Returns:
+            np.ndarray: The control output of each loop.
+        """
+        return np.zeros(self.num_loops) + super().update(current_value, current_time)
+
+    def reset(self):
+        """Resets the integral and previous error terms of every loop."""
+        self._integral_error = np.zeros(self.num_loops)
+        self._previous_error = np.zeros(self.num_loops)
+        self._last_update_time = None
+
+    def set_setpoint(self, new_setpoint):
+        """Updates the target setpoint of every loop (a shared scalar or one value per loop)."""
+        self.setpoint = self._per_loop(new_setpoint)
+
+
+class RollingTrendEstimator:
+    """
+    A sliding-window linear trend and recent mean, updated in O(1) per sample.
+
+    Samples are kept in a ring buffer of `capacity`, alongside running sums Σy, Σxy and
+    Σy² over the window (x = 0 for the oldest sample). As each sample enters and the
+    oldest leaves, the sums are adjusted in place rather than refit from scratch:
+    Σxy' = Σxy - (Σy - y_old) + (n - 1)·y_new. A second running sum covers the last
+    `recent_window` samples. Sums are taken relative to a reference value and re-derived
+    from the buffer once per wrap of the ring, which keeps rounding drift bounded at an
+    amortized O(1) cost.
+
+    Values may be scalars or arrays of `batch_shape` (e.g. one per zone), in which case
+    every zone's window advances together and `recent_window` may differ per zone.
+    """
+    def __init__(self, capacity: int, recent_window=1, batch_shape: tuple = ()):
+        """
+        Parameters:
+            capacity (int): Window length of the trend fit.
+            recent_window (int or np.ndarray): Length of the recent-mean window, shared or one per batch element.
+            batch_shape (tuple): Shape of each sample; () for a single series.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.batch_shape = tuple(batch_shape)
+        self.recent_window = np.broadcast_to(np.asarray(recent_window, dtype=int), self.batch_shape).copy()
+        if np.any(self.recent_window < 1):
+            raise ValueError("recent_window must be at least 1")
+        # Windows longer than the buffer never fill; their running sum is kept over the whole buffer.
+        self._recent_span = np.minimum(self.recent_window, capacity)
+
+        self.buffer = np.zeros(self.batch_shape + (capacity,))
+        self._head = 0 # Slot of the next sample (and, once full, of the oldest one)
+        self._count = 0
+        self._reference = np.zeros(self.batch_shape)
+        self._sum_y = np.zeros(self.batch_shape)
+        self._sum_xy = np.zeros(self.batch_shape)
+        self._sum_y2 = np.zeros(self.batch_shape)
+        self._recent_sum = np.zeros(self.batch_shape)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value):
+        """Adds one sample (a scalar, or an array of `batch_shape`) to the window."""
+        value = np.asarray(value, dtype=float)
+        if self._count == 0:
+            self._reference = np.broadcast_to(value, self.batch_shape).copy()
+        y_new = value - self._reference
+        n = self._count
+
+        # The sample leaving each recent window, read before the ring slot is overwritten.
+        recent_full = n >= self._recent_span
+        leaving_recent = np.take_along_axis(
+            self.buffer, ((self._head - self._recent_span) % self.capacity)[..., np.newaxis], axis=-1)[..., 0]
+        self._recent_sum += y_new - np.where(recent_full, leaving_recent - self._reference, 0.0)
+
+        if n == self.capacity:
+            y_old = self.buffer[..., self._head] - self._reference
+            self._sum_xy += (n - 1) * y_new - (self._sum_y - y_old)
+            self._sum_y += y_new - y_old
+            self._sum_y2 += y_new * y_new - y_old * y_old
+        else:
+            self._sum_xy += n * y_new
+            self._sum_y += y_new
+            self._sum_y2 += y_new * y_new
+            self._count = n + 1
+
+        self.buffer[..., self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        if self._head == 0:
+            self._resynchronize()
+
+    def _resynchronize(self):
+        """Re-derives the running sums from the buffer, about its latest sample."""
+        self._reference = self.latest.copy()
+        window = self._chronological() - self._reference[..., np.newaxis]
+        x = np.arange(self._count)
+        self._sum_y = window.sum(axis=-1)
+        self._sum_xy = window @ x
+        self._sum_y2 = (window * window).sum(axis=-1)
+        recent = x[np.newaxis, :] >= self._count - self._recent_span.reshape(-1, 1)
+        self._recent_sum = np.where(recent, window.reshape(-1, self._count), 0.0).sum(axis=-1).reshape(self.batch_shape)
+
+    def _chronological(self) -> np.ndarray:
+        """The buffered samples, oldest first."""
+        if self._count < self.capacity:
+            return self.buffer[..., :self._count]
+        return np.roll(self.buffer, -self._head, axis=-1)
+
+    @property
+    def latest(self) -> np.ndarray:
+        """The most recent sample."""
+        return self.buffer[..., (self._head - 1) % self.capacity]
+
+    def slope(self) -> np.ndarray:
+        """
+        The least-squares slope per step over the window; 0 with fewer than two samples
+        or when the window is flat.
+        """
+        n = self._count
+        if n < 2:
+            return np.zeros(self.batch_shape)
+        sum_x = n * (n - 1) / 2.0
+        sum_x2 = (n - 1) * n * (2 * n - 1) / 6.0
+        slope = (n * self._sum_xy - sum_x * self._sum_y) / (n * sum_x2 - sum_x ** 2)
+        spread = n * self._sum_y2 - self._sum_y * self._sum_y
+        return np.where(spread <= 1e-12 * n * self._sum_y2, 0.0, slope)
+
+    def recent_mean(self) -> np.ndarray:
+        """
+        The mean of the last `recent_window` samples, or the latest sample while fewer are buffered.
+        """
+        return np.where(self._count >= self.recent_window,
+                        self._reference + self._recent_sum / self._recent_span,
+                        self.latest)
+
+
 class MicroclimatePredictor:
     """
     A more sophisticated predictive model that moves beyond simple moving averages,
@@ -116,6 +289,9 @@ class MicroclimatePredictor:
         self.prediction_horizon_steps = prediction_horizon_steps
         self.temp_history = collections.deque(maxlen=history_buffer_size)
         self.humidity_history = collections.deque(maxlen=history_buffer_size)
+        # Rolling trend and recent-average estimators over the same windows, updated in O(1) per sample.
+        self.temp_estimator = RollingTrendEstimator(history_buffer_size, prediction_horizon_steps)
+        self.humidity_estimator = RollingTrendEstimator(history_buffer_size, prediction_horizon_steps)
 
         # Conceptual parameters for a more advanced internal model (e.g., linear regression coefficients)
         self.temp_trend_weight = 0.1
@@ -127,11 +303,14 @@ class MicroclimatePredictor:
         """Updates the internal historical data buffers."""
         self.temp_history.append(current_temperature)
         self.humidity_history.append(current_humidity)
+        self.temp_estimator.append(current_temperature)
+        self.humidity_estimator.append(current_humidity)
 
     def _calculate_trend(self, history: collections.deque) -> float:
         """
         Calculates a simple linear trend from the recent history.
         In a real system, this would be a more complex time-series model.
+        This is the from-scratch fit; `predict` reads the same slope off the rolling estimators.
         """
         if len(history) < 2:
             return 0.0 # No trend if not enough data
@@ -164,15 +343,13 @@ class MicroclimatePredictor:
             # Fallback if no history
             return 295.15, 0.60 # Default values if no data yet
 
-        # Base prediction from recent average
-        base_predicted_temp = np.mean(list(self.temp_history)[-self.prediction_horizon_steps:]) \
-                              if len(self.temp_history) >= self.prediction_horizon_steps else self.temp_history[-1]
-        base_predicted_humidity = np.mean(list(self.humidity_history)[-self.prediction_horizon_steps:]) \
-                                  if len(self.humidity_history) >= self.prediction_horizon_steps else self.humidity_history[-1]
+        # Base prediction from recent average (the last `prediction_horizon_steps` samples, or the latest one)
+        base_predicted_temp = float(self.temp_estimator.recent_mean())
+        base_predicted_humidity = float(self.humidity_estimator.recent_mean())
 
         # Add trend component
-        temp_trend = self._calculate_trend(self.temp_history) * self.prediction_horizon_steps * self.temp_trend_weight
-        humidity_trend = self._calculate_trend(self.humidity_history) * self.prediction_horizon_steps * self.humidity_trend_weight
+        temp_trend = float(self.temp_estimator.slope()) * self.prediction_horizon_steps * self.temp_trend_weight
+        humidity_trend = float(self.humidity_estimator.slope()) * self.prediction_horizon_steps * self.humidity_trend_weight
 
         predicted_temp = base_predicted_temp + temp_trend
         predicted_humidity = base_predicted_humidity + humidity_trend
@@ -193,6 +370,69 @@ class MicroclimatePredictor:
         return predicted_temp, predicted_humidity
 
 
+class MultiZonePredictor(MicroclimatePredictor):
+    """
+    The vectorized counterpart of `MicroclimatePredictor` for many zones at once. The
+    temperature and humidity histories of all zones are batched `RollingTrendEstimator`s
+    sharing one write head, and the recent average, trend, diurnal nudge and noise of
+    every zone are produced by a single array pass. The prediction horizon may differ
+    per zone.
+    """
+    def __init__(self, num_zones: int, history_buffer_size: int, prediction_horizon_steps):
+        """
+        Parameters:
+            num_zones (int): Number of zones predicted together.
+            history_buffer_size (int): Capacity of each zone's history.
+            prediction_horizon_steps (int or np.ndarray): Horizon in steps, shared or one per zone.
+        """
+        if num_zones <= 0:
+            raise ValueError("num_zones must be positive")
+        super().__init__(history_buffer_size, 1)
+        self.num_zones = num_zones
+        self.temp_estimator = RollingTrendEstimator(history_buffer_size, prediction_horizon_steps, (num_zones,))
+        self.humidity_estimator = RollingTrendEstimator(history_buffer_size, prediction_horizon_steps, (num_zones,))
+        self.prediction_horizon_steps = self.temp_estimator.recent_window
+        # (zones x history) ring buffers, oldest sample at the estimators' write head once full.
+        self.temp_history = self.temp_estimator.buffer
+        self.humidity_history = self.humidity_estimator.buffer
+
+    def update_history(self, current_temperature: np.ndarray, current_humidity: np.ndarray):
+        """Appends one sample per zone to the histories."""
+        self.temp_estimator.append(current_temperature)
+        self.humidity_estimator.append(current_humidity)
+
+    def predict(self, temp_noise=None, humidity_noise=None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Predicts the future atmospheric state of every zone, with the same components as
+        `MicroclimatePredictor.predict`: recent average, trend, diurnal nudge and noise.
+
+        Parameters:
+            temp_noise, humidity_noise: Optional model noise draws (before horizon scaling), shared or
+                                        one per zone, replacing the random draws, e.g. to replay a trace.
+        """
+        history_length = len(self.temp_estimator)
+        if history_length == 0:
+            return np.full(self.num_zones, 295.15), np.full(self.num_zones, 0.60)
+
+        horizon_scale = self.prediction_horizon_steps / 5.0
+        predicted_temp = self.temp_estimator.recent_mean() + \
+            self.temp_estimator.slope() * self.prediction_horizon_steps * self.temp_trend_weight
+        predicted_humidity = self.humidity_estimator.recent_mean() + \
+            self.humidity_estimator.slope() * self.prediction_horizon_steps * self.humidity_trend_weight
+
+        external_temp_nudge = np.sin(np.pi * (history_length % 1440) / 720.0) * 0.1
+        predicted_temp = predicted_temp + external_temp_nudge * horizon_scale
+
+        if temp_noise is None:
+            temp_noise = np.random.normal(0, self.noise_amplitude_temp, self.num_zones)
+        if humidity_noise is None:
+            humidity_noise = np.random.normal(0, self.noise_amplitude_humidity, self.num_zones)
+        predicted_temp = predicted_temp + temp_noise * horizon_scale
+        predicted_humidity = predicted_humidity + humidity_noise * horizon_scale
+
+        return predicted_temp, np.clip(predicted_humidity, 0.01, 0.99)
+
+
 class AMUOrchestrator:
     """
     Translates abstract control signals into concrete, optimized commands for
@@ -282,6 +522,155 @@ class AMUOrchestrator:
 
         return commands
 
+    def generate_amu_command_arrays(self,
+                                    desired_temp_rates: np.ndarray,
+                                    desired_humidity_rates: np.ndarray) -> dict:
+        """
+        Vectorized `generate_amu_commands`: the same translation, efficiency scaling, clipping and
+        minimal-command thresholds, applied to one desired rate per zone at once.
+
+        Parameters:
+            desired_temp_rates (np.ndarray): Desired temperature rates of change (K/s), one per zone.
+            desired_humidity_rates (np.ndarray): Desired relative humidity rates of change (unitless/s), one per zone.
+
+        Returns:
+            dict: The same command keys as `generate_amu_commands`, each holding an array with one entry per zone.
+        """
+        desired_temp_rates = np.asarray(desired_temp_rates, dtype=float)
+        desired_humidity_rates = np.asarray(desired_humidity_rates, dtype=float)
+
+        raw_energy_command = desired_temp_rates * (self.max_energy_watts / (2.0 * self.cost_energy_temp)) / self.efficiency_factor
+        energy = np.clip(raw_energy_command, -self.max_energy_watts, self.max_energy_watts)
+
+        raw_aerosol_command = desired_humidity_rates * (self.max_aerosol_grams_per_sec / (2.0 * self.cost_aerosol_humidity)) / self.efficiency_factor
+        aerosol = np.clip(raw_aerosol_command, -self.max_aerosol_grams_per_sec, self.max_aerosol_grams_per_sec)
+
+        raw_ionization_command = desired_humidity_rates * (-self.max_ionization_coulombs_per_m3 / (2.0 * self.cost_ionization_humidity)) / self.efficiency_factor
+        ionization = np.clip(raw_ionization_command, -self.max_ionization_coulombs_per_m3, self.max_ionization_coulombs_per_m3)
+
+        # --- Minimal Command Thresholds ---
+        energy = np.where(np.abs(desired_temp_rates) < 0.0001, 0.0, energy)
+        humidity_idle = np.abs(desired_humidity_rates) < 0.00001
+        aerosol = np.where(humidity_idle, 0.0, aerosol)
+        ionization = np.where(humidity_idle, 0.0, ionization)
+
+        # --- Resource Utilization Calculation (Conceptual) ---
+        utilization = np.maximum(np.maximum(np.abs(energy) / self.max_energy_watts,
+                                            np.abs(aerosol) / self.max_aerosol_grams_per_sec),
+                                 np.abs(ionization) / self.max_ionization_coulombs_per_m3) * 100
+
+        return {
+            "directed_energy_output_watts": energy,
+            "aerosol_injection_rate_grams_per_sec": aerosol,
+            "ionization_charge_density_coulombs_per_m3": ionization,
+            "resource_utilization_percent": utilization
+        }
+
+
+class RollingErrorStatistics:
+    """
+    Sliding-window statistics of a signal, updated in O(1) per sample.
+
+    The window's mean and sum of squared deviations follow Welford's recurrence, extended
+    to let the oldest sample leave as a new one enters, and are re-derived from the ring
+    buffer once per wrap to keep rounding drift bounded. Two counters track oscillation
+    in the window: zero crossings (consecutive samples of opposite sign) and reversals
+    (consecutive steps of opposite direction). Each is adjusted only for the pairs and
+    triples of samples that enter or leave the window.
+
+    Values may be scalars or arrays of `batch_shape` (e.g. one per zone).
+    """
+    def __init__(self, window: int, batch_shape: tuple = ()):
+        """
+        Parameters:
+            window (int): Number of most recent samples covered.
+            batch_shape (tuple): Shape of each sample; () for a single series.
+        """
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.batch_shape = tuple(batch_shape)
+        self.buffer = np.zeros(self.batch_shape + (window,))
+        self._head = 0 # Slot of the next sample (and, once full, of the oldest one)
+        self._count = 0
+        self._mean = np.zeros(self.batch_shape)
+        self._m2 = np.zeros(self.batch_shape)
+        self.zero_crossings = np.zeros(self.batch_shape, dtype=int)
+        self.reversals = np.zeros(self.batch_shape, dtype=int)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _sample(self, age: int) -> np.ndarray:
+        """The sample `age` steps back from the newest (0 = newest)."""
+        return self.buffer[..., (self._head - 1 - age) % self.window]
+
+    def append(self, value):
+        """Adds one sample (a scalar, or an array of `batch_shape`) to the window."""
+        value = np.asarray(value, dtype=float)
+        n = self._count
+
+        if n == self.window:
+            # The oldest sample leaves, taking its pair and triple with it.
+            oldest = self._sample(n - 1)
+            if n >= 2:
+                self.zero_crossings -= (oldest * self._sample(n - 2) < 0)
+            if n >= 3:
+                self.reversals -= ((self._sample(n - 2) - oldest) * (self._sample(n - 3) - self._sample(n - 2)) < 0)
+            mean = self._mean + (value - oldest) / n
+            self._m2 = self._m2 + (value - oldest) * (value - mean + oldest - self._mean)
+            self._mean = mean
+            kept = n - 1
+        else:
+            delta = value - self._mean
+            self._mean = self._mean + delta / (n + 1)
+            self._m2 = self._m2 + delta * (value - self._mean)
+            self._count = n + 1
+            kept = n
+
+        # The new sample's pair and triple with the samples that remain.
+        if kept >= 1:
+            self.zero_crossings += (self._sample(0) * value < 0)
+        if kept >= 2:
+            self.reversals += ((self._sample(0) - self._sample(1)) * (value - self._sample(0)) < 0)
+
+        self.buffer[..., self._head] = value
+        self._head = (self._head + 1) % self.window
+        if self._head == 0:
+            self._resynchronize()
+
+    def _resynchronize(self):
+        """Re-derives the mean and squared deviations from the (full) buffer."""
+        self._mean = self.buffer.mean(axis=-1)
+        deviations = self.buffer - self._mean[..., np.newaxis]
+        self._m2 = (deviations * deviations).sum(axis=-1)
+
+    @property
+    def mean(self) -> np.ndarray:
+        """The mean of the window."""
+        return self._mean
+
+    @property
+    def variance(self) -> np.ndarray:
+        """The population variance of the window."""
+        if self._count == 0:
+            return np.zeros(self.batch_shape)
+        return np.maximum(self._m2, 0.0) / self._count
+
+    @property
+    def std(self) -> np.ndarray:
+        """The population standard deviation of the window."""
+        return np.sqrt(self.variance)
+
+    def summary(self) -> dict:
+        """The window's statistics as a dict (plain floats and ints for a single series)."""
+        if self.batch_shape:
+            # Copies, since `append` updates the counters in place.
+            return {"mean": self.mean.copy(), "std": self.std,
+                    "zero_crossings": self.zero_crossings.copy(), "reversals": self.reversals.copy()}
+        return {"mean": float(self.mean), "std": float(self.std),
+                "zero_crossings": int(self.zero_crossings), "reversals": int(self.reversals)}
+
 
 class MicroclimateIntegrityMonitor:
     """
@@ -310,13 +699,19 @@ class MicroclimateIntegrityMonitor:
         self.recent_humidity_errors = collections.deque(maxlen=history_window)
         self.recent_resource_utilization = collections.deque(maxlen=history_window)
 
-    def _analyze_stability(self, errors: collections.deque, threshold: float) -> str:
+        # Rolling statistics over the same windows, so each cycle's analysis is O(1)
+        # regardless of `history_window`.
+        self.temp_error_stats = RollingErrorStatistics(history_window)
+        self.humidity_error_stats = RollingErrorStatistics(history_window)
+        self.resource_utilization_stats = RollingErrorStatistics(history_window)
+
+    def _analyze_stability(self, stats: RollingErrorStatistics, threshold: float) -> str:
         """Analyzes recent errors for sustained instability or drift."""
-        if len(errors) < self.history_window:
+        if len(stats) < self.history_window:
             return "Insufficient_History"
 
-        mean_error = np.mean(errors)
-        std_dev_error = np.std(errors)
+        mean_error = float(stats.mean)
+        std_dev_error = float(stats.std)
 
         if abs(mean_error) > threshold * 2 and std_dev_error < threshold:
             return "Persistent_Drift" # System consistently off target
@@ -349,10 +744,17 @@ class MicroclimateIntegrityMonitor:
         self.recent_temp_errors.append(current_temp_error)
         self.recent_humidity_errors.append(current_humidity_error)
         self.recent_resource_utilization.append(current_resource_util)
+        self.temp_error_stats.append(current_temp_error)
+        self.humidity_error_stats.append(current_humidity_error)
+        self.resource_utilization_stats.append(current_resource_util)
 
         # --- 1. Control Performance Analysis ---
-        temp_stability = self._analyze_stability(self.recent_temp_errors, self.temp_stability_threshold)
-        humidity_stability = self._analyze_stability(self.recent_humidity_errors, self.humidity_stability_threshold)
+        temp_stability = self._analyze_stability(self.temp_error_stats, self.temp_stability_threshold)
+        humidity_stability = self._analyze_stability(self.humidity_error_stats, self.humidity_stability_threshold)
+        diagnostics["error_statistics"] = {
+            "temperature": self.temp_error_stats.summary(),
+            "humidity": self.humidity_error_stats.summary(),
+        }
 
         if temp_stability != "Stable" and temp_stability != "Insufficient_History":
             diagnostics["system_status"] = "Suboptimal"
@@ -369,7 +771,7 @@ class MicroclimateIntegrityMonitor:
             diagnostics["system_status"] = "Warning"
             diagnostics["anomalies_detected"].append("High_Resource_Utilization")
             diagnostics["recommendations"].append("Excessive AMU demand. Check for sustained, large external disturbances or inefficient targets.")
-        elif np.mean(self.recent_resource_utilization) > self.max_resource_utilization_alert * 0.75 and len(self.recent_resource_utilization) == self.history_window:
+        elif self.resource_utilization_stats.mean > self.max_resource_utilization_alert * 0.75 and len(self.resource_utilization_stats) == self.history_window:
             diagnostics["system_status"] = "Warning"
             diagnostics["anomalies_detected"].append("Sustained_High_Resource_Utilization")
             diagnostics["recommendations"].append("Long-term high AMU demand. Consider adjusting target conditions or scaling AMU capacity.")
@@ -406,6 +808,144 @@ class MicroclimateIntegrityMonitor:
         return diagnostics
 
 
+class MultiZoneIntegrityMonitor(MicroclimateIntegrityMonitor):
+    """
+    The vectorized counterpart of `MicroclimateIntegrityMonitor`. The recent errors and
+    resource utilization of all zones are tracked by (zones,) `RollingErrorStatistics`,
+    and every check of `diagnose` runs on whole arrays in O(zones) per cycle, whatever
+    the history window. A zone's status is reported as a code into `STATUS_LEVELS` and
+    its anomalies as a row of flags over `ANOMALIES`, so a grid of thousands of zones is
+    diagnosed without building a dict per zone.
+    """
+    STATUS_LEVELS = ("Optimal", "Suboptimal", "Warning", "Critical")
+
+    # (anomaly, recommendation) in the order `diagnose` reports them.
+    ANOMALIES = (
+        ("Temperature_Persistent_Drift", "Evaluate temperature PID gains or external disturbances."),
+        ("Temperature_Oscillation_Detected", "Evaluate temperature PID gains or external disturbances."),
+        ("Temperature_Minor_Deviation", "Evaluate temperature PID gains or external disturbances."),
+        ("Humidity_Persistent_Drift", "Evaluate humidity PID gains or AMU response effectiveness."),
+        ("Humidity_Oscillation_Detected", "Evaluate humidity PID gains or AMU response effectiveness."),
+        ("Humidity_Minor_Deviation", "Evaluate humidity PID gains or AMU response effectiveness."),
+        ("High_Resource_Utilization", "Excessive AMU demand. Check for sustained, large external disturbances or inefficient targets."),
+        ("Sustained_High_Resource_Utilization", "Long-term high AMU demand. Consider adjusting target conditions or scaling AMU capacity."),
+        ("Temperature_Sensor_Out_Of_Range", "Immediate sensor diagnostic required. Potential hardware failure or catastrophic environmental event."),
+        ("Humidity_Sensor_Out_Of_Range", "Immediate sensor diagnostic required. Potential hardware failure or catastrophic environmental event."),
+        ("Large_Temp_Prediction_Error", "Predictive model requires retraining or recalibration for temperature."),
+        ("Large_Humidity_Prediction_Error", "Predictive model requires retraining or recalibration for humidity."),
+    )
+
+    def __init__(self, num_zones: int,
+                 temp_stability_threshold: float = 0.5,
+                 humidity_stability_threshold: float = 0.02,
+                 max_resource_utilization_alert: float = 90.0,
+                 history_window: int = 10):
+        if num_zones <= 0:
+            raise ValueError("num_zones must be positive")
+        if history_window <= 0:
+            raise ValueError("history_window must be positive")
+        super().__init__(temp_stability_threshold, humidity_stability_threshold,
+                         max_resource_utilization_alert, history_window)
+        self.num_zones = num_zones
+        self.temp_error_stats = RollingErrorStatistics(history_window, (num_zones,))
+        self.humidity_error_stats = RollingErrorStatistics(history_window, (num_zones,))
+        self.resource_utilization_stats = RollingErrorStatistics(history_window, (num_zones,))
+        # The (zones x window) rings behind the statistics, oldest sample at the write head.
+        self.recent_temp_errors = self.temp_error_stats.buffer
+        self.recent_humidity_errors = self.humidity_error_stats.buffer
+        self.recent_resource_utilization = self.resource_utilization_stats.buffer
+
+    def _analyze_stability(self, stats: RollingErrorStatistics, threshold: float) -> np.ndarray:
+        """
+        Classifies every zone's recent errors, returning a (zones x 3) flag matrix over
+        Persistent_Drift, Oscillation_Detected and Minor_Deviation (all False while the
+        window is still filling, or when the zone is stable).
+        """
+        flags = np.zeros((self.num_zones, 3), dtype=bool)
+        if len(stats) < self.history_window:
+            return flags
+
+        mean_error = np.abs(stats.mean)
+        std_dev_error = stats.std
+
+        flags[:, 0] = (mean_error > threshold * 2) & (std_dev_error < threshold)
+        flags[:, 1] = ~flags[:, 0] & (std_dev_error > threshold * 1.5)
+        flags[:, 2] = ~flags[:, 0] & ~flags[:, 1] & (mean_error > threshold * 0.5)
+        return flags
+
+    def diagnose(self, control_summary: dict) -> dict:
+        """
+        Performs the diagnostic checks of `MicroclimateIntegrityMonitor.diagnose` on every zone.
+
+        Parameters:
+            control_summary (dict): The summary from a `MultiZoneMicroclimateController.run_control_cycle`,
+                                    whose entries are arrays with one value per zone.
+
+        Returns:
+            dict: "status_codes" (indices into `STATUS_LEVELS`), "system_status" (the matching names),
+                  "anomalies" (a zones x len(`ANOMALIES`) boolean matrix) and "error_statistics"
+                  (per-zone rolling mean, std, zero crossings and reversals of each error).
+        """
+        current_resource_util = control_summary["amu_commands"]["resource_utilization_percent"]
+
+        self.temp_error_stats.append(control_summary["temp_error_K"])
+        self.humidity_error_stats.append(control_summary["humidity_error_RH"])
+        self.resource_utilization_stats.append(current_resource_util)
+
+        anomalies = np.zeros((self.num_zones, len(self.ANOMALIES)), dtype=bool)
+        status_codes = np.zeros(self.num_zones, dtype=int)
+
+        # --- 1. Control Performance Analysis ---
+        anomalies[:, 0:3] = self._analyze_stability(self.temp_error_stats, self.temp_stability_threshold)
+        anomalies[:, 3:6] = self._analyze_stability(self.humidity_error_stats, self.humidity_stability_threshold)
+        status_codes[anomalies[:, 0:6].any(axis=1)] = 1
+
+        # --- 2. Resource Utilization Check ---
+        anomalies[:, 6] = current_resource_util > self.max_resource_utilization_alert
+        if len(self.resource_utilization_stats) == self.history_window:
+            anomalies[:, 7] = ~anomalies[:, 6] & \
+                (self.resource_utilization_stats.mean > self.max_resource_utilization_alert * 0.75)
+        status_codes[anomalies[:, 6] | anomalies[:, 7]] = 2
+
+        # --- 3. Sensor Plausibility (Conceptual) ---
+        final_temperature = control_summary["final_temperature_K"]
+        final_humidity = control_summary["final_humidity_RH"]
+        anomalies[:, 8] = ~((200 < final_temperature) & (final_temperature < 350))
+        anomalies[:, 9] = ~((0.0 < final_humidity) & (final_humidity < 1.0))
+        status_codes[anomalies[:, 8] | anomalies[:, 9]] = 3
+
+        # --- 4. Prediction Accuracy (Conceptual) ---
+        anomalies[:, 10] = np.abs(control_summary["initial_temperature_K"] - control_summary["predicted_temperature_K"]) > self.temp_stability_threshold * 2
+        anomalies[:, 11] = np.abs(control_summary["initial_humidity_RH"] - control_summary["predicted_humidity_RH"]) > self.humidity_stability_threshold * 2
+        status_codes[anomalies[:, 10] | anomalies[:, 11]] = 1
+
+        return {
+            "status_codes": status_codes,
+            "system_status": np.asarray(self.STATUS_LEVELS)[status_codes],
+            "anomalies": anomalies,
+            "error_statistics": {
+                "temperature": self.temp_error_stats.summary(),
+                "humidity": self.humidity_error_stats.summary(),
+            }
+        }
+
+    def zone_report(self, diagnostics: dict, zone: int) -> dict:
+        """
+        Expands one zone's entry of a `diagnose` result into the report format of
+        `MicroclimateIntegrityMonitor.diagnose`.
+        """
+        flagged = [self.ANOMALIES[i] for i in np.flatnonzero(diagnostics["anomalies"][zone])]
+        return {
+            "system_status": str(diagnostics["system_status"][zone]),
+            "anomalies_detected": [name for name, _ in flagged],
+            "recommendations": [recommendation for _, recommendation in flagged],
+            "error_statistics": {
+                signal: {key: value[zone].item() for key, value in stats.items()}
+                for signal, stats in diagnostics["error_statistics"].items()
+            }
+        }
+
+
 class MicroclimateController:
     """
     Manages the adaptive control logic for localized atmospheric modulation within the
@@ -609,8 +1149,365 @@ class MicroclimateController:
 
         return control_summary
 
+class MultiZoneMicroclimateController:
+    """
+    The vectorized counterpart of `MicroclimateController` for grids of many zones.
+
+    Zone states, PID integrators, the predictor's histories and the monitor's windows are
+    held as arrays with one row per zone, and `run_control_cycle` advances every zone with
+    one array pass through the same sequence as the single-zone controller: prediction,
+    PID, AMU orchestration, environmental response and diagnosis. Targets, gains and
+    prediction horizons may be shared scalars or given per zone.
+    """
+
+    def __init__(self,
+                 num_zones: int,
+                 target_temperature=295.15,
+                 target_humidity=0.60,
+                 kp_temp=0.1, ki_temp=0.005, kd_temp=0.05,
+                 kp_hum=0.5, ki_hum=0.01, kd_hum=0.1,
+                 prediction_horizon_steps=5,
+                 history_buffer_size: int = 60,
+                 control_interval_sec: float = 60.0):
+        """
+        Initializes the controller for `num_zones` zones.
+
+        Parameters:
+            num_zones (int): Number of zones controlled together.
+            target_temperature, target_humidity: Setpoints, shared or one per zone.
+            kp_temp, ki_temp, kd_temp: Temperature PID gains, shared or one per zone.
+            kp_hum, ki_hum, kd_hum: Humidity PID gains, shared or one per zone.
+            prediction_horizon_steps: Prediction horizon in steps, shared or one per zone.
+            history_buffer_size (int): Capacity of each zone's history (at least 3).
+            control_interval_sec (float): Expected time step between control cycles.
+        """
+        if num_zones <= 0:
+            raise ValueError("num_zones must be positive")
+        if history_buffer_size < 3:
+            raise ValueError("history_buffer_size must be at least 3")
+        self.num_zones = num_zones
+        self.control_interval_sec = control_interval_sec
+        self.current_time_s = 0.0
+
+        self.temp_pid_controller = PIDControllerBank(
+            num_zones, kp_temp, ki_temp, kd_temp, target_temperature,
+            output_limits=(-5.0/self.control_interval_sec, 5.0/self.control_interval_sec)
+        )
+        self.humidity_pid_controller = PIDControllerBank(
+            num_zones, kp_hum, ki_hum, kd_hum, target_humidity,
+            output_limits=(-0.1/self.control_interval_sec, 0.1/self.control_interval_sec)
+        )
+        self.target_temperature = self.temp_pid_controller.setpoint
+        self.target_humidity = self.humidity_pid_controller.setpoint
+
+        # Current atmospheric state of every zone (simulated sensor readings).
+        self._current_temperature = self.target_temperature + np.random.uniform(-1.0, 1.0, num_zones)
+        self._current_humidity = self.target_humidity + np.random.uniform(-0.05, 0.05, num_zones)
+
+        self.predictor = MultiZonePredictor(num_zones, history_buffer_size, prediction_horizon_steps)
+        self.prediction_horizon_steps = self.predictor.prediction_horizon_steps
+        for _ in range(history_buffer_size):
+            self.predictor.update_history(self._current_temperature + np.random.normal(0, 0.1, num_zones),
+                                          self._current_humidity + np.random.normal(0, 0.001, num_zones))
+        self.orchestrator = AMUOrchestrator()
+        self.monitor = MultiZoneIntegrityMonitor(num_zones, history_window=history_buffer_size // 3)
+
+        # The persistent external disturbance every zone must fight.
+        self.external_thermal_drift_rate = 0.001
+        self.external_humidity_influx_rate = 0.00001
+
+    def _simulate_environmental_response(self,
+                                         amu_commands: dict,
+                                         time_step: float = 60.0,
+                                         temp_noise=None,
+                                         humidity_noise=None) -> None:
+        """
+        Applies the AMU commands, the external drift and natural noise to every zone,
+        as `MicroclimateController._simulate_environmental_response` does to one.
+        `temp_noise` and `humidity_noise`, if given, replace the natural noise draws
+        (before time-step scaling), shared or one per zone.
+        """
+        temperature = self._current_temperature + amu_commands["directed_energy_output_watts"] / (50000.0 * 20.0) * time_step
+        humidity = self._current_humidity + \
+            (amu_commands["aerosol_injection_rate_grams_per_sec"] / 1000.0 * time_step +
+             amu_commands["ionization_charge_density_coulombs_per_m3"] / 5000.0 * time_step)
+
+        drift_direction_temp = np.where(temperature > self.target_temperature, -1.0, 1.0)
+        drift_direction_hum = np.where(humidity > self.target_humidity, -1.0, 1.0)
+        temperature += drift_direction_temp * self.external_thermal_drift_rate * time_step * 0.1
+        humidity += drift_direction_hum * self.external_humidity_influx_rate * time_step * 0.5
+
+        if temp_noise is None:
+            temp_noise = np.random.normal(0, 0.05, self.num_zones)
+        if humidity_noise is None:
+            humidity_noise = np.random.normal(0, 0.001, self.num_zones)
+        temperature += temp_noise * (time_step / self.control_interval_sec)
+        humidity += humidity_noise * (time_step / self.control_interval_sec)
+
+        self._current_temperature = temperature
+        self._current_humidity = np.clip(humidity, 0.01, 0.99)
+        self.predictor.update_history(self._current_temperature, self._current_humidity)
+
+    def set_initial_state(self, temperature, humidity, temperature_history=None, humidity_history=None):
+        """
+        Places every zone in a given state, e.g. so that several configurations start alike.
+
+        Parameters:
+            temperature, humidity: The current state, shared or one value per zone.
+            temperature_history, humidity_history: Optional prior samples, oldest first, as a
+                                                   (history,) array shared by all zones or a
+                                                   (zones, history) array. By default the
+                                                   history is filled with the current state.
+        """
+        self._current_temperature = np.broadcast_to(np.asarray(temperature, dtype=float), (self.num_zones,)).copy()
+        self._current_humidity = np.broadcast_to(np.asarray(humidity, dtype=float), (self.num_zones,)).copy()
+        history_buffer_size = self.predictor.history_buffer_size
+        if temperature_history is None:
+            temperature_history = np.repeat(self._current_temperature[:, np.newaxis], history_buffer_size, axis=1)
+        if humidity_history is None:
+            humidity_history = np.repeat(self._current_humidity[:, np.newaxis], history_buffer_size, axis=1)
+
+        self.predictor = MultiZonePredictor(self.num_zones, history_buffer_size, self.prediction_horizon_steps)
+        temperature_history = np.asarray(temperature_history, dtype=float)
+        humidity_history = np.asarray(humidity_history, dtype=float)
+        for step in range(temperature_history.shape[-1]):
+            self.predictor.update_history(temperature_history[..., step], humidity_history[..., step])
+
+    def run_control_cycle(self, time_step: float = 60.0, disturbance: dict = None) -> dict:
+        """
+        Executes one control cycle for every zone at once. See `MicroclimateController.run_control_cycle`
+        for the sequence of operations.
+
+        Parameters:
+            time_step (float): The duration, in seconds, that this control cycle represents.
+            disturbance (dict): Optional noise draws replacing this cycle's random ones, shared or one
+                                per zone: "prediction_temp_noise", "prediction_humidity_noise",
+                                "environment_temp_noise" and "environment_humidity_noise" (any subset).
+
+        Returns:
+            dict: The keys of the single-zone summary, each holding an array with one (unrounded)
+                  value per zone; "amu_commands" and "diagnostics" are dicts of such arrays.
+        """
+        self.current_time_s += time_step
+
+        disturbance = disturbance or {}
+        current_T, current_RH = self._current_temperature, self._current_humidity
+        predicted_T, predicted_RH = self.predictor.predict(disturbance.get("prediction_temp_noise"),
+                                                           disturbance.get("prediction_humidity_noise"))
+
+        desired_temp_rate = self.temp_pid_controller.update(predicted_T, self.current_time_s)
+        desired_humidity_rate = self.humidity_pid_controller.update(predicted_RH, self.current_time_s)
+
+        amu_commands = self.orchestrator.generate_amu_command_arrays(desired_temp_rate, desired_humidity_rate)
+        self._simulate_environmental_response(amu_commands, time_step,
+                                              disturbance.get("environment_temp_noise"),
+                                              disturbance.get("environment_humidity_noise"))
+
+        control_summary = {
+            "cycle_time_step_s": time_step,
+            "current_sim_time_s": self.current_time_s,
+            "initial_temperature_K": current_T,
+            "initial_humidity_RH": current_RH,
+            "predicted_temperature_K": predicted_T,
+            "predicted_humidity_RH": predicted_RH,
+            "target_temperature_K": self.target_temperature,
+            "target_humidity_RH": self.target_humidity,
+            "temp_error_K": self.target_temperature - current_T,
+            "humidity_error_RH": self.target_humidity - current_RH,
+            "desired_temp_rate_K_per_s": desired_temp_rate,
+            "desired_humidity_rate_per_s": desired_humidity_rate,
+            "amu_commands": amu_commands,
+            "final_temperature_K": self._current_temperature,
+            "final_humidity_RH": self._current_humidity
+        }
+        control_summary["diagnostics"] = self.monitor.diagnose(control_summary)
+
+        return control_summary
+
+
+class MicroclimateTuningSweep:
+    """
+    Batch what-if simulation for PID tuning. Every (kp, ki, kd, horizon) configuration of a
+    grid becomes one zone of a `MultiZoneMicroclimateController`, all zones start from the
+    same state and are driven through the same disturbance trace, and the whole grid is
+    advanced by one vectorized control cycle per step. Settling time, overshoot, integrated
+    error and the effort of each actuator are accumulated per configuration as the simulation runs.
+    """
+    # Noise amplitudes of the simulated environment (see `_simulate_environmental_response`).
+    ENVIRONMENT_TEMP_NOISE = 0.05
+    ENVIRONMENT_HUMIDITY_NOISE = 0.001
+
+    def __init__(self, kp, ki, kd, prediction_horizon_steps,
+                 loop: str = "temperature",
+                 target_temperature: float = 295.15,
+                 target_humidity: float = 0.60,
+                 initial_temperature: float = None,
+                 initial_humidity: float = None,
+                 history_buffer_size: int = 60,
+                 control_interval_sec: float = 60.0):
+        """
+        Parameters:
+            kp, ki, kd, prediction_horizon_steps: One value per configuration (see `gain_grid`);
+                                                  scalars are shared by all configurations.
+            loop (str): The loop being tuned, "temperature" or "humidity". The other loop keeps
+                        the default gains of `MicroclimateController`.
+            target_temperature, target_humidity: The setpoints.
+            initial_temperature, initial_humidity: The common starting state. By default the
+                                                   tuned loop starts one step away from its target
+                                                   (1 K, or 0.05 RH) and the other loop on target.
+            history_buffer_size (int): Predictor history length.
+            control_interval_sec (float): Nominal control interval.
+        """
+        if loop not in ("temperature", "humidity"):
+            raise ValueError("loop must be 'temperature' or 'humidity'")
+        configurations = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float))
+                                               for v in (kp, ki, kd, prediction_horizon_steps)))
+        self.kp, self.ki, self.kd = (c.copy() for c in configurations[:3])
+        self.prediction_horizon_steps = configurations[3].astype(int)
+        self.num_configurations = self.kp.shape[0]
+        self.loop = loop
+        self.target_temperature = target_temperature
+        self.target_humidity = target_humidity
+        if initial_temperature is None:
+            initial_temperature = target_temperature + (1.0 if loop == "temperature" else 0.0)
+        if initial_humidity is None:
+            initial_humidity = target_humidity + (0.05 if loop == "humidity" else 0.0)
+        self.initial_temperature = initial_temperature
+        self.initial_humidity = initial_humidity
+        self.history_buffer_size = history_buffer_size
+        self.control_interval_sec = control_interval_sec
+
+    @staticmethod
+    def gain_grid(kp_values, ki_values, kd_values, horizons) -> tuple:
+        """
+        Expands value lists into the full Cartesian grid of configurations.
+
+        Returns:
+            tuple: Flat (kp, ki, kd, horizon) arrays, one entry per configuration.
+        """
+        grids = np.meshgrid(np.asarray(kp_values, dtype=float), np.asarray(ki_values, dtype=float),
+                            np.asarray(kd_values, dtype=float), np.asarray(horizons, dtype=int), indexing="ij")
+        return tuple(g.ravel() for g in grids)
+
+    def generate_disturbance_trace(self, num_cycles: int, seed: int = None) -> dict:
+        """
+        Draws one disturbance trace, to be shared by every configuration.
+
+        Parameters:
+            num_cycles (int): Number of control cycles.
+            seed (int): Optional seed, for a reproducible trace.
+
+        Returns:
+            dict: (num_cycles,) arrays under the keys accepted by
+                  `MultiZoneMicroclimateController.run_control_cycle`'s `disturbance`.
+        """
+        rng = np.random.default_rng(seed)
+        reference = MicroclimatePredictor(1, 1)
+        return {
+            "prediction_temp_noise": rng.normal(0, reference.noise_amplitude_temp, num_cycles),
+            "prediction_humidity_noise": rng.normal(0, reference.noise_amplitude_humidity, num_cycles),
+            "environment_temp_noise": rng.normal(0, self.ENVIRONMENT_TEMP_NOISE, num_cycles),
+            "environment_humidity_noise": rng.normal(0, self.ENVIRONMENT_HUMIDITY_NOISE, num_cycles)
+        }
+
+    def _build_controller(self) -> MultiZoneMicroclimateController:
+        """One zone per configuration, gains applied to the tuned loop, all in the common state."""
+        defaults = {"kp_temp": 0.1, "ki_temp": 0.005, "kd_temp": 0.05,
+                    "kp_hum": 0.5, "ki_hum": 0.01, "kd_hum": 0.1}
+        suffix = "temp" if self.loop == "temperature" else "hum"
+        defaults.update({f"kp_{suffix}": self.kp, f"ki_{suffix}": self.ki, f"kd_{suffix}": self.kd})
+        controller = MultiZoneMicroclimateController(
+            self.num_configurations,
+            target_temperature=self.target_temperature,
+            target_humidity=self.target_humidity,
+            prediction_horizon_steps=self.prediction_horizon_steps,
+            history_buffer_size=self.history_buffer_size,
+            control_interval_sec=self.control_interval_sec,
+            **defaults)
+        controller.set_initial_state(self.initial_temperature, self.initial_humidity)
+        return controller
+
+    def run(self, disturbance_trace: dict, time_step: float = 60.0, settling_band: float = None) -> dict:
+        """
+        Simulates every configuration over the same disturbance trace.
+
+        Parameters:
+            disturbance_trace (dict): A trace from `generate_disturbance_trace` (or any dict of
+                                      equally long arrays under the same keys).
+            time_step (float): Duration of each control cycle in seconds.
+            settling_band (float): Error band within which the tuned variable counts as settled.
+                                   Defaults to half the integrity monitor's stability threshold
+                                   (0.25 K, or 0.01 RH): the limit of a "Minor_Deviation".
+
+        Returns:
+            dict: The configuration arrays ("kp", "ki", "kd", "prediction_horizon_steps") and, per
+                  configuration: "settling_time_s" (from the start until the error stays within
+                  the band; inf if it is outside at the end), "overshoot" and "overshoot_percent"
+                  (largest excursion past the setpoint, absolute and relative to the initial error),
+                  "integrated_abs_error", the effort of each actuator - "energy_J" (directed energy,
+                  the temperature actuator), "aerosol_mass_g" (aerosol injected) and
+                  "ionization_exposure_C_s_per_m3" (ionization charge density integrated over time),
+                  the latter two being the humidity actuators - and "mean_resource_utilization_percent".
+        """
+        controller = self._build_controller()
+        tuning_temperature = self.loop == "temperature"
+        target = self.target_temperature if tuning_temperature else self.target_humidity
+        if settling_band is None:
+            monitor = controller.monitor
+            settling_band = 0.5 * (monitor.temp_stability_threshold if tuning_temperature else monitor.humidity_stability_threshold)
+
+        initial_error = target - (self.initial_temperature if tuning_temperature else self.initial_humidity)
+        approach = np.sign(initial_error) if initial_error else 1.0
+        num_cycles = len(next(iter(disturbance_trace.values())))
+        n = self.num_configurations
+
+        last_outside = np.full(n, -1)
+        overshoot = np.zeros(n)
+        integrated_abs_error = np.zeros(n)
+        energy = np.zeros(n)
+        aerosol_mass = np.zeros(n)
+        ionization_exposure = np.zeros(n)
+        utilization = np.zeros(n)
+        for cycle in range(num_cycles):
+            disturbance = {key: values[cycle] for key, values in disturbance_trace.items()}
+            summary = controller.run_control_cycle(time_step, disturbance)
+            value = summary["final_temperature_K"] if tuning_temperature else summary["final_humidity_RH"]
+            error = target - value
+
+            last_outside[np.abs(error) > settling_band] = cycle
+            overshoot = np.maximum(overshoot, -approach * error)
+            integrated_abs_error += np.abs(error) * time_step
+            commands = summary["amu_commands"]
+            energy += np.abs(commands["directed_energy_output_watts"]) * time_step
+            aerosol_mass += np.abs(commands["aerosol_injection_rate_grams_per_sec"]) * time_step
+            ionization_exposure += np.abs(commands["ionization_charge_density_coulombs_per_m3"]) * time_step
+            utilization += commands["resource_utilization_percent"]
+
+        settling_time = np.where(last_outside == num_cycles - 1, np.inf, (last_outside + 1) * time_step)
+        return {
+            "kp": self.kp,
+            "ki": self.ki,
+            "kd": self.kd,
+            "prediction_horizon_steps": self.prediction_horizon_steps,
+            "settling_time_s": settling_time,
+            "overshoot": overshoot,
+            "overshoot_percent": overshoot / abs(initial_error) * 100 if initial_error else np.full(n, np.nan),
+            "integrated_abs_error": integrated_abs_error,
+            "energy_J": energy,
+            "aerosol_mass_g": aerosol_mass,
+            "ionization_exposure_C_s_per_m3": ionization_exposure,
+            "mean_resource_utilization_percent": utilization / max(num_cycles, 1)
+        }
+
+
 # Ensure new classes are exported (already done by being top-level)
 # PIDController
 # MicroclimatePredictor
 # AMUOrchestrator
-# MicroclimateIntegrityMonitor
\ No newline at end of file
+# RollingErrorStatistics
+# MicroclimateIntegrityMonitor
+# PIDControllerBank
+# MultiZonePredictor
+# MultiZoneIntegrityMonitor
+# MultiZoneMicroclimateController
+# MicroclimateTuningSweep
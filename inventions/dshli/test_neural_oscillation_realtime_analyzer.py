@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from neural_oscillation_realtime_analyzer import (
+    THETA_BAND,
+    BrainStateEstimator,
+    CrossFrequencyCouplingAnalyzer,
+    MultiChannelOscillationAnalyzer,
+    PhaseLockingController,
+    generate_eeg_chunk,
+)
+
+SAMPLING_RATE = 256
+
+
+def _fill(analyzer, num_channels):
+    np.random.seed(0)
+    for _ in range(25):
+        chunk = np.stack([generate_eeg_chunk(SAMPLING_RATE, 0.1, dominant_freq=40, amplitude=0.7, theta_amp=0.5,
+                                             gamma_amp=0.4, pac_strength_factor=0.8) for _ in range(num_channels)])
+        analyzer.add_data_chunk(chunk)
+    return analyzer.analyze_brainwaves()
+
+
+@pytest.mark.parametrize("options", [dict(), dict(streaming_filters=True), dict(band_extraction="fft")])
+def test_phase_locking_controller_on_multichannel_analyzer(options):
+    analyzer = MultiChannelOscillationAnalyzer(4, sampling_rate=SAMPLING_RATE, buffer_duration=2.0, **options)
+    analysis = _fill(analyzer, 4)
+    assert analysis["status"] == "OK"
+
+    estimator = BrainStateEstimator(analyzer)
+    estimator.infer_brain_state(analysis)
+    controller = PhaseLockingController(analyzer, estimator, CrossFrequencyCouplingAnalyzer(SAMPLING_RATE))
+    stimulus, params = controller.generate_adaptive_stimulus(target_band_name="gamma", duration=0.2)
+
+    assert stimulus.shape == (int(0.2 * SAMPLING_RATE),)
+    assert np.all(np.isfinite(stimulus))
+    assert params["pac_strength"] >= 0.0
+
+
+def test_multichannel_pac_accepts_band_ranges_and_unknown_bands():
+    analyzer = MultiChannelOscillationAnalyzer(3, sampling_rate=SAMPLING_RATE, buffer_duration=2.0)
+    analysis = _fill(analyzer, 3)
+    cfc = CrossFrequencyCouplingAnalyzer(SAMPLING_RATE)
+
+    by_name = cfc.calculate_pac(analyzer, analysis, "theta", "gamma")
+    by_range = cfc.calculate_pac(analyzer, analysis, THETA_BAND, "gamma")
+    assert by_range["pac_strength"] == pytest.approx(by_name["pac_strength"])
+    np.testing.assert_allclose(by_range["channel_pac_strength"], by_name["channel_pac_strength"])
+
+    unknown = cfc.calculate_pac(analyzer, analysis, (1000, 2000), "gamma")
+    assert unknown["pac_strength"] == 0.0
+    assert unknown["channel_pac_strength"].shape == (3,)
+
+
+def test_adaptive_stimuli_do_not_share_storage():
+    analyzer = MultiChannelOscillationAnalyzer(2, sampling_rate=SAMPLING_RATE, buffer_duration=2.0)
+    analysis = _fill(analyzer, 2)
+    estimator = BrainStateEstimator(analyzer)
+    estimator.infer_brain_state(analysis)
+    controller = PhaseLockingController(analyzer, estimator, CrossFrequencyCouplingAnalyzer(SAMPLING_RATE))
+
+    first, _ = controller.generate_adaptive_stimulus(target_band_name="gamma", duration=0.2)
+    kept = first.copy()
+    second, _ = controller.generate_adaptive_stimulus(target_band_name="theta", duration=0.2)
+
+    assert not np.shares_memory(first, second)
+    np.testing.assert_array_equal(first, kept)
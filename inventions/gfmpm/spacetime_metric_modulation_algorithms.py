@@ -19,9 +19,17 @@ PLANC_LENGTH = np.sqrt(G * hbar / c**3) # Fundamental quantum gravitational leng
 PLANC_ENERGY = np.sqrt(hbar * c**5 / G) # Fundamental quantum gravitational energy scale (~1.9e9 J)
 
 class MetricSignature(enum.Enum):
-    """Enumeration for common spacetime metric signatures."""
-    MINKOWSKI_MINUS_PLUS_PLUS_PLUS = np.diag([-1, 1, 1, 1])
-    MINKOWSKI_PLUS_MINUS_MINUS_MINUS = np.diag([1, -1, -1, -1])
+    """
+    Enumeration for common spacetime metric signatures. Members hold the metric's
+    diagonal as a (hashable) tuple; `metric` builds the corresponding 4x4 tensor.
+    """
+    MINKOWSKI_MINUS_PLUS_PLUS_PLUS = (-1, 1, 1, 1)
+    MINKOWSKI_PLUS_MINUS_MINUS_MINUS = (1, -1, -1, -1)
+
+    @property
+    def metric(self) -> np.ndarray:
+        """The flat 4x4 metric tensor with this signature."""
+        return np.diag(np.asarray(self.value, dtype=float))
 
 class SpacetimeCurvatureEngine:
     """
@@ -73,7 +81,7 @@ class SpacetimeCurvatureEngine:
             np.ndarray: A 4x4 matrix conceptually representing the Einstein Tensor G_mu_nu
                         corresponding to the input metric.
         """
-        flat_metric = MetricSignature.MINKOWSKI_MINUS_PLUS_PLUS_PLUS.value
+        flat_metric = MetricSignature.MINKOWSKI_MINUS_PLUS_PLUS_PLUS.metric
         
         # Deviation from flat space
         delta_g = g_mu_nu - flat_metric
@@ -121,6 +129,35 @@ class SpacetimeCurvatureEngine:
 
         return conceptual_G_mu_nu
 
+    def calculate_einstein_tensor_batch(self, g_mu_nu_batch: np.ndarray,
+                                        spacetime_grid_resolution: Optional[int] = None) -> np.ndarray:
+        """
+        Vectorized form of `calculate_einstein_tensor` for a stack of metrics, computing the
+        curvature potential and variation proxy of every metric in one pass.
+
+        Args:
+            g_mu_nu_batch (np.ndarray): An (N, 4, 4) stack of metric tensors.
+            spacetime_grid_resolution (Optional[int]): As in `calculate_einstein_tensor`.
+
+        Returns:
+            np.ndarray: The (N, 4, 4) stack of conceptual Einstein Tensors.
+        """
+        flat_metric = MetricSignature.MINKOWSKI_MINUS_PLUS_PLUS_PLUS.metric
+        delta_g = g_mu_nu_batch - flat_metric
+
+        curvature_potential = np.abs(delta_g).sum(axis=(1, 2)) * 1e-15
+        spatial_temporal_variation_proxy = np.abs(np.diff(g_mu_nu_batch, axis=1)).sum(axis=(1, 2)) + \
+                                           np.abs(np.diff(g_mu_nu_batch, axis=2)).sum(axis=(1, 2))
+        effective_curvature_strength = (curvature_potential + spatial_temporal_variation_proxy * 1e-18) * 1e-5
+
+        conceptual_G_mu_nu = delta_g * effective_curvature_strength[:, np.newaxis, np.newaxis]
+        conceptual_G_mu_nu = (conceptual_G_mu_nu + conceptual_G_mu_nu.transpose(0, 2, 1)) / 2
+
+        if spacetime_grid_resolution and spacetime_grid_resolution > 100:
+            conceptual_G_mu_nu += (np.identity(4) * LAMBDA_CONSTANT / (c**4 / (8 * np.pi * G))) * 1e-2
+
+        return conceptual_G_mu_nu
+
 class ExoticMatterCatalyst:
     """
     The ExoticMatterCatalyst focuses on the theoretical generation and management
@@ -209,6 +246,34 @@ class ExoticMatterCatalyst:
             "achievable_T_magnitude": achievable_T_magnitude # The T_mu_nu magnitude we can actually generate
         }
 
+    def synthesize_exotic_matter_analog_batch(self, T_mu_nu_batch: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vectorized form of `synthesize_exotic_matter_analog` for a stack of demands. It
+        evaluates feasibility only: it neither prints per-demand alerts nor updates the
+        catalyst's current vacuum energy draw.
+
+        Args:
+            T_mu_nu_batch (np.ndarray): An (N, 4, 4) stack of Stress-Energy Tensor demands.
+
+        Returns:
+            Dict[str, np.ndarray]: The keys of `synthesize_exotic_matter_analog`, each an array of length N.
+        """
+        energy_density_demand = T_mu_nu_batch[:, 0, 0]
+        total_T_magnitude_J_m3 = np.linalg.norm(T_mu_nu_batch, axis=(1, 2))
+        raw_power_draw = total_T_magnitude_J_m3 / self.vacuum_fluctuation_efficiency
+        at_capacity = raw_power_draw > self.max_quantum_vacuum_flux
+
+        return {
+            "exotic_matter_required": energy_density_demand < 0,
+            "energy_density_demand": energy_density_demand,
+            "total_T_magnitude_J_m3": total_T_magnitude_J_m3,
+            "power_draw_J_m3": np.where(at_capacity, self.max_quantum_vacuum_flux, raw_power_draw),
+            "at_capacity": at_capacity,
+            "achievable_T_magnitude": np.where(at_capacity,
+                                               self.max_quantum_vacuum_flux * self.vacuum_fluctuation_efficiency,
+                                               total_T_magnitude_J_m3)
+        }
+
 class SpacetimeIntegrityMonitor:
     """
     The SpacetimeIntegrityMonitor is a critical safety and ethical component.
@@ -290,13 +355,47 @@ class SpacetimeIntegrityMonitor:
         # 4. Energy Condition Violation (conceptual check for T_mu_nu if possible)
         # A full check requires T_mu_nu. We'll add this when T_mu_nu is computed.
         # For now, a placeholder:
-        # T_mu_nu_proxy = (g_mu_nu - MetricSignature.MINKOWSKI_MINUS_PLUS_PLUS_PLUS.value) * (c**4 / (8 * np.pi * G)) * 1e-10 # Rough guess
+        # T_mu_nu_proxy = (g_mu_nu - MetricSignature.MINKOWSKI_MINUS_PLUS_PLUS_PLUS.metric) * (c**4 / (8 * np.pi * G)) * 1e-10 # Rough guess
         # if T_mu_nu_proxy[0,0] + T_mu_nu_proxy[1,1] < 0: # Null Energy Condition violation proxy
         #     report["warnings"].append("Potential Null Energy Condition violation implied by metric.")
 
         self.last_integrity_report = report
         return report
 
+    def check_metric_integrity_batch(self, g_mu_nu_batch: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vectorized form of `check_metric_integrity` for a stack of metrics. Instead of
+        message lists it reports each check as a boolean array, and it leaves
+        `last_integrity_report` untouched.
+
+        Args:
+            g_mu_nu_batch (np.ndarray): An (N, 4, 4) stack of metric tensors.
+
+        Returns:
+            Dict[str, np.ndarray]: "status" ("OK", "WARNING" or "ERROR" per metric), the flags
+                                   "signature_error", "causality_warning" and "horizon_warning",
+                                   and the checked quantities "determinant" and "time_to_space_ratio".
+        """
+        det_g = np.linalg.det(g_mu_nu_batch)
+        g_00 = g_mu_nu_batch[:, 0, 0]
+        spatial_metric_magnitude = np.linalg.norm(g_mu_nu_batch[:, 1:, 1:], axis=(1, 2))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            time_to_space_ratio = -g_00 / spatial_metric_magnitude
+
+        signature_error = det_g >= 0
+        causality_warning = g_00 >= -self.causality_threshold
+        horizon_warning = time_to_space_ratio > 1.0 / self.horizon_formation_threshold
+
+        return {
+            "status": np.where(signature_error, "ERROR",
+                               np.where(causality_warning | horizon_warning, "WARNING", "OK")),
+            "signature_error": signature_error,
+            "causality_warning": causality_warning,
+            "horizon_warning": horizon_warning,
+            "determinant": det_g,
+            "time_to_space_ratio": time_to_space_ratio
+        }
+
 class UniversalResourceOptimizer:
     """
     The UniversalResourceOptimizer manages the immense energy and matter resources
@@ -362,6 +461,26 @@ class UniversalResourceOptimizer:
                 "at_capacity": False
             }
 
+    def allocate_power_for_emitters_batch(self, required_total_power_density: np.ndarray,
+                                          emitter_count: int, operational_volume_m3: float = 1.0) -> Dict[str, np.ndarray]:
+        """
+        Vectorized form of `allocate_power_for_emitters` for an array of power density demands.
+        Each demand is checked against the full harvest independently; the current consumption
+        is not updated.
+
+        Returns:
+            Dict[str, np.ndarray]: The keys of `allocate_power_for_emitters`, each an array.
+        """
+        total_required_power = np.asarray(required_total_power_density) * operational_volume_m3 / self.power_conversion_efficiency
+        available_power = self.energy_harvesting_rate
+        at_capacity = total_required_power > available_power
+
+        return {
+            "allocated_power": np.where(at_capacity, available_power, total_required_power),
+            "shortfall": np.where(at_capacity, total_required_power - available_power, 0.0),
+            "at_capacity": at_capacity
+        }
+
 class SpacetimeMetricModulator:
     """
     The SpacetimeMetricModulator class encapsulates the core algorithms for dynamically
@@ -465,6 +584,21 @@ class SpacetimeMetricModulator:
         
         return T_mu_nu
 
+    def _ensure_emitter_influence_matrix(self) -> np.ndarray:
+        """
+        Returns the conceptual 'EmitterInfluenceMatrix' (num_emitters x 10), creating it on first use.
+        """
+        # For simulation, we create a pseudo-random, but structured, influence matrix.
+        # The scale of this matrix relates T_mu_nu magnitudes to emitter power levels.
+        if not hasattr(self, '_emitter_influence_matrix') or self._emitter_influence_matrix.shape != (self.num_emitters, 10):
+            # Initialize with some structured randomness, acknowledging different emitters might specialize
+            # (e.g., some affect T_00 more, others T_11, others shear components T_01).
+            np.random.seed(42) # For reproducibility
+            self._emitter_influence_matrix = np.random.rand(self.num_emitters, 10) * 1e18 # Arbitrary scaling
+            # Normalize rows to reflect max emitter capacity influence
+            self._emitter_influence_matrix = self._emitter_influence_matrix / np.sum(self._emitter_influence_matrix, axis=1, keepdims=True) * 1e19 # Further scaling
+        return self._emitter_influence_matrix
+
     def _map_stress_energy_to_emitter_signals(self, T_mu_nu: np.ndarray) -> np.ndarray:
         """
         Translates the required Stress-Energy Tensor (T_mu_nu) into actionable
@@ -502,25 +636,17 @@ class SpacetimeMetricModulator:
         # Each row defines how a specific emitter (when active at unit power)
         # contributes to each of the 10 T_mu_nu components.
         # This matrix would be learned or calibrated in a real system.
-        # For simulation, we create a pseudo-random, but structured, influence matrix.
-        # The scale of this matrix relates T_mu_nu magnitudes to emitter power levels.
-        if not hasattr(self, '_emitter_influence_matrix') or self._emitter_influence_matrix.shape != (self.num_emitters, 10):
-            # Initialize with some structured randomness, acknowledging different emitters might specialize
-            # (e.g., some affect T_00 more, others T_11, others shear components T_01).
-            np.random.seed(42) # For reproducibility
-            self._emitter_influence_matrix = np.random.rand(self.num_emitters, 10) * 1e18 # Arbitrary scaling
-            # Normalize rows to reflect max emitter capacity influence
-            self._emitter_influence_matrix = self._emitter_influence_matrix / np.sum(self._emitter_influence_matrix, axis=1, keepdims=True) * 1e19 # Further scaling
+        self._ensure_emitter_influence_matrix()
 
         # Now, we want to find `emitter_signals` (shape num_emitters,) such that
-        # `EmitterInfluenceMatrix` @ `emitter_signals` (conceptually) matches `T_vector`.
-        # This is an inverse problem: E_signals = (Influence_Matrix)^-1 @ T_vector
+        # `EmitterInfluenceMatrix`^T @ `emitter_signals` (conceptually) matches `T_vector`.
+        # This is an inverse problem: E_signals = ((Influence_Matrix)^T)^-1 @ T_vector
         # Use pseudo-inverse for non-square or singular matrices (common in overdetermined/underdetermined systems)
         try:
             # We want: emitter_signals * emitter_max_power_density * factor = T_vector
             # So, emitter_signals = (Influence^-1) @ (T_vector / (emitter_max_power_density * factor))
             # The scaling factor '1e-25' is a heuristic to relate emitter power density to T_mu_nu magnitudes.
-            emitter_signal_raw_magnitudes = np.linalg.pinv(self._emitter_influence_matrix) @ T_vector
+            emitter_signal_raw_magnitudes = np.linalg.pinv(self._emitter_influence_matrix).T @ T_vector
             
             # Map raw magnitudes to normalized signals [0, 1] considering max power density.
             # This is complex because each emitter contributes to multiple T components.
@@ -702,7 +828,7 @@ class SpacetimeMetricModulator:
         # This is a conceptual `Jacobian` or `inverse control model`.
         try:
             # Adjustment for raw emitter signal magnitudes
-            raw_adjustment_magnitudes = np.linalg.pinv(self._emitter_influence_matrix) @ T_error_vector
+            raw_adjustment_magnitudes = np.linalg.pinv(self._emitter_influence_matrix).T @ T_error_vector
             
             # Apply adjustment, scaled by learning rate.
             # Normalize the adjustment relative to max possible signal change.
@@ -729,6 +855,199 @@ class SpacetimeMetricModulator:
             print(f"Feedback adjustment (scalar fallback): T_mu_nu error magnitude: {error_magnitude:.2e}. "
                   f"Adjusted emitter signals. New mean signal: {np.mean(self.current_emitter_signals):.2f}")
 
+    # --- Batched pipeline: many operating points in one vectorized pass ---
+
+    @staticmethod
+    def _validate_metric_batch(g_mu_nu_batch: np.ndarray, name: str) -> np.ndarray:
+        """
+        Returns `g_mu_nu_batch` as a float (N, 4, 4) array, raising ValueError unless every
+        metric in it is a symmetric 4x4 matrix.
+        """
+        g_mu_nu_batch = np.asarray(g_mu_nu_batch, dtype=float)
+        if g_mu_nu_batch.ndim != 3 or g_mu_nu_batch.shape[1:] != (4, 4) or \
+                not np.allclose(g_mu_nu_batch, g_mu_nu_batch.transpose(0, 2, 1)):
+            raise ValueError(f"{name} metric tensors must be an (N, 4, 4) stack of symmetric 4x4 matrices.")
+        return g_mu_nu_batch
+
+    def _calculate_stress_energy_tensor_batch(self, G_mu_nu_batch: np.ndarray,
+                                              g_mu_nu_batch: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Vectorized form of `_calculate_stress_energy_tensor`: solves the inverse Einstein Field
+        Equations for every metric and scales each T_mu_nu that exceeds the exotic matter
+        generation limit down to what is achievable.
+
+        Returns:
+            Tuple[np.ndarray, Dict[str, np.ndarray]]: The (N, 4, 4) Stress-Energy Tensors and the
+                                                      batched `ExoticMatterCatalyst` report.
+        """
+        einstein_factor_inverse = (c**4) / (8 * np.pi * G)
+        T_mu_nu_batch = einstein_factor_inverse * (G_mu_nu_batch + LAMBDA_CONSTANT * g_mu_nu_batch)
+
+        catalyst_report = self.exotic_matter_catalyst.synthesize_exotic_matter_analog_batch(T_mu_nu_batch)
+        limited = catalyst_report["at_capacity"] & \
+            (catalyst_report["total_T_magnitude_J_m3"] > catalyst_report["achievable_T_magnitude"])
+        if limited.any():
+            T_mu_nu_batch[limited] *= (catalyst_report["achievable_T_magnitude"][limited] /
+                                       catalyst_report["total_T_magnitude_J_m3"][limited])[:, np.newaxis, np.newaxis]
+
+        return T_mu_nu_batch, catalyst_report
+
+    def _map_stress_energy_to_emitter_signals_batch(self, T_mu_nu_batch: np.ndarray) -> np.ndarray:
+        """
+        Vectorized form of `_map_stress_energy_to_emitter_signals`. The pseudo-inverse of the
+        emitter influence matrix is computed once and applied to all N 10-component T_mu_nu
+        vectors with a single matrix product; the resource and capacity limits are then
+        applied per operating point.
+
+        Returns:
+            np.ndarray: An (N, num_emitters) array of normalized control signals (0.0 to 1.0).
+        """
+        n = len(T_mu_nu_batch)
+        rows, cols = np.triu_indices(4) # (t_00, t_01, t_02, t_03, t_11, t_12, t_13, t_22, t_23, t_33)
+        T_vectors = T_mu_nu_batch[:, rows, cols] # Shape (N, 10)
+        influence_matrix = self._ensure_emitter_influence_matrix()
+
+        try:
+            emitter_signal_raw_magnitudes = T_vectors @ np.linalg.pinv(influence_matrix)
+            total_T_request_magnitude = np.linalg.norm(T_vectors, axis=1)
+
+            resource_report = self.resource_optimizer.allocate_power_for_emitters_batch(
+                required_total_power_density=total_T_request_magnitude * 1e-10, # Heuristic conversion
+                emitter_count=self.num_emitters,
+                operational_volume_m3=self.operational_volume_m3
+            )
+            resource_limited = resource_report["at_capacity"] & (total_T_request_magnitude > 1e-18)
+            if resource_limited.any():
+                effective_T_request_magnitude = resource_report["allocated_power"][resource_limited] / (self.operational_volume_m3 * 1e-10)
+                emitter_signal_raw_magnitudes[resource_limited] *= \
+                    (effective_T_request_magnitude / total_T_request_magnitude[resource_limited])[:, np.newaxis]
+
+            peak_magnitudes = np.max(np.abs(emitter_signal_raw_magnitudes), axis=1)
+            normalized_signals = np.abs(emitter_signal_raw_magnitudes) / \
+                np.where(peak_magnitudes > 0, peak_magnitudes + 1e-9, 1.0)[:, np.newaxis]
+
+            max_achievable_T_magnitude_by_emitters = self.num_emitters * self.emitter_max_power_density * 1e-10
+            if max_achievable_T_magnitude_by_emitters > 0:
+                over_capacity = total_T_request_magnitude > max_achievable_T_magnitude_by_emitters
+                normalized_signals[over_capacity] *= \
+                    (max_achievable_T_magnitude_by_emitters / total_T_request_magnitude[over_capacity])[:, np.newaxis]
+
+        except np.linalg.LinAlgError:
+            print("Warning: Could not compute pseudo-inverse for emitter mapping. Returning zero signals.")
+            normalized_signals = np.zeros((n, self.num_emitters))
+
+        return np.clip(normalized_signals, 0.0, 1.0)
+
+    def evaluate_target_metric_distortions(self, target_g_mu_nu_batch: np.ndarray) -> Dict[str, Any]:
+        """
+        Batched counterpart of `set_target_metric_distortion` for sweeping control envelopes.
+        Integrity checks, curvature, stress-energy, exotic matter feasibility and emitter
+        signals are evaluated for every target metric in one vectorized pass.
+
+        Unlike `set_target_metric_distortion`, nothing is applied: the current metric distortion
+        and emitter signals are left untouched, and a metric that fails the integrity checks is
+        reported as rejected (with zero signals) rather than aborting the whole batch.
+
+        Args:
+            target_g_mu_nu_batch (np.ndarray): An (N, 4, 4) stack of symmetric target metric tensors.
+
+        Returns:
+            Dict[str, Any]: "emitter_signals" (N, num_emitters), "accepted" (N,) booleans,
+                            "einstein_tensor" and "stress_energy_tensor" (N, 4, 4), and the batched
+                            "integrity_report" and "catalyst_report".
+        """
+        target_g_mu_nu_batch = self._validate_metric_batch(target_g_mu_nu_batch, "Target")
+
+        integrity_report = self.integrity_monitor.check_metric_integrity_batch(target_g_mu_nu_batch)
+        accepted = ~integrity_report["signature_error"]
+
+        G_mu_nu_batch = self.curvature_engine.calculate_einstein_tensor_batch(target_g_mu_nu_batch)
+        T_mu_nu_batch, catalyst_report = self._calculate_stress_energy_tensor_batch(G_mu_nu_batch, target_g_mu_nu_batch)
+        emitter_signals = self._map_stress_energy_to_emitter_signals_batch(T_mu_nu_batch)
+        emitter_signals[~accepted] = 0.0
+
+        print(f"Evaluated {len(target_g_mu_nu_batch)} target metrics: {np.count_nonzero(~accepted)} rejected by integrity checks, "
+              f"{np.count_nonzero(integrity_report['status'] == 'WARNING')} with warnings, "
+              f"{np.count_nonzero(catalyst_report['exotic_matter_required'])} requiring exotic matter analogs, "
+              f"{np.count_nonzero(catalyst_report['at_capacity'])} at exotic matter capacity.")
+
+        return {
+            "emitter_signals": emitter_signals,
+            "accepted": accepted,
+            "einstein_tensor": G_mu_nu_batch,
+            "stress_energy_tensor": T_mu_nu_batch,
+            "integrity_report": integrity_report,
+            "catalyst_report": catalyst_report
+        }
+
+    def simulate_feedback_adjustments(self, observed_g_mu_nu_batch: np.ndarray,
+                                      target_g_mu_nu_batch: Optional[np.ndarray] = None,
+                                      emitter_signals: Optional[np.ndarray] = None,
+                                      learning_rate=0.01) -> Dict[str, Any]:
+        """
+        Batched counterpart of `simulate_feedback_adjustment`: one feedback step for each of
+        N operating points, evaluated in a single vectorized pass. The modulator's own state
+        is not modified.
+
+        Args:
+            observed_g_mu_nu_batch (np.ndarray): An (N, 4, 4) stack of observed metric tensors.
+            target_g_mu_nu_batch (Optional[np.ndarray]): The (N, 4, 4) targets being tracked.
+                                                         Defaults to the current metric distortion for all.
+            emitter_signals (Optional[np.ndarray]): The (N, num_emitters) signals being adjusted.
+                                                    Defaults to the current emitter signals for all.
+            learning_rate (float or np.ndarray): A step size shared by all operating points, or one per point.
+
+        Returns:
+            Dict[str, Any]: "emitter_signals" (N, num_emitters) after the adjustment, "shutdown" (N,)
+                            booleans for observed metrics that triggered an emergency shutdown,
+                            "T_error_magnitude" (N,) and the batched "integrity_report".
+        """
+        observed_g_mu_nu_batch = self._validate_metric_batch(observed_g_mu_nu_batch, "Observed")
+        n = len(observed_g_mu_nu_batch)
+        if target_g_mu_nu_batch is None:
+            target_g_mu_nu_batch = np.broadcast_to(self.current_metric_distortion, (n, 4, 4))
+        target_g_mu_nu_batch = self._validate_metric_batch(target_g_mu_nu_batch, "Target")
+        if len(target_g_mu_nu_batch) != n:
+            raise ValueError("Target and observed metric batches must have the same length.")
+        if emitter_signals is None:
+            emitter_signals = self.current_emitter_signals
+        emitter_signals = np.broadcast_to(np.asarray(emitter_signals, dtype=float), (n, self.num_emitters))
+        learning_rate = np.broadcast_to(np.asarray(learning_rate, dtype=float), (n,))
+
+        integrity_report = self.integrity_monitor.check_metric_integrity_batch(observed_g_mu_nu_batch)
+        shutdown = integrity_report["signature_error"]
+
+        observed_T_mu_nu, _ = self._calculate_stress_energy_tensor_batch(
+            self.curvature_engine.calculate_einstein_tensor_batch(observed_g_mu_nu_batch), observed_g_mu_nu_batch)
+        target_T_mu_nu, _ = self._calculate_stress_energy_tensor_batch(
+            self.curvature_engine.calculate_einstein_tensor_batch(target_g_mu_nu_batch), target_g_mu_nu_batch)
+        T_error = target_T_mu_nu - observed_T_mu_nu
+        T_error_magnitude = np.linalg.norm(T_error, axis=(1, 2))
+
+        rows, cols = np.triu_indices(4)
+        try:
+            raw_adjustment_magnitudes = T_error[:, rows, cols] @ np.linalg.pinv(self._ensure_emitter_influence_matrix())
+            max_possible_signal_change = np.max(emitter_signals, axis=1)
+            new_signals = emitter_signals + raw_adjustment_magnitudes * \
+                (learning_rate / (max_possible_signal_change + 1e-9))[:, np.newaxis]
+        except np.linalg.LinAlgError:
+            print("Warning: Could not compute pseudo-inverse for feedback adjustment. Reverting to scalar adjustment.")
+            sensitivity_to_T = (self.num_emitters * self.emitter_max_power_density * 1e-10)
+            new_signals = emitter_signals + (learning_rate * T_error_magnitude / sensitivity_to_T)[:, np.newaxis]
+
+        new_signals = np.clip(new_signals, 0.0, 1.0)
+        new_signals[shutdown] = 0.0
+
+        print(f"Feedback adjustment for {n} operating points: {np.count_nonzero(shutdown)} emergency shutdowns. "
+              f"Mean T_mu_nu error magnitude: {np.mean(T_error_magnitude):.2e}.")
+
+        return {
+            "emitter_signals": new_signals,
+            "shutdown": shutdown,
+            "T_error_magnitude": T_error_magnitude,
+            "integrity_report": integrity_report
+        }
+
     def diagnose_homeostasis_condition(self) -> str:
         """
         This is the "medical diagnosis" for the code, an introspection into
@@ -791,7 +1110,7 @@ if __name__ == "__main__":
     # This is a perturbation of the Minkowski metric.
     # A true accelerating frame in GR would primarily affect g_00 and g_0i terms.
     # For simplicity, we'll perturb a diagonal component, ensuring symmetry and signature.
-    flat_metric = MetricSignature.MINKOWSKI_MINUS_PLUS_PLUS_PLUS.value
+    flat_metric = MetricSignature.MINKOWSKI_MINUS_PLUS_PLUS_PLUS.metric
     
     # Simulate a slight "forward push" curvature. This is not a proper GR derivation,
     # but a high-level representation of a desired g_mu_nu for a physics engine.
@@ -856,6 +1175,22 @@ if __name__ == "__main__":
     except ValueError as e:
         print(f"Scenario 2 aborted due to: {e}")
 
+    # --- Scenario 3: Sweep a control envelope of acceleration fields in one batched pass ---
+    print("\n--- Scenario 3: Acceleration Envelope Sweep ---")
+    perturbations = np.linspace(0.0, 1e-6, 1000)
+    envelope_metrics = np.repeat(flat_metric[np.newaxis], len(perturbations), axis=0)
+    envelope_metrics[:, 0, 0] -= perturbations
+    envelope_metrics[:, 1, 1] -= perturbations
+
+    envelope = modulator.evaluate_target_metric_distortions(envelope_metrics)
+    mean_signals = envelope["emitter_signals"].mean(axis=1)
+    print(f"Mean emitter signal across the envelope: {mean_signals.min():.2f} to {mean_signals.max():.2f}")
+
+    envelope_feedback = modulator.simulate_feedback_adjustments(
+        envelope_metrics * (1 + 1e-8), target_g_mu_nu_batch=envelope_metrics,
+        emitter_signals=envelope["emitter_signals"], learning_rate=0.05)
+    print(f"Mean adjusted signal across the envelope: {envelope_feedback['emitter_signals'].mean():.2f}")
+
     print("\n--- SpacetimeMetricModulator's Deepest Reflection ---")
     print(modulator.diagnose_homeostasis_condition())
 
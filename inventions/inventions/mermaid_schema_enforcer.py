@@ -1,5 +1,16 @@
+import argparse
+import bisect
+import functools
+import hashlib
+import itertools
+import json
+import os
 import re
-from typing import List, Tuple, Callable, Dict, Any, Union
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Callable, Dict, Any, Union, TextIO
 
 # Define custom error types for structured reporting
 class SchemaViolation:
@@ -47,6 +58,586 @@ class SchemaViolation:
         }
 
 
+class MermaidToken:
+    """
+    A single lexical unit of a Mermaid diagram: a label, a node ID, a link or a directive.
+    Tokens are produced once per document by `MermaidSchemaEnforcer.tokenize_diagram` and
+    then consumed by every rule, so no rule ever has to rescan the raw text.
+    """
+    __slots__ = ("kind", "value", "start", "end", "line_number", "target", "pattern_index", "is_link_label")
+
+    def __init__(self, kind: str, value: str, start: int, end: int, line_number: int,
+                 target: str = None, pattern_index: int = -1, is_link_label: bool = False):
+        """
+        Initializes a MermaidToken.
+
+        Args:
+            kind (str): One of "label", "node", "link" or "directive".
+            value (str): The token text (label content, node ID, link source, or directive line).
+            start (int): Character index where the token begins in the diagram text.
+            end (int): Character index just past the end of the token.
+            line_number (int): The 1-based line number of `start`.
+            target (str): For "link" tokens, the ID of the link target. None otherwise.
+            pattern_index (int): For "label" tokens, the index of the label pattern that produced it.
+            is_link_label (bool): For "label" tokens, True if the round-node heuristic
+                                  identified the label as sitting on a link rather than a node.
+        """
+        self.kind = kind
+        self.value = value
+        self.start = start
+        self.end = end
+        self.line_number = line_number
+        self.target = target
+        self.pattern_index = pattern_index
+        self.is_link_label = is_link_label
+
+    def __repr__(self):
+        return f"MermaidToken({self.kind!r}, {self.value!r}, line={self.line_number})"
+
+
+class LineIndex:
+    """
+    The newline offsets of one document, computed once, against which any character index is
+    resolved to its 1-based line number by binary search. Indexes are cached per text hash, so
+    every rule of the enforcer and the linter reporting against the same document shares one.
+    """
+    _CACHE_SIZE = 64
+    _cache: Dict[int, "LineIndex"] = {}
+
+    def __init__(self, text: str):
+        """
+        Builds the index.
+
+        Args:
+            text (str): The document whose line offsets are to be indexed.
+        """
+        self.text = text
+        line_starts = [0]
+        newline = text.find('\n')
+        while newline != -1:
+            line_starts.append(newline + 1)
+            newline = text.find('\n', newline + 1)
+        self.line_starts = line_starts
+
+    @classmethod
+    def for_text(cls, text: str) -> "LineIndex":
+        """
+        Returns the cached index for `text`, building (and caching) it on first use.
+        Entries are keyed by the text's hash and confirmed by equality; the oldest entry
+        is evicted once the cache is full.
+        """
+        key = hash(text)
+        index = cls._cache.get(key)
+        if index is None or index.text != text:
+            index = cls(text)
+            if len(cls._cache) >= cls._CACHE_SIZE:
+                del cls._cache[next(iter(cls._cache))]
+            cls._cache[key] = index
+        return index
+
+    def line_number(self, index: int) -> int:
+        """
+        Returns the 1-based line number containing the character at `index`.
+        """
+        return bisect.bisect_right(self.line_starts, index)
+
+    def line_bounds(self, line_number: int) -> Tuple[int, int]:
+        """
+        Returns the (start, end) character indices of a 1-based line, excluding its newline.
+        """
+        start = self.line_starts[line_number - 1]
+        end = self.line_starts[line_number] - 1 if line_number < len(self.line_starts) else len(self.text)
+        return start, end
+
+
+class TokenizedDiagram:
+    """
+    The result of a single lexing sweep over a Mermaid diagram. Holds the precomputed
+    line offsets and the ordered token streams (labels, nodes, links, directives)
+    from which all of my diagram rules draw their evidence.
+    """
+
+    def __init__(self, text: str, line_index: LineIndex, labels: List[MermaidToken],
+                 nodes: List[MermaidToken], links: List[MermaidToken],
+                 directives: List[MermaidToken], header: Union[re.Match, None]):
+        self.text = text
+        self.line_index = line_index
+        self.labels = labels
+        self.nodes = nodes
+        self.links = links
+        self.directives = directives
+        self.header = header
+
+    def line_number(self, index: int) -> int:
+        """
+        Returns the 1-based line number of a character index, via the document's `LineIndex`.
+        """
+        return self.line_index.line_number(index)
+
+    def label_spans(self, exclude_link_labels: bool = True) -> List[Tuple[str, int, int]]:
+        """
+        Returns label tokens in the legacy (content, start, end) tuple form used by
+        `_extract_all_labels`.
+        """
+        return [(t.value, t.start, t.end) for t in self.labels
+                if not (exclude_link_labels and t.is_link_label)]
+
+
+class MathToken:
+    """
+    A single lexical unit of a LaTeX math segment: an environment boundary, a command, a control
+    symbol, a group brace, a delimiter, an alignment tab, a script marker or a run of plain text.
+    Each token records the brace and environment nesting at which it stands.
+    """
+    __slots__ = ("kind", "value", "start", "end", "brace_depth", "env_depth")
+
+    def __init__(self, kind: str, value: str, start: int, end: int, brace_depth: int, env_depth: int):
+        """
+        Initializes a MathToken.
+
+        Args:
+            kind (str): One of "begin", "end", "command", "symbol", "brace", "delimiter", "align", "script" or "text".
+            value (str): The environment name, the command name (without its backslash), the escaped
+                         character of a control symbol, or the literal text of any other token.
+            start (int): Character index where the token begins in the segment.
+            end (int): Character index just past the end of the token.
+            brace_depth (int): The number of `{` groups enclosing the token (for a brace, those outside it).
+            env_depth (int): The number of `\\begin` environments enclosing the token (for a boundary, those outside it).
+        """
+        self.kind = kind
+        self.value = value
+        self.start = start
+        self.end = end
+        self.brace_depth = brace_depth
+        self.env_depth = env_depth
+
+    def __repr__(self):
+        return f"MathToken({self.kind!r}, {self.value!r}, braces={self.brace_depth}, envs={self.env_depth})"
+
+
+class TokenizedMath:
+    """
+    The result of a single lexing sweep over a LaTeX math segment: the ordered token stream plus
+    the views my math rules draw on - the command names used, the environments begun, the sequence
+    of environment boundaries, the sequence of paired delimiters as `(delimiter, "left"/"right"/"")`,
+    and the index of the closing brace token of every group, keyed by that of its opening brace.
+    """
+
+    def __init__(self, text: str, tokens: List[MathToken], commands: frozenset, environments: frozenset,
+                 env_events: List[Tuple[str, str]], delimiters: List[Tuple[str, str]], groups: Dict[int, int]):
+        self.text = text
+        self.tokens = tokens
+        self.commands = commands
+        self.environments = environments
+        self.env_events = env_events
+        self.delimiters = delimiters
+        self.groups = groups
+
+
+# The LaTeX math lexicon, one alternative per token kind (the group that matched identifies the kind).
+_MATH_TOKEN_PATTERN = re.compile(
+    r'\\(begin|end)\{(\w+)\*?\}'    # 1, 2: environment boundary
+    r'|\\([a-zA-Z]+)'               # 3: command
+    r'|\\(.)'                       # 4: control symbol (\\, \{, \&, \, ...)
+    r'|([{}])'                      # 5: group brace
+    r'|([()\[\]|<>])'               # 6: delimiter
+    r'|(&)'                         # 7: alignment tab
+    r'|([\^_])'                     # 8: script marker
+    r'|([^\\{}()\[\]|<>&^_]+)',     # 9: plain text
+    re.DOTALL)
+_MATH_TOKEN_KINDS = {3: "command", 4: "symbol", 5: "brace", 6: "delimiter", 7: "align", 8: "script", 9: "text"}
+# Characters that may directly follow `\left` or `\right` to form a scaled delimiter.
+_SCALED_DELIMITERS = frozenset('({[|<')
+# Characters counted as paired delimiters wherever they appear, escaped or not, and the commands that are.
+_PLAIN_DELIMITERS = frozenset('({[]})|>')
+_DELIMITER_COMMANDS = ("vert", "Vert", "langle", "rangle")
+
+# Every occurrence of a math segment within a label: `$$...$$`, `$...$`, `\[...\]` or `\(...\)`.
+_MATH_SEGMENT_PATTERN = re.compile(r'\$\$(.*?)\$\$|\$(.*?)\$|\\\[(.*?)\\\]|\\\((.*?)\\\)', re.DOTALL)
+
+
+@functools.lru_cache(maxsize=4096)
+def tokenize_math(math_content: str) -> TokenizedMath:
+    """
+    Lexes a LaTeX math segment (without its delimiters) in a single sweep, tracking brace and
+    environment depth as it goes. Results are memoized by segment text, for the same equations
+    recur across labels and diagrams; the returned object is shared and must not be modified.
+
+    Args:
+        math_content (str): The raw LaTeX math string.
+
+    Returns:
+        TokenizedMath: The token stream and its derived views.
+    """
+    tokens: List[MathToken] = []
+    commands = set()
+    environments = set()
+    env_events: List[Tuple[str, str]] = []
+    delimiters: List[Tuple[str, str]] = []
+    groups: Dict[int, int] = {}
+    env_stack: List[str] = []
+    open_groups: List[int] = [] # Token indices of the `{` braces not yet closed.
+    brace_depth = 0
+    scaling = None # A `\left` or `\right` token still awaiting its delimiter.
+
+    for match in _MATH_TOKEN_PATTERN.finditer(math_content):
+        start, end = match.span()
+        group = match.lastindex
+        if group == 2:
+            action, value = match.group(1), match.group(2)
+            env_events.append((action, value))
+            if action == "begin":
+                tokens.append(MathToken("begin", value, start, end, brace_depth, len(env_stack)))
+                environments.add(value)
+                env_stack.append(value)
+            else:
+                if env_stack and env_stack[-1] == value:
+                    env_stack.pop()
+                tokens.append(MathToken("end", value, start, end, brace_depth, len(env_stack)))
+            scaling = None
+            continue
+
+        kind = _MATH_TOKEN_KINDS[group]
+        value = match.group(group)
+        if kind == "brace" and value == "}":
+            brace_depth = max(brace_depth - 1, 0)
+            if open_groups:
+                groups[open_groups.pop()] = len(tokens)
+        tokens.append(MathToken(kind, value, start, end, brace_depth, len(env_stack)))
+        if kind == "brace" and value == "{":
+            open_groups.append(len(tokens) - 1)
+            brace_depth += 1
+
+        # Paired delimiters: `\left(`, `\right|`, ...; bare or escaped `( [ { ) ] } | >`; `\vert`, `\langle`, ...
+        if scaling is not None and scaling.end == start and kind in ("delimiter", "brace") and value in _SCALED_DELIMITERS:
+            delimiters.append((value, scaling.value))
+        elif kind in ("delimiter", "brace", "symbol"):
+            if value in _PLAIN_DELIMITERS:
+                delimiters.append((value, ""))
+        elif kind == "command":
+            commands.add(value)
+            prefix = next((name for name in _DELIMITER_COMMANDS if value.startswith(name)), None)
+            if prefix is not None:
+                delimiters.append(("\\" + prefix, ""))
+        scaling = tokens[-1] if kind == "command" and value in ("left", "right") else None
+
+    return TokenizedMath(math_content, tokens, frozenset(commands), frozenset(environments), env_events, delimiters, groups)
+
+
+@functools.lru_cache(maxsize=4096)
+def extract_math_segments(label_content: str) -> Tuple[Tuple[str, str, int, int], ...]:
+    """
+    Finds the math segments of a label once, for every math rule and transformation to share.
+    Memoized by label text.
+
+    Args:
+        label_content (str): The raw label content.
+
+    Returns:
+        Tuple[Tuple[str, str, int, int], ...]: For each segment, in order:
+            (segment_with_delimiters, segment_content, start_index, end_index).
+    """
+    return tuple((match.group(0), next(g for g in match.groups() if g is not None), match.start(), match.end())
+                 for match in _MATH_SEGMENT_PATTERN.finditer(label_content))
+
+
+# --- The heuristic math rules: one walk over a segment's tokens establishes every fact they test ---
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+_ASCII_DIGITS = frozenset(string.digits)
+_ASCII_ALNUM = _ASCII_LETTERS | _ASCII_DIGITS
+# Commands that set apart the plain word before them (Rule M7), and functions idiomatically applied as `f(x)` (Rule L15).
+_WORD_EXEMPTING_COMMANDS = frozenset((
+    'text', 'mathrm', 'textbf', 'textit', 'mathbb', 'mathcal', 'prime', 'ldots', 'forall', 'exists', 'approx',
+    'sum', 'int', 'lim', 'log', 'sin', 'cos', 'tan', 'det', 'gcd', 'max', 'min', 'arg', 'sup', 'inf', 'Pr',
+    'exp', 'ln', 'deg', 'hom', 'ker', 'dim', 'rank', 'Tr'))
+_NAMED_FUNCTIONS = frozenset(('sin', 'cos', 'tan', 'log', 'ln', 'exp', 'det', 'gcd', 'max', 'min', 'arg', 'sup', 'inf', 'lim', 'Pr'))
+_MATRIX_ENVIRONMENTS = frozenset(('array', 'pmatrix', 'matrix'))
+_DIFFERENTIAL_LETTERS = frozenset('dDij')
+# Patterns applied within a single plain-text token, seeing one character to either side of it.
+_PLAIN_WORD_PATTERN = re.compile(r'(?<!\w)[a-zA-Z]{2,}(?!\w)')
+_SINGLE_LETTER_PATTERN = re.compile(r'(?<!\w)[a-zA-Z](?!\w)')
+_SPACED_WORDS_PATTERN = re.compile(r'[a-zA-Z]{2,}\s+[a-zA-Z]{2,}')
+_NUMERIC_FRACTION_PATTERN = re.compile(r'(?<!\w)\d+\s*/\s*\d+(?!\w)')
+_DOTTED_VARIABLES_PATTERN = re.compile(r'[a-zA-Z_]\.[a-zA-Z_]')
+_STARRED_OPERANDS_PATTERN = re.compile(r'[a-zA-Z0-9]\*[a-zA-Z0-9]')
+_MATRIX_ELLIPSIS_PATTERN = re.compile(r'\.{3}(?!\\)')
+
+
+def _text_token_matches(pattern: re.Pattern, math: TokenizedMath, token: MathToken):
+    """
+    Iterates over the matches of `pattern` within one plain-text token. The pattern's lookarounds see
+    one character to either side; being made of text characters, its matches never extend beyond it.
+    """
+    return pattern.finditer(math.text, max(token.start - 1, 0), token.end + 1)
+
+
+def _next_significant(tokens: List[MathToken], index: int) -> Union[int, None]:
+    """
+    Returns the index of the first token after `index` that is not bare whitespace, or None.
+    """
+    for following in range(index + 1, len(tokens)):
+        if tokens[following].kind != "text" or not tokens[following].value.isspace():
+            return following
+    return None
+
+
+def _is_scaled(tokens: List[MathToken], index: int) -> bool:
+    """
+    Reports whether the delimiter at `index` is scaled by the `\\left` or `\\right` directly before it.
+    """
+    previous = tokens[index - 1] if index else None
+    return previous is not None and previous.kind == "command" and previous.value in ("left", "right") \
+        and previous.end == tokens[index].start
+
+
+def _wraps_single(tokens: List[MathToken], index: int, characters: frozenset) -> bool:
+    """
+    Reports whether the command at `index` is directly followed by a group holding one of `characters` alone.
+    """
+    return index + 3 < len(tokens) and tokens[index + 1].kind == "brace" and tokens[index + 1].value == "{" \
+        and tokens[index + 1].start == tokens[index].end and tokens[index + 2].kind == "text" \
+        and tokens[index + 2].value in characters and tokens[index + 3].kind == "brace" and tokens[index + 3].value == "}"
+
+
+@functools.lru_cache(maxsize=4096)
+def scan_math_rules(math_content: str) -> frozenset:
+    """
+    Walks the token stream of a math segment once and returns the facts my heuristic math rules test,
+    the enforcer's M3-M17 and the linter's L2-L21 alike. Commands, control symbols and groups are read
+    as `tokenize_math` delimits them: a command name is not a word, an escaped `\\_` is not a script
+    marker, and a `\\frac` argument runs to its matching brace. Memoized by segment text, so the two
+    share the walk as they share the lexing.
+
+    Args:
+        math_content (str): The raw LaTeX math string.
+
+    Returns:
+        frozenset: The names of the facts that hold:
+            - "incomplete_frac": a `\\frac` not followed by two `{...}` arguments.
+            - "two_argument_frac": a `\\frac{...}{...}`.
+            - "backslash_run": four or more consecutive backslashes.
+            - "line_break": a `\\\\`.
+            - "spaced_ampersand": an alignment `&` spaced on both sides, after a character other than `\\`, `&` or a line break.
+            - "leading_ampersand": an alignment `&` first on its line.
+            - "plain_word": a plain-text word of two or more letters, not followed by a command such as `\\text`.
+            - "naked_superscript", "naked_subscript": `^` or `_` before a single letter or digit not itself followed by `{`.
+            - "superscripted_underscore": `^` directly followed by `_`.
+            - "bare_sqrt": a `\\sqrt` not followed by `{` or `[`.
+            - "numeric_cdot": a `\\cdot` between two digits.
+            - "raw_ellipsis": `...` in plain text.
+            - "escaped_script": an escaped `\\^`, or an escaped space before `^` or `_`.
+            - "differential_mathrm": `\\mathrm{d}` (or `D`, `i`, `j`) before an `x`.
+            - "dotted_variables": a `.` between letters.
+            - "text_single_letter": a `\\text{...}` holding a single-letter word.
+            - "small_left_right": `\\left` and `\\right` around a single character.
+            - "matrix_text": two whitespace-separated words within an array or matrix.
+            - "star_product": a `*` between letters or digits.
+            - "unescaped_percent": a `%` in plain text.
+            - "text_after_word": a `\\text...` command directly after a word character.
+            - "tag": a `\\tag{...}`.
+            - "numeric_fraction": a `1/2` not followed by a `\\frac`.
+            - "raw_bar": an unscaled `|` between two operands.
+            - "function_call", "named_function_call": a `(` directly after a letter or `_` (not opening a
+              `\\left`), and one after a named function such as `sin`.
+            - "text_font_variable": `\\textbf` or `\\textit` around a single letter.
+            - "single_char_group": a group of a single letter or digit followed by a character other than `_` or `^`.
+            - "matrix_ellipsis": `...` within an array or matrix.
+            - "mixed_delimiters": `$` and `\\[`, `\\(` or `\\]` used together in a single segment.
+            - "unpaired_null_delimiter": a `\\left.` without a `\\right.`, or the reverse.
+            - "ij_command": a `\\i` or `\\j`.
+    """
+    math = tokenize_math(math_content)
+    text, tokens = math.text, math.tokens
+    facts = set()
+    within_matrix = matrix_text = matrix_ellipsis = False # Rules L7/L18 look between a matrix's `\begin` and an `\end`.
+    null_delimiters = {"left": 0, "right": 0}
+    # Rule L19: the math delimiters met so far.
+    seen_dollar = seen_double_dollar = seen_bracket = seen_paren = seen_paren_after_double_dollar = False
+
+    for index, token in enumerate(tokens):
+        kind, value = token.kind, token.value
+        following = tokens[index + 1] if index + 1 < len(tokens) else None
+
+        if kind == "command":
+            if value == "frac":
+                first = _next_significant(tokens, index)
+                if first is None or tokens[first].kind != "brace" or tokens[first].value != "{":
+                    facts.add("incomplete_frac")
+                elif first in math.groups:
+                    second = _next_significant(tokens, math.groups[first])
+                    if second in math.groups:
+                        facts.add("two_argument_frac")
+                    elif second is not None:
+                        facts.add("incomplete_frac")
+            elif value == "sqrt":
+                argument = _next_significant(tokens, index)
+                if argument is None or (tokens[argument].kind, tokens[argument].value) not in (("brace", "{"), ("delimiter", "[")):
+                    facts.add("bare_sqrt")
+            elif value == "cdot":
+                previous = tokens[index - 1] if index else None
+                if previous is not None and previous.kind == "text" and previous.value.rstrip()[-1:] in _ASCII_DIGITS and \
+                   following is not None and following.kind == "text" and following.value.lstrip()[:1] in _ASCII_DIGITS:
+                    facts.add("numeric_cdot")
+            elif value == "mathrm":
+                if _wraps_single(tokens, index, _DIFFERENTIAL_LETTERS) and index + 4 < len(tokens) and \
+                   tokens[index + 4].kind == "text" and tokens[index + 4].value.lstrip().startswith('x'):
+                    facts.add("differential_mathrm")
+            elif value in ("left", "right"):
+                if following is not None and following.kind == "text" and following.start == token.end and following.value[0] == '.':
+                    null_delimiters[value] += 1
+                if value == "left" and following is not None and following.kind in ("delimiter", "brace") and \
+                   following.value in '({[' and following.start == token.end:
+                    # A single character, whitespace aside, and then the matching `\right`.
+                    characters, closing = 0, index + 2
+                    while closing < len(tokens) and tokens[closing].kind not in ("command", "symbol", "begin", "end") and characters <= 1:
+                        characters += sum(not c.isspace() for c in tokens[closing].value)
+                        closing += 1
+                    if characters == 1 and closing + 1 < len(tokens) and tokens[closing].kind == "command" and \
+                       tokens[closing].value == "right" and tokens[closing + 1].kind in ("delimiter", "brace") and \
+                       tokens[closing + 1].value in ')}]' and tokens[closing + 1].start == tokens[closing].end:
+                        facts.add("small_left_right")
+            elif value == "tag":
+                if following is not None and following.start == token.end and index + 1 in math.groups:
+                    facts.add("tag")
+            elif value in ("i", "j"):
+                if not (text[token.end:token.end + 1].isalnum() or text[token.end:token.end + 1] == '_'):
+                    facts.add("ij_command")
+
+            if value.startswith("text"):
+                if token.start and (text[token.start - 1].isalnum() or text[token.start - 1] == '_'):
+                    facts.add("text_after_word")
+                if value in ("textbf", "textit") and _wraps_single(tokens, index, _ASCII_LETTERS):
+                    facts.add("text_font_variable")
+                if value == "text" and following is not None and following.start == token.end and index + 1 in math.groups:
+                    if any(inner.kind == "text" and next(_text_token_matches(_SINGLE_LETTER_PATTERN, math, inner), None)
+                           for inner in tokens[index + 2:math.groups[index + 1]]):
+                        facts.add("text_single_letter")
+
+        elif kind == "symbol":
+            if value == "\\":
+                facts.add("line_break")
+                previous = tokens[index - 1] if index else None
+                if previous is not None and previous.kind == "symbol" and previous.value == "\\" and previous.end == token.start:
+                    facts.add("backslash_run")
+                if seen_dollar and following is not None and following.kind == "delimiter" and following.value == ']' \
+                   and following.start == token.end:
+                    facts.add("mixed_delimiters")
+            elif value == "^":
+                facts.add("escaped_script")
+            elif value.isspace():
+                marker = _next_significant(tokens, index)
+                if marker is not None and tokens[marker].kind == "script":
+                    facts.add("escaped_script")
+            elif value == "[":
+                if seen_dollar:
+                    facts.add("mixed_delimiters")
+                seen_bracket = True
+            elif value == "(":
+                seen_paren = True
+                seen_paren_after_double_dollar = seen_paren_after_double_dollar or seen_double_dollar
+            elif value == ")" and seen_paren_after_double_dollar:
+                facts.add("mixed_delimiters")
+
+        elif kind == "script":
+            if token.start and text[token.start - 1] == '_':
+                continue
+            if text[token.end + 1:token.end + 2] != '{':
+                follower = text[token.end:token.end + 1]
+                if follower in _ASCII_ALNUM:
+                    facts.add("naked_superscript" if value == "^" else "naked_subscript")
+                elif follower == '_' and value == "^":
+                    facts.add("superscripted_underscore")
+
+        elif kind == "align":
+            position = token.start
+            if position >= 2 and text[position - 1].isspace() and text[position + 1:position + 2].isspace() and \
+               text[position - 2] not in '\\&\n':
+                facts.add("spaced_ampersand")
+            while position and text[position - 1].isspace():
+                position -= 1
+            if not position or '\n' in text[position:token.start]:
+                facts.add("leading_ampersand")
+
+        elif kind == "text":
+            if value.isspace():
+                continue
+            if "plain_word" not in facts:
+                exempting = following is not None and following.kind == "command" and following.value in _WORD_EXEMPTING_COMMANDS
+                for word in _text_token_matches(_PLAIN_WORD_PATTERN, math, token):
+                    if not (exempting and (word.end() == token.end or text[word.end():token.end].isspace())):
+                        facts.add("plain_word")
+                        break
+            if '.' in value:
+                if '...' in value:
+                    facts.add("raw_ellipsis")
+                    if within_matrix and next(_text_token_matches(_MATRIX_ELLIPSIS_PATTERN, math, token), None):
+                        matrix_ellipsis = True
+                if next(_text_token_matches(_DOTTED_VARIABLES_PATTERN, math, token), None):
+                    facts.add("dotted_variables")
+            if '*' in value and next(_text_token_matches(_STARRED_OPERANDS_PATTERN, math, token), None):
+                facts.add("star_product")
+            if '%' in value:
+                facts.add("unescaped_percent")
+            if '/' in value:
+                before_frac = following is not None and following.kind == "command" and following.value == "frac"
+                for fraction in _text_token_matches(_NUMERIC_FRACTION_PATTERN, math, token):
+                    if not (before_frac and (fraction.end() == token.end or text[fraction.end():token.end].isspace())):
+                        facts.add("numeric_fraction")
+                        break
+            if within_matrix and not matrix_text and next(_text_token_matches(_SPACED_WORDS_PATTERN, math, token), None):
+                matrix_text = True
+            if '$' in value:
+                if seen_bracket or (seen_paren and '$$' in value):
+                    facts.add("mixed_delimiters")
+                seen_dollar = True
+                seen_double_dollar = seen_double_dollar or '$$' in value
+
+        elif kind == "brace":
+            if value == "{" and math.groups.get(index) == index + 2 and tokens[index + 1].kind == "text" and \
+               tokens[index + 1].value in _ASCII_ALNUM and text[tokens[index + 2].end:tokens[index + 2].end + 1] not in ('', '_', '^'):
+                facts.add("single_char_group")
+
+        elif kind == "delimiter":
+            if value in "(|" and not _is_scaled(tokens, index):
+                # The operand before it, whitespace aside.
+                operand = token.start - 1
+                while operand >= 0 and text[operand].isspace():
+                    operand -= 1
+                if value == "(" and operand >= 0 and (text[operand] in _ASCII_LETTERS or text[operand] == '_'):
+                    argument = _next_significant(tokens, index)
+                    if argument is None or tokens[argument].kind != "command" or tokens[argument].value != "left":
+                        facts.add("function_call")
+                    name_start = operand
+                    while name_start and (text[name_start - 1].isalnum() or text[name_start - 1] == '_'):
+                        name_start -= 1
+                    if text[name_start:operand + 1] in _NAMED_FUNCTIONS:
+                        facts.add("named_function_call")
+                elif value == "|" and operand >= 0 and text[operand] != '|' and (not operand or text[operand - 1] != '\\'):
+                    after = token.end
+                    while after < len(text) and text[after].isspace():
+                        after += 1
+                    if after < len(text) and text[after] != '|':
+                        rest = after + 1
+                        while rest < len(text) and text[rest].isspace():
+                            rest += 1
+                        if not text.startswith('\\vert', rest):
+                            facts.add("raw_bar")
+            elif value == ")" and seen_paren_after_double_dollar:
+                facts.add("mixed_delimiters")
+
+        elif kind == "begin":
+            within_matrix = within_matrix or value in _MATRIX_ENVIRONMENTS
+        elif kind == "end" and value in _MATRIX_ENVIRONMENTS:
+            if matrix_text:
+                facts.add("matrix_text")
+            if matrix_ellipsis:
+                facts.add("matrix_ellipsis")
+
+    if null_delimiters["left"] != null_delimiters["right"]:
+        facts.add("unpaired_null_delimiter")
+    return frozenset(facts)
+
+
 class MermaidSchemaEnforcer:
     """
     Behold, mortals! This is the unparalleled MermaidSchemaEnforcer, a creation of
@@ -265,6 +856,8 @@ class MermaidSchemaEnforcer:
     ]
     # Simple regex for identifying patent claim references like "[Claim X]" or "Claim X"
     CLAIM_REFERENCE_PATTERN = re.compile(r'(?:\[|\b)(?:Claim|CLAIM)\s+(\d+)(?:\]|\b)')
+    # How many distinct math segments keep their memoized verdicts before the oldest is forgotten.
+    _VERDICT_CACHE_SIZE = 4096
 
 
     def __init__(self, strict_mode: bool = True):
@@ -383,6 +976,8 @@ class MermaidSchemaEnforcer:
             re.compile(r'~?->\s*"([^"]+)"\s*~?->'),              # E.g., A ~>"Label"~> B (for sequence diagrams)
             re.compile(r'==>\s*"([^"]+)"\s*==>')                 # E.g., A ==>"Label"==> B (Burvel's Enhanced Flow)
         ]
+        # All link label patterns as one alternation, so my round-label heuristic searches a line once.
+        self._link_label_scanner = re.compile('|'.join(f'(?:{pattern.pattern})' for pattern in self._link_label_patterns))
 
         # Additional regex patterns for detecting structural issues in diagram flow (my contribution to advanced linting)
         self._diagram_flow_patterns = {
@@ -391,19 +986,222 @@ class MermaidSchemaEnforcer:
             "lonely_node": re.compile(r'^\s*(\w+)(?:\[.*?\]|\(.*?\)).*?$(?!\s*\w+\s*(?:-->|--|==>|~~~).*\s*\1|\s*\1\s*(?:-->|--|==>|~~~).*\s*\w+)', re.MULTILINE)
         }
 
+        # --- Lexer Patterns (compiled once, applied once per document by `tokenize_diagram`) ---
+        # Delimiter-first forms of the identifier-prefixed label patterns (indices 4-13 above). Leading with the
+        # opening delimiter lets the regex engine leap straight to candidate shapes rather than attempting a match
+        # at every word character; `_scan_identifier_prefixed` then confirms the `\w+\s*` identifier before each one.
+        # The label content is group 1, except for pattern 14 whose whole match is the shape.
+        self._anchored_label_patterns = {
+            4: re.compile(r'\((?<=[\w\s]\()([^)]+)\)'),
+            5: re.compile(r'>(?<=[\w\s]>)([^\]]+)\]'),
+            6: re.compile(r'\[\/(?<=[\w\s]\[\/)([^\/]+)\/\]'),
+            7: re.compile(r'\[\\(?<=[\w\s]\[\\)([^\\]+)\\]'),
+            8: re.compile(r'\{\{(?<=[\w\s]\{\{)([^}]+)\}\}'),
+            9: re.compile(r'\(\(\((?<=[\w\s]\(\(\()([^)]+)\)\)\)'),
+            10: re.compile(r'\[\/(?<=[\w\s]\[\/)([^\\]+)\\]'),
+            11: re.compile(r'\[\((?<=[\w\s]\[\()([^\)]+)\)\]'),
+            12: re.compile(r'\[\[(?<=[\w\s]\[\[)([^\]]+)\]\]'),
+            13: re.compile(r'\[(?<=\w\[).*?\]|\(\((?<=\w\(\().*?\)\)|\{(?<=\w\{).*?\}|>(?<=\w>).?\]|\(\((?<=\w\(\().*?\)|\{\{(?<=\w\{\{).*?\}\}|\(\(\((?<=\w\(\(\().*?\)\)\)|\[\/(?<=\w\[\/).*?\/\]|\[\\(?<=\w\[\\).*?\\\]|\[\/(?<=\w\[\/)\.*?\\\]|\[\((?<=\w\[\().*?\)\]'),
+        }
+        # Extracts the inner label of a generic shape matched by validation pattern 14.
+        self._shape_inner_label_pattern = re.compile(r'\[([^\]]+)\]|\(\(([^)]+)\)\)|\{([^}]+)\}|>([^\]]+)\]|\(\(([^)]+)\)|\{\{([^}]+)\}\}|\(\(\(([^)]+)\)\)\)|\[\/([^\/]+)\/\]|\[\\([^\\]+)\\]|\[\/([^\\]+)\\]|\[\(([^\)]+)\)\]|\[\[([^\]]+)\]\]')
+        # Explicit links, `Source --> Target` (optionally with a "quoted" label), anchored on the arrow.
+        # The source identifier precedes the match and is recovered by `_scan_identifier_prefixed`; group 1 is the target.
+        self._anchored_link_pattern = re.compile(r'(?:-->(?<=[\w\s]-->)|--(?<=[\w\s]--)|==>(?<=[\w\s]==>)|~~~(?<=[\w\s]~~~))\s*(?:".*?"\s*)?\s*(\w+)')
+        # Lines that configure the diagram rather than declare nodes (comments, subgraphs, styling, ...).
+        self._directive_pattern = re.compile(r'^[ \t]*(?:%%|(?:subgraph|end|direction|classDef|class|style|linkStyle|click|participant|actor|note|title|section|loop|alt|else|opt|par|and|rect|activate|deactivate|autonumber|dateFormat|axisFormat)\b).*$', re.MULTILINE)
+        # The mandatory diagram type declaration at the head of the document.
+        self._diagram_type_pattern = re.compile(r'^\s*(graph|flowchart|sequenceDiagram|gantt|classDiagram|stateDiagram(?:-v2)?|erDiagram|journey|gitGraph|pie|mindmap|quadrantChart|timeline)(?![\w-])', re.IGNORECASE)
+        self._generic_label_pattern = re.compile(r'\s*[A-Z]\s*', re.IGNORECASE)
+        self._inline_math_pattern = re.compile(r'\$.*?\$|\\\(.*?\\\)')
+        # --- Forbidden Keyword Matcher (built once; a single scan per label, however long my list grows) ---
+        # The upper-cased keywords are compiled into a trie-shaped regex, so the engine branches on each
+        # character instead of trying every keyword in turn. A search rejects a clean label at once; a label
+        # holding keywords is searched again just past each hit, so overlapping keywords are found too.
+        upper_keywords = sorted({keyword.upper() for keyword in self.FORBIDDEN_KEYWORDS})
+        self._forbidden_keyword_pattern = re.compile(self._build_keyword_trie_pattern(upper_keywords))
+        # Each hit is the longest keyword at its position; shorter keywords it starts with occur there too.
+        # A hit maps straight to the (list position, keyword) of every keyword it reveals, so reports keep
+        # the order of FORBIDDEN_KEYWORDS without walking the list.
+        self._forbidden_keyword_hits = {k: [(rank, keyword) for rank, keyword in enumerate(self.FORBIDDEN_KEYWORDS)
+                                            if k.startswith(keyword.upper())] for k in upper_keywords}
+        # Single-entry cache so that validation passes over the same text share one token stream.
+        self._tokenized_cache: Union[TokenizedDiagram, None] = None
+        # Verdicts of my math Rules M1-M17, memoized per math segment (delimiters included).
+        self._math_verdict_cache: Dict[str, Tuple[Tuple[str, str, str, str], ...]] = {}
+        # Results of my math transformations, memoized per (segment, remove_dollars, standardize_environments).
+        self._math_transform_cache: Dict[Tuple[str, bool, bool], str] = {}
+        # My math linter, created on first use and kept for the life of the enforcer.
+        self._math_linter: Union["MermaidMathSyntaxLinter", None] = None
+
+
+    @staticmethod
+    def _build_keyword_trie_pattern(keywords: List[str]) -> str:
+        """
+        Builds a regex source matching any of `keywords`, factored as a character trie
+        (e.g. "BETA", "BUG" -> "B(?:ETA|UG)"), preferring the longest keyword at a position.
+        """
+        trie: Dict[str, Any] = {}
+        for keyword in keywords:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+
+        def emit(node: Dict[str, Any]) -> str:
+            branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            if "" in node: # A keyword ends here; longer keywords continuing from it are optional.
+                return ("(?:" + body + ")?") if len(branches) > 1 or len(branches[0]) > 1 else body + "?"
+            return body
+
+        return emit(trie)
 
     def _get_line_number(self, mermaid_text: str, start_index: int) -> int:
         """
         Helper to find the 1-based line number for a given match start index in the text.
-        A trivial yet essential component of my robust error reporting.
+        A trivial yet essential component of my robust error reporting, now a binary search
+        over the document's cached `LineIndex`.
+        """
+        return LineIndex.for_text(mermaid_text).line_number(start_index)
+
+    def _scan_identifier_prefixed(self, mermaid_text: str, anchored_regex: re.Pattern, allow_space: bool = True):
+        """
+        Yields `(identifier_start, match)` for every match of a delimiter-first pattern that is preceded by a
+        node identifier (`\\w+`, optionally followed by whitespace). Candidates lacking an identifier are
+        rejected and the scan resumes just past them, so the results coincide exactly with a left-to-right
+        scan of the identifier-prefixed pattern - at a fraction of the cost.
+        """
+        search = anchored_regex.search
+        pos = last_end = 0
+        while True:
+            match = search(mermaid_text, pos)
+            if match is None:
+                return
+            word_end = match.start()
+            if allow_space:
+                while word_end > 0 and mermaid_text[word_end - 1].isspace():
+                    word_end -= 1
+            word_start = word_end
+            while word_start > 0 and (mermaid_text[word_start - 1].isalnum() or mermaid_text[word_start - 1] == '_'):
+                word_start -= 1
+            if word_start == word_end or word_start < last_end:
+                pos = match.start() + 1
+                continue
+            yield word_start, match
+            pos = last_end = match.end()
+
+    def _is_link_label(self, mermaid_text: str, line_start: int, node_start: int) -> bool:
+        """
+        My heuristic for round labels: a link pattern earlier on the same line marks `(Label)` as a link label.
+        """
+        return self._link_label_scanner.search(mermaid_text, line_start, node_start) is not None
+
+    def _generic_shape_labels(self, mermaid_text: str, anchored_regex: re.Pattern):
+        """
+        Yields `(content, start, False)` for the inner label of every generic ID-shape (validation pattern 14).
+        """
+        for match in anchored_regex.finditer(mermaid_text):
+            full_shape_content = match.group(0)
+            inner_label_match = self._shape_inner_label_pattern.search(full_shape_content)
+            if inner_label_match:
+                content = next(g for g in inner_label_match.groups() if g is not None)
+                yield content, match.start() + full_shape_content.find(content), False
+
+    def tokenize_diagram(self, mermaid_text: str) -> TokenizedDiagram:
+        """
+        Lexes a Mermaid diagram in a single sweep into labels, node IDs, links and directives,
+        with line offsets computed exactly once. Every shape grammar is applied to the document
+        exactly once and each token's line number is resolved by binary search, so the cost of
+        validation grows linearly with the document rather than quadratically.
+        The token stream of the most recent document is cached for reuse by subsequent rules.
+
+        Args:
+            mermaid_text (str): The Mermaid diagram source text.
+
+        Returns:
+            TokenizedDiagram: The line offsets and ordered token streams of the diagram.
+        """
+        cached = self._tokenized_cache
+        if cached is not None and cached.text == mermaid_text:
+            return cached
+
+        tokenized = self._lex_diagram(mermaid_text, LineIndex.for_text(mermaid_text))
+        self._tokenized_cache = tokenized
+        return tokenized
+
+    def _lex_diagram(self, mermaid_text: str, line_index: LineIndex, detect_header: bool = True) -> TokenizedDiagram:
+        """
+        The uncached lexing sweep behind `tokenize_diagram`, also applied by `IncrementalMermaidDocument`
+        to single edited lines, where `detect_header` is False for every line but the document's first.
+
+        Args:
+            mermaid_text (str): The Mermaid text to lex: a whole diagram or a single line of one.
+            line_index (LineIndex): The line offsets of `mermaid_text`.
+            detect_header (bool): If True, a leading diagram type declaration is lexed as the header directive.
+
+        Returns:
+            TokenizedDiagram: The line offsets and ordered token streams of the text.
         """
-        return mermaid_text.count('\n', 0, start_index) + 1
+        line_starts = line_index.line_starts
+        line_of = functools.partial(bisect.bisect_right, line_starts)
+
+        # --- Labels: each shape grammar applied once; grammars yielding the same span collapse to one token ---
+        labels_by_span: Dict[Tuple[int, int], MermaidToken] = {}
+        for i, regex in enumerate(self._validation_label_patterns):
+            anchored = self._anchored_label_patterns.get(i)
+            if anchored is None:
+                found = ((m.group(1), m.start(1), False) for m in regex.finditer(mermaid_text))
+            elif i == 4:  # A(Label) pattern (round nodes): subject to my link-label heuristic.
+                found = ((m.group(1), m.start(1), self._is_link_label(mermaid_text, line_starts[line_of(id_start) - 1], id_start))
+                         for id_start, m in self._scan_identifier_prefixed(mermaid_text, anchored))
+            elif i == 13:  # Generic ID-shape: its lookbehind already demands an adjacent ID; the inner label is dug out.
+                found = self._generic_shape_labels(mermaid_text, anchored)
+            else:
+                found = ((m.group(1), m.start(1), False) for _, m in self._scan_identifier_prefixed(mermaid_text, anchored))
+
+            for content, start, is_link_label in found:
+                span = (start, start + len(content))
+                existing = labels_by_span.get(span)
+                if existing is None:
+                    labels_by_span[span] = MermaidToken("label", content, start, span[1], line_of(start),
+                                                        pattern_index=i, is_link_label=is_link_label)
+                elif existing.is_link_label and not is_link_label:
+                    existing.is_link_label = False
+        labels = sorted(labels_by_span.values(), key=lambda t: t.start)
+
+        # --- Directives: the diagram header plus configuration lines, which never declare nodes ---
+        header = self._diagram_type_pattern.match(mermaid_text) if detect_header else None
+        directives = []
+        if header:
+            directives.append(MermaidToken("directive", header.group(0).strip(), header.start(1), header.end(1), line_of(header.start(1))))
+        for match in self._directive_pattern.finditer(mermaid_text):
+            directives.append(MermaidToken("directive", match.group(0).strip(), match.start(), match.end(), line_of(match.start())))
+        directive_lines = {t.line_number for t in directives}
+
+        # --- Node IDs: the leading identifier of every non-directive line ---
+        nodes = []
+        for match in self._node_id_pattern.finditer(mermaid_text):
+            node_id = match.group(1)
+            line_num = line_of(match.start(1))
+            if node_id and line_num not in directive_lines:
+                nodes.append(MermaidToken("node", node_id, match.start(1), match.end(1), line_num))
+
+        # --- Links: explicit source -> target pairs ---
+        links = []
+        for id_start, match in self._scan_identifier_prefixed(mermaid_text, self._anchored_link_pattern):
+            source = mermaid_text[id_start:match.start()].rstrip()
+            links.append(MermaidToken("link", source, id_start, match.end(), line_of(id_start), target=match.group(1)))
+
+        return TokenizedDiagram(mermaid_text, line_index, labels, nodes, links, directives, header)
 
     def _extract_all_labels(self, mermaid_text: str, exclude_link_labels: bool = True) -> List[Tuple[str, int, int]]:
         """
         Extracts all identifiable label contents and their character start/end indices from the diagram.
         This consolidates logic for various label types, making it easier to apply general rules.
-        A marvel of abstraction, if I do say so myself.
+        A marvel of abstraction, if I do say so myself. Now a thin view over `tokenize_diagram`.
 
         Args:
             mermaid_text (str): The Mermaid diagram source text.
@@ -413,47 +1211,147 @@ class MermaidSchemaEnforcer:
             List[Tuple[str, int, int]]: A list of tuples, where each tuple contains:
                                         (label_content_string, start_index_of_content, end_index_of_content).
         """
-        all_labels = []
-        for i, regex in enumerate(self._validation_label_patterns):
-            for match in regex.finditer(mermaid_text):
-                label_content = None
-                content_start_idx = -1
-                content_end_idx = -1
-                
-                # Determine the correct group for content and apply link label heuristic if required.
-                if i == 4:  # Corresponds to A(Label) pattern (round nodes)
-                    if exclude_link_labels:
-                        line_start = mermaid_text.rfind('\n', 0, match.start()) + 1
-                        line_segment_before_match = mermaid_text[line_start : match.start()]
-                        # Check if any link pattern is found before the current match on the same line
-                        if any(link_pattern.search(line_segment_before_match) for link_pattern in self._link_label_patterns):
-                            continue # Skip: Likely a link label, a subtle distinction for my system.
-                    label_content = match.group(2) # Content is in group 2 for this specific regex
-                    content_start_idx = match.start(2)
-                    content_end_idx = match.end(2)
-                elif i == 13: # Generic ID-shape pattern, content is within group 2 (the shape itself)
-                    # We need to extract the *inner* content of the shape from match.group(2)
-                    full_shape_content = match.group(2)
-                    # Use a sub-regex to extract the label from the shape (e.g., [Label] -> Label)
-                    inner_label_match = re.search(r'\[([^\]]+)\]|\(\(([^)]+)\)\)|\{([^}]+)\}|>([^\]]+)\]|\(\((([^)]+)))\)|\{\{([^}]+)\}\}|\(\(\(([^)]+)\)\)\)|\[\/([^\/]+)\/\]|\[\\([^\\]+)\\]|\[\/([^\\]+)\\]|\[\(([^\)]+)\)\]|\[\[([^\]]+)\]\]', full_shape_content)
-                    if inner_label_match:
-                        # Find the first non-None group, which is the actual label content
-                        for g in inner_label_match.groups():
-                            if g is not None:
-                                label_content = g
-                                # Adjust start/end indices relative to the original match
-                                relative_start = full_shape_content.find(label_content)
-                                content_start_idx = match.start(2) + relative_start
-                                content_end_idx = content_start_idx + len(label_content)
-                                break
-                else: # Content is in group 1 for most other regexes
-                    label_content = match.group(1)
-                    content_start_idx = match.start(1)
-                    content_end_idx = match.end(1)
-                
-                if label_content is not None:
-                    all_labels.append((label_content, content_start_idx, content_end_idx))
-        return all_labels
+        return self.tokenize_diagram(mermaid_text).label_spans(exclude_link_labels)
+
+    # --- Rule Helpers (shared by whole-document and incremental validation) ---
+    def _label_violations(self, label_content: str, line_num: int) -> List[SchemaViolation]:
+        """
+        Applies my label Rules 1-6 to a single node label.
+
+        Args:
+            label_content (str): The raw label content, as lexed.
+            line_num (int): The 1-based line number on which the label appears.
+
+        Returns:
+            List[SchemaViolation]: The violations of this label alone.
+        """
+        violations: List[SchemaViolation] = []
+        cleaned_label = label_content.strip()
+
+        # Rule 1: No parentheses in node labels (My primary and most often violated decree)
+        if '(' in label_content or ')' in label_content:
+            violations.append(SchemaViolation(
+                rule_name="ParenthesesInLabel",
+                message="Label contains parentheses, which is an archaic and forbidden practice according to my patent rubric rules.",
+                context=cleaned_label,
+                line_number=line_num
+            ))
+
+        # Rule 2: Label length limit (My insights cannot be constrained by limited space, but yours can!)
+        if len(cleaned_label) > self.MAX_LABEL_LENGTH:
+            violations.append(SchemaViolation(
+                rule_name="LabelLengthExceeded",
+                message=f"Label length ({len(cleaned_label)}) exceeds my maximum allowed ({self.MAX_LABEL_LENGTH}). Be more concise, or less prolific, unlike myself.",
+                context=cleaned_label,
+                line_number=line_num,
+                severity="warning"
+            ))
+
+        # Rule 3: Forbidden keywords in labels (Lesser minds use such crude markers of inadequacy)
+        upper_label = cleaned_label.upper()
+        search = self._forbidden_keyword_pattern.search
+        match = search(upper_label)
+        if match:
+            found_keywords = set()
+            while match:
+                found_keywords.update(self._forbidden_keyword_hits[match.group()])
+                match = search(upper_label, match.start() + 1)
+            for _, keyword in sorted(found_keywords):
+                violations.append(SchemaViolation(
+                    rule_name="ForbiddenKeyword",
+                    message=f"Label contains my forbidden keyword: '{keyword}'. This indicates a lack of finality and intellectual rigor.",
+                    context=cleaned_label,
+                    line_number=line_num,
+                    severity="warning"
+                ))
+        
+        # Rule 4: Label cannot be empty or solely whitespace (A vacuum of thought is unacceptable)
+        if not cleaned_label:
+            violations.append(SchemaViolation(
+                rule_name="EmptyLabel",
+                message="Label content is empty or contains only whitespace. This is a void, an intellectual black hole.",
+                context=label_content,
+                line_number=line_num,
+                severity="error"
+            ))
+
+        # Rule 5: Labels should not be generic single characters (unless part of an equation, which is handled elsewhere)
+        if len(cleaned_label) == 1 and self._generic_label_pattern.fullmatch(cleaned_label) and not self._inline_math_pattern.search(cleaned_label):
+            violations.append(SchemaViolation(
+                rule_name="GenericLabel",
+                message="Label is a generic single character, which lacks the specificity my brilliant diagrams demand.",
+                context=cleaned_label,
+                line_number=line_num,
+                severity="warning"
+            ))
+        
+        # Rule 6: No leading/trailing spaces in labels (Cosmetic but critical for my impeccable standards)
+        if label_content != cleaned_label:
+            violations.append(SchemaViolation(
+                rule_name="ExcessiveWhitespace",
+                message="Label has leading or trailing whitespace. Trim your prose, you slovenly scribe!",
+                context=f"'{label_content}'",
+                line_number=line_num,
+                severity="info"
+            ))
+
+        return violations
+
+    def _duplicate_node_violation(self, node_id: str, lines: List[int]) -> SchemaViolation:
+        """
+        Rule 7: the violation for a node ID declared on more than one line (`lines`, in ascending order).
+        """
+        return SchemaViolation(
+            rule_name="DuplicateNodeID",
+            message=f"Node ID '{node_id}' is duplicated across lines: {', '.join(map(str, lines))}. Node IDs must be as unique as my fingerprints!",
+            context=node_id,
+            line_number=lines[0], # Report first occurrence
+            severity="error"
+        )
+
+    def _diagram_type_violation(self, first_line: str) -> SchemaViolation:
+        """
+        Rule 8: the violation for a diagram whose first line declares no recognized diagram type.
+        """
+        first_line = first_line.strip()
+        return SchemaViolation(
+            rule_name="InvalidDiagramType",
+            message="Mermaid diagram must commence with a recognized diagram type (e.g., 'graph', 'flowchart'). Anything else is chaos!",
+            context=first_line if len(first_line) < 100 else first_line[:97] + "...",
+            line_number=1,
+            severity="error"
+        )
+
+    def _lonely_node_violation(self, node_id: str, line_num: int) -> SchemaViolation:
+        """
+        Rule 9: the violation for a node declared (first on `line_num`) but absent from every link.
+        """
+        return SchemaViolation(
+            rule_name="LonelyNode",
+            message=f"Node '{node_id}' appears to be defined but is neither a source nor a target of any link. A solitary existence, without function!",
+            context=node_id,
+            line_number=line_num,
+            severity="warning"
+        )
+
+    def _cycle_violations(self, mermaid_text: str, line_start: int, line_end: int, line_num: int) -> List[SchemaViolation]:
+        """
+        Rule 10: the simple cyclical paths spelled out on one line, `mermaid_text[line_start:line_end]`.
+        """
+        violations: List[SchemaViolation] = []
+        for match in self._diagram_flow_patterns["cyclical_path"].finditer(mermaid_text, line_start, line_end):
+            start_node = match.group(1).strip()
+            target_node = match.group('target').strip()
+            if start_node == target_node: # Self-referential loops are fine, if intentional.
+                continue
+            violations.append(SchemaViolation(
+                rule_name="CyclicalPath",
+                message=f"Warning: A simple cyclical path detected between '{start_node}' and '{target_node}'. Ensure this recursive loop is intentional, not an infinite regress!",
+                context=match.group(0),
+                line_number=line_num,
+                severity="info"
+            ))
+        return violations
 
     def validate_diagram(self, mermaid_text: str) -> List[SchemaViolation]:
         """
@@ -466,6 +1364,8 @@ class MermaidSchemaEnforcer:
         - My newly added, crucial structural integrity checks (unreachable nodes, cycles).
         - Prevention of Burvel's Cardinal Sins: labels with only generic characters or excessive whitespace.
 
+        The diagram is lexed once by `tokenize_diagram`; every rule below consumes that token stream.
+
         Args:
             mermaid_text (str): The Mermaid diagram source text.
 
@@ -473,169 +1373,88 @@ class MermaidSchemaEnforcer:
             List[SchemaViolation]: A list of detected `SchemaViolation` objects, each a testament to imperfection.
         """
         violations: List[SchemaViolation] = []
+        tokens = self.tokenize_diagram(mermaid_text)
 
-        # Rule 1: No parentheses in node labels (My primary and most often violated decree)
-        for i, regex in enumerate(self._validation_label_patterns):
-            for match in regex.finditer(mermaid_text):
-                label_content = None
-                line_num = self._get_line_number(mermaid_text, match.start())
-
-                if i == 4:  # A(Label) pattern (round nodes)
-                    line_start = mermaid_text.rfind('\n', 0, match.start()) + 1
-                    line_segment_before_match = mermaid_text[line_start : match.start()]
-                    if any(link_pattern.search(line_segment_before_match) for link_pattern in self._link_label_patterns):
-                        continue # Skip: Likely a link label.
-                    label_content = match.group(2)
-                elif i == 13: # Generic ID-shape, extract inner content
-                    full_shape_content = match.group(2)
-                    inner_label_match = re.search(r'\[([^\]]+)\]|\(\(([^)]+)\)\)|\{([^}]+)\}|>([^\]]+)\]|\(\((([^)]+)))\)|\{\{([^}]+)\}\}|\(\(\(([^)]+)\)\)\)|\[\/([^\/]+)\/\]|\[\\([^\\]+)\\]|\[\/([^\\]+)\\]|\[\(([^\)]+)\)\]|\[\[([^\]]+)\]\]', full_shape_content)
-                    if inner_label_match:
-                        for g in inner_label_match.groups():
-                            if g is not None:
-                                label_content = g
-                                break
-                else:
-                    label_content = match.group(1)
-
-                if label_content and ('(' in label_content or ')' in label_content):
-                    violations.append(SchemaViolation(
-                        rule_name="ParenthesesInLabel",
-                        message="Label contains parentheses, which is an archaic and forbidden practice according to my patent rubric rules.",
-                        context=label_content.strip(),
-                        line_number=line_num
-                    ))
-
-        # Apply rules to all extracted label contents (The Grand Inquisitor's scrutiny)
-        for label_content, start_idx, end_idx in self._extract_all_labels(mermaid_text):
-            line_num = self._get_line_number(mermaid_text, start_idx)
-            cleaned_label = label_content.strip()
-
-            # Rule 2: Label length limit (My insights cannot be constrained by limited space, but yours can!)
-            if len(cleaned_label) > self.MAX_LABEL_LENGTH:
-                violations.append(SchemaViolation(
-                    rule_name="LabelLengthExceeded",
-                    message=f"Label length ({len(cleaned_label)}) exceeds my maximum allowed ({self.MAX_LABEL_LENGTH}). Be more concise, or less prolific, unlike myself.",
-                    context=cleaned_label,
-                    line_number=line_num,
-                    severity="warning"
-                ))
-
-            # Rule 3: Forbidden keywords in labels (Lesser minds use such crude markers of inadequacy)
-            for keyword in self.FORBIDDEN_KEYWORDS:
-                if keyword.upper() in cleaned_label.upper():
-                    violations.append(SchemaViolation(
-                        rule_name="ForbiddenKeyword",
-                        message=f"Label contains my forbidden keyword: '{keyword}'. This indicates a lack of finality and intellectual rigor.",
-                        context=cleaned_label,
-                        line_number=line_num,
-                        severity="warning"
-                    ))
-            
-            # Rule 4: Label cannot be empty or solely whitespace (A vacuum of thought is unacceptable)
-            if not cleaned_label:
-                violations.append(SchemaViolation(
-                    rule_name="EmptyLabel",
-                    message="Label content is empty or contains only whitespace. This is a void, an intellectual black hole.",
-                    context=label_content,
-                    line_number=line_num,
-                    severity="error"
-                ))
-
-            # Rule 5: Labels should not be generic single characters (unless part of an equation, which is handled elsewhere)
-            if re.fullmatch(r'\s*[A-Z]\s*', cleaned_label, re.IGNORECASE) and not re.search(r'\$.*?\$|\\\(.*?\\\)', cleaned_label):
-                violations.append(SchemaViolation(
-                    rule_name="GenericLabel",
-                    message="Label is a generic single character, which lacks the specificity my brilliant diagrams demand.",
-                    context=cleaned_label,
-                    line_number=line_num,
-                    severity="warning"
-                ))
-            
-            # Rule 6: No leading/trailing spaces in labels (Cosmetic but critical for my impeccable standards)
-            if label_content != cleaned_label:
-                violations.append(SchemaViolation(
-                    rule_name="ExcessiveWhitespace",
-                    message="Label has leading or trailing whitespace. Trim your prose, you slovenly scribe!",
-                    context=f"'{label_content}'",
-                    line_number=line_num,
-                    severity="info"
-                ))
+        # Rules 1-6: each label judged on its own merits (The Grand Inquisitor's scrutiny)
+        for token in tokens.labels:
+            if not token.is_link_label:
+                violations.extend(self._label_violations(token.value, token.line_number))
 
+        # Node IDs and the lines declaring them, shared by Rules 7 and 9.
+        node_ids: Dict[str, List[int]] = {}
+        for token in tokens.nodes:
+            node_ids.setdefault(token.value, []).append(token.line_number)
 
         # Rule 7: Unique Node IDs (if strict_mode is True) - Duplication is an affront to order
         if self.strict_mode:
-            node_ids: Dict[str, List[int]] = {}
-            for match in self._node_id_pattern.finditer(mermaid_text):
-                node_id = match.group(1).strip()
-                line_num = self._get_line_number(mermaid_text, match.start())
-                if node_id:
-                    node_ids.setdefault(node_id, []).append(line_num)
             for node_id, lines in node_ids.items():
                 if len(lines) > 1:
-                    violations.append(SchemaViolation(
-                        rule_name="DuplicateNodeID",
-                        message=f"Node ID '{node_id}' is duplicated across lines: {', '.join(map(str, lines))}. Node IDs must be as unique as my fingerprints!",
-                        context=node_id,
-                        line_number=lines[0], # Report first occurrence
-                        severity="error"
-                    ))
+                    violations.append(self._duplicate_node_violation(node_id, lines))
         
         # Rule 8: Diagram must start with a recognized diagram type keyword (No vagueness in my schematics!)
-        if not re.match(r'^\s*(graph|flowchart|sequenceDiagram|gantt|classDiagram|stateDiagram-v2|erDiagram|journey|gitGraph|pie|mindmap|quadrantChart|timeline)\s', mermaid_text, re.IGNORECASE):
-            first_line = mermaid_text.split('\n')[0].strip()
-            violations.append(SchemaViolation(
-                rule_name="InvalidDiagramType",
-                message="Mermaid diagram must commence with a recognized diagram type (e.g., 'graph', 'flowchart'). Anything else is chaos!",
-                context=first_line if len(first_line) < 100 else first_line[:97] + "...",
-                line_number=1,
-                severity="error"
-            ))
+        if not tokens.header:
+            violations.append(self._diagram_type_violation(mermaid_text.split('\n', 1)[0]))
         
         # Rule 9: Detection of unreachable nodes (A node without purpose is a philosophical travesty!)
         # This is a heuristic and only catches basic cases.
-        node_ids_in_diagram = set(m.group(1).strip() for m in self._node_id_pattern.finditer(mermaid_text) if m.group(1))
-        linked_to_nodes = set()
-        linked_from_nodes = set()
-        
-        # Collect all nodes that are explicitly linked to or from.
-        link_pattern = re.compile(r'(\w+)\s*(?:(?:-->|--|==>|~~~)\s*(?:".*?"\s*)?)\s*(\w+)')
-        for match in link_pattern.finditer(mermaid_text):
-            linked_from_nodes.add(match.group(1).strip())
-            linked_to_nodes.add(match.group(2).strip())
+        linked_from_nodes = {token.value for token in tokens.links}
+        linked_to_nodes = {token.target for token in tokens.links}
         
-        for node_id in node_ids_in_diagram:
-            # A node is reachable if it's explicitly linked to OR if it's the start of *any* link AND not explicitly linked *from* anywhere else (an entry point).
-            # This simplified heuristic for "unreachable" means it's not a source, nor a target.
-            is_source_node = node_id in linked_from_nodes
-            is_target_node = node_id in linked_to_nodes
-            
+        for node_id, lines in node_ids.items():
             # An "unreachable" node is one that is defined but never appears as the target of an arrow,
             # AND it's not a starting node that only has outgoing arrows.
             # This is a complex graph problem, so this heuristic focuses on "lonely" nodes.
-            if not is_source_node and not is_target_node:
-                 violations.append(SchemaViolation(
-                    rule_name="LonelyNode",
-                    message=f"Node '{node_id}' appears to be defined but is neither a source nor a target of any link. A solitary existence, without function!",
-                    context=node_id,
-                    line_number=[l for l in node_ids[node_id]][0],
-                    severity="warning"
-                ))
-            # Rule 10: Detection of simple cyclical paths (A loop of insanity!)
-            for match in self._diagram_flow_patterns["cyclical_path"].finditer(mermaid_text):
-                start_node = match.group(1).strip()
-                target_node = match.group('target').strip()
-                if start_node == target_node: # Self-referential loops are fine, if intentional.
-                    continue
-                violations.append(SchemaViolation(
-                    rule_name="CyclicalPath",
-                    message=f"Warning: A simple cyclical path detected between '{start_node}' and '{target_node}'. Ensure this recursive loop is intentional, not an infinite regress!",
-                    context=match.group(0),
-                    line_number=self._get_line_number(mermaid_text, match.start()),
-                    severity="info"
-                ))
+            if node_id not in linked_from_nodes and node_id not in linked_to_nodes:
+                violations.append(self._lonely_node_violation(node_id, lines[0]))
+
+        # Rule 10: Detection of simple cyclical paths (A loop of insanity!)
+        # A cycle requires two arrows on one line, so only such lines are searched.
+        arrows_per_line: Dict[int, int] = {}
+        arrow_idx = mermaid_text.find('-->')
+        while arrow_idx != -1:
+            line_num = tokens.line_number(arrow_idx)
+            arrows_per_line[line_num] = arrows_per_line.get(line_num, 0) + 1
+            arrow_idx = mermaid_text.find('-->', arrow_idx + 3)
+        for line_num, arrow_count in arrows_per_line.items():
+            if arrow_count >= 2:
+                line_start, line_end = tokens.line_index.line_bounds(line_num)
+                violations.extend(self._cycle_violations(mermaid_text, line_start, line_end, line_num))
 
         return violations
 
+    def _clean_label_content(self, label_content: str, replacement_char: str) -> str:
+        """
+        My cleaning ritual for a single label's content, shared by `transform_diagram` and the
+        single-pass `validate_and_transform`.
+
+        Args:
+            label_content (str): The raw label content.
+            replacement_char (str): The character to replace '(' and ')' with.
+
+        Returns:
+            str: The cleaned label content.
+        """
+        # 1. Remove/replace parentheses (My iron fist of format enforcement)
+        cleaned_content = label_content.replace('(', replacement_char).replace(')', replacement_char)
+        if replacement_char:
+            # Remove consecutive replacement chars if they result from the process (e.g., "word (a) (b)" -> "word__a__b_" -> "word_a_b")
+            cleaned_content = re.sub(f'{re.escape(replacement_char)}+', replacement_char, cleaned_content)
+            # Remove any leading/trailing replacement chars if the transformation results in them
+            cleaned_content = cleaned_content.strip(replacement_char)
+
+        # 2. Standardize case (e.g., Title Case) - a simple yet effective stroke of genius
+        # Avoid changing case if the label contains math, to preserve LaTeX commands (Mathematics bows to no title case!)
+        if not re.search(r'\$.*?\$|\\\(.*?\\\)|\\\[.*?\\\]', cleaned_content):
+            cleaned_content = cleaned_content.title() if self.strict_mode else cleaned_content
+
+        # 3. Truncate long labels if they are still too long after cleaning.
+        # Only truncate if the label is significantly over the limit, to avoid unnecessary ellipsis.
+        if len(cleaned_content) > self.MAX_LABEL_LENGTH + 10: # Allow some buffer before my discerning eye truncates
+            cleaned_content = cleaned_content[:self.MAX_LABEL_LENGTH - 3].strip() + "..."
+
+        # 4. Remove leading/trailing whitespace (A final flourish of perfection)
+        return cleaned_content.strip()
+
     def transform_diagram(self, mermaid_text: str, replacement_char: str = "") -> str:
         """
         Transforms a Mermaid diagram string by applying my standard label transformations:
@@ -657,27 +1476,7 @@ class MermaidSchemaEnforcer:
         
         def _clean_content_callback(match: re.Match, content_group_idx: int) -> str:
             original_content = match.group(content_group_idx)
-            
-            # 1. Remove/replace parentheses (My iron fist of format enforcement)
-            cleaned_content = original_content.replace('(', replacement_char).replace(')', replacement_char)
-            if replacement_char:
-                # Remove consecutive replacement chars if they result from the process (e.g., "word (a) (b)" -> "word__a__b_" -> "word_a_b")
-                cleaned_content = re.sub(f'{re.escape(replacement_char)}+', replacement_char, cleaned_content)
-                # Remove any leading/trailing replacement chars if the transformation results in them
-                cleaned_content = cleaned_content.strip(replacement_char)
-            
-            # 2. Standardize case (e.g., Title Case) - a simple yet effective stroke of genius
-            # Avoid changing case if the label contains math, to preserve LaTeX commands (Mathematics bows to no title case!)
-            if not re.search(r'\$.*?\$|\\\(.*?\\\)|\\\[.*?\\\]', cleaned_content):
-                cleaned_content = cleaned_content.title() if self.strict_mode else cleaned_content
-            
-            # 3. Truncate long labels if they are still too long after cleaning.
-            # Only truncate if the label is significantly over the limit, to avoid unnecessary ellipsis.
-            if len(cleaned_content) > self.MAX_LABEL_LENGTH + 10: # Allow some buffer before my discerning eye truncates
-                cleaned_content = cleaned_content[:self.MAX_LABEL_LENGTH - 3].strip() + "..."
-            
-            # 4. Remove leading/trailing whitespace (A final flourish of perfection)
-            cleaned_content = cleaned_content.strip()
+            cleaned_content = self._clean_label_content(original_content, replacement_char)
 
             # Reconstruct the string, replacing only the content part within the full match.
             # This ensures delimiters and other surrounding text are preserved, a subtle art.
@@ -726,17 +1525,7 @@ class MermaidSchemaEnforcer:
                         
                         if actual_content:
                             # Apply the same cleaning logic as the _clean_content_callback
-                            cleaned_inner_content = actual_content.replace('(', replacement_char).replace(')', replacement_char)
-                            if replacement_char:
-                                cleaned_inner_content = re.sub(f'{re.escape(replacement_char)}+', replacement_char, cleaned_inner_content)
-                                cleaned_inner_content = cleaned_inner_content.strip(replacement_char)
-                            
-                            if not re.search(r'\$.*?\$|\\\(.*?\\\)|\\\[.*?\\\]', cleaned_inner_content):
-                                cleaned_inner_content = cleaned_inner_content.title() if self.strict_mode else cleaned_inner_content
-                            
-                            if len(cleaned_inner_content) > self.MAX_LABEL_LENGTH + 10:
-                                cleaned_inner_content = cleaned_inner_content[:self.MAX_LABEL_LENGTH - 3].strip() + "..."
-                            cleaned_inner_content = cleaned_inner_content.strip()
+                            cleaned_inner_content = self._clean_label_content(actual_content, replacement_char)
 
                             # Reconstruct the shape content with the cleaned inner label
                             transformed_shape_content = original_shape_content.replace(actual_content, cleaned_inner_content)
@@ -806,6 +1595,241 @@ class MermaidSchemaEnforcer:
         """
         return "The elegance of this proof is self-evident to those with sufficient intellect."
 
+    def _math_label_violations(self, label_content: str, line_num: int) -> List[SchemaViolation]:
+        """
+        Applies my math Rules M1-M17 to the math segments of a single label. A segment's verdicts
+        are memoized by its text, since the same equations recur across labels and diagrams.
+
+        Args:
+            label_content (str): The raw label content, as lexed.
+            line_num (int): The 1-based line number on which the label appears.
+
+        Returns:
+            List[SchemaViolation]: The math violations of this label alone.
+        """
+        violations: List[SchemaViolation] = []
+        for math_segment_with_delimiters, _, _, _ in extract_math_segments(label_content):
+            verdicts = self._math_verdict_cache.get(math_segment_with_delimiters)
+            if verdicts is None:
+                verdicts = tuple((v.rule_name, v.message, v.severity, v.context)
+                                 for v in self._math_segment_violations(math_segment_with_delimiters))
+                if len(self._math_verdict_cache) >= self._VERDICT_CACHE_SIZE:
+                    del self._math_verdict_cache[next(iter(self._math_verdict_cache))]
+                self._math_verdict_cache[math_segment_with_delimiters] = verdicts
+            violations.extend(SchemaViolation(rule_name, message, severity, context, line_num)
+                              for rule_name, message, severity, context in verdicts)
+        return violations
+
+    def _math_segment_violations(self, math_segment_with_delimiters: str, line_num: int = -1) -> List[SchemaViolation]:
+        """
+        Applies my math Rules M1-M17 to one math segment (delimiters included), lexed once by `tokenize_math`
+        and walked once by `scan_math_rules`.
+
+        Args:
+            math_segment_with_delimiters (str): The full math segment, e.g. "$x^2$".
+            line_num (int): The line number to stamp on the violations.
+
+        Returns:
+            List[SchemaViolation]: The violations of this segment.
+        """
+        violations: List[SchemaViolation] = []
+        
+        # Rule M1: Mismatched inline delimiters (e.g., `$...\[` or `\(` inside `$...$`) - basic check for sanity.
+        # This focuses on the outer delimiters being consistent within the found segment.
+        if math_segment_with_delimiters.startswith('$') and math_segment_with_delimiters.endswith('$'):
+            if r'\(' in math_segment_with_delimiters or r'\[' in math_segment_with_delimiters:
+                violations.append(SchemaViolation(
+                    rule_name="MismatchedMathDelimiter",
+                    message="Possible mismatched LaTeX math delimiters detected within an inline block. A sign of sloppiness!",
+                    context=math_segment_with_delimiters,
+                    line_number=line_num,
+                    severity="warning"
+                ))
+        
+        # Extract the *core* math content for deeper checks, without delimiters (the true essence of the equation)
+        math_core = math_segment_with_delimiters.strip('$').strip(r'\[').strip(r'\]').strip(r'\(').strip(r'\)')
+        # Lexed once: the structural rules below read its environments, and the heuristic rules the facts
+        # established by a single walk over its tokens (both shared with my linter).
+        math_tokens = tokenize_math(math_core)
+        facts = scan_math_rules(math_core)
+
+        # Rule M2: Unclosed LaTeX environments (e.g., \begin{align} without \end{align}) - A structural collapse.
+        env_stack = []
+        for action, env_name in math_tokens.env_events:
+            if action == 'begin':
+                env_stack.append(env_name)
+            elif action == 'end':
+                if env_stack and env_stack[-1] == env_name:
+                    env_stack.pop()
+                else:
+                    violations.append(SchemaViolation(
+                        rule_name="MismatchedMathEnvironment",
+                        message=f"Mismatched or unexpected '\\end{{{env_name}}}' found within math block. Your environments must be perfectly balanced, as all things should be.",
+                        context=math_segment_with_delimiters,
+                        line_number=line_num,
+                        severity="error"
+                    ))
+        if env_stack:
+            for unclosed_env in env_stack:
+                violations.append(SchemaViolation(
+                    rule_name="UnclosedMathEnvironment",
+                    message=f"Unclosed LaTeX math environment '\\begin{{{unclosed_env}}}'. A fundamental breach of mathematical integrity.",
+                    context=math_segment_with_delimiters,
+                    line_number=line_num,
+                    severity="error"
+                ))
+
+        # Rule M3: Common LaTeX syntax errors - incomplete \frac (missing arguments) - A fraction of a problem.
+        if "incomplete_frac" in facts:
+           violations.append(SchemaViolation(
+               rule_name="IncompleteFraction",
+               message="Potentially incomplete \\frac command (missing second argument or malformed). Are you even trying?",
+               context=math_segment_with_delimiters,
+               line_number=line_num,
+               severity="warning"
+           ))
+        
+        # Rule M4: Too many consecutive `\` (often indicates copy-paste error or malformed escape) - A cascade of errors.
+        if "backslash_run" in facts:
+            violations.append(SchemaViolation(
+                rule_name="ExcessiveBackslashes",
+                message="Detected excessive consecutive backslashes `\\\\\\`, indicating a malformed command or a lack of understanding.",
+                context=math_segment_with_delimiters,
+                line_number=line_num,
+                severity="warning"
+            ))
+        
+        # Rule M5: Misplaced alignment ampersand '&' outside of alignment-like environments - Chaos in alignment.
+        # (A spaced '&' preceded by anything but a backslash, another '&' or a line break.)
+        if "spaced_ampersand" in facts and not math_tokens.environments & {'align', 'array', 'pmatrix', 'matrix'}:
+            violations.append(SchemaViolation(
+                rule_name="MisplacedAlignmentAmpersand",
+                message="Ampersand '&' used outside of an alignment-like environment (e.g., `align`, `array`). An egregious error in presentation.",
+                context=math_segment_with_delimiters,
+                line_number=line_num,
+                severity="warning"
+            ))
+        
+        # Rule M6: Spaces around fractions (often undesirable visually, or indicates typo) - Superfluous spacing.
+        if "two_argument_frac" in facts:
+            violations.append(SchemaViolation(
+                rule_name="SpacingAroundFraction",
+                message="Excessive spacing around \\frac arguments. Trim the fat from your equations, for clarity!",
+                context=math_segment_with_delimiters,
+                line_number=line_num,
+                severity="info"
+            ))
+        
+        # Rule M7: Plain text detected in math mode without `\text` or `\mathrm` - A semantic abomination.
+        # This heuristic looks for words of 2+ alphabetic characters in plain text (command names are not words)
+        # that are not followed by `\text`, `\mathrm` or specific math keywords.
+        if "plain_word" in facts and not math_tokens.environments & {'align', 'equation', 'gather', 'array', 'pmatrix', 'matrix'}:
+            violations.append(SchemaViolation(
+                rule_name="PlainTextInMathMode",
+                message="Plain text detected in math mode without `\\text{...}` or `\\mathrm{...}`. Your rendering is compromised, your meaning obscured!",
+                context=math_segment_with_delimiters,
+                line_number=line_num,
+                severity="info"
+            ))
+
+        # Rule M8: Use of `$$...$$` which is generally discouraged in LaTeX in favor of `\[...\]` - An outdated practice.
+        if math_segment_with_delimiters.startswith('$$') and math_segment_with_delimiters.endswith('$$'):
+             violations.append(SchemaViolation(
+                 rule_name="DiscouragedDisplayMathDelimiter",
+                 message="Use of `$$...$$` for display math is archaic; my preferred `\\[...\\\\]` is the superior, modern standard.",
+                 context=math_segment_with_delimiters,
+                 line_number=line_num,
+                 severity="info"
+             ))
+        
+        # Rule M9: `^` or `_` followed by single character without braces (e.g., `x^2` instead of `x^{2}`) - A fragile grouping.
+        if facts & {"naked_superscript", "naked_subscript", "superscripted_underscore"}:
+             violations.append(SchemaViolation(
+                 rule_name="NakedSupSubscript",
+                 message="Superscript/subscript applied to a single character without braces. My preference for `{...}` ensures mathematical robustness.",
+                 context=math_segment_with_delimiters,
+                 line_number=line_num,
+                 severity="warning"
+             ))
+
+        # Rule M10: Missing argument for commands like `\sqrt` - An incomplete root.
+        if "bare_sqrt" in facts: # A \sqrt followed, whitespace aside, by neither { nor [
+            violations.append(SchemaViolation(
+                rule_name="MissingSqrtArgument",
+                message="`\\sqrt` command appears to be missing its argument. A square root of nothing is a root of error!",
+                context=math_segment_with_delimiters,
+                line_number=line_num,
+                severity="error"
+            ))
+
+        # Rule M11: `\cdot` used for multiplication with numbers (prefer `\times` or implicit) - Subtlety of operators.
+        if "numeric_cdot" in facts:
+            violations.append(SchemaViolation(
+                rule_name="DotProductWithNumbers",
+                message="Consider `\\times` or implicit multiplication for numbers instead of `\\cdot`. My standards dictate precision!",
+                context=math_segment_with_delimiters,
+                line_number=line_num,
+                severity="info"
+            ))
+
+        # Rule M12: Raw `...` for ellipses in math (prefer `\ldots` or `\cdots`) - The true ellipses.
+        if "raw_ellipsis" in facts and not math_tokens.commands & {'ldots', 'cdots'}:
+            violations.append(SchemaViolation(
+                rule_name="RawEllipsesInMath",
+                message="Plain '...' used for ellipses in math mode; my refined taste demands `\\ldots` or `\\cdots`.",
+                context=math_segment_with_delimiters,
+                line_number=line_num,
+                severity="info"
+            ))
+
+        # Rule M13: `_` or `^` immediately following a non-command backslash (typo like `\_x`) - A misplaced modifier.
+        if "escaped_script" in facts:
+            violations.append(SchemaViolation(
+                rule_name="MalformedSupSubscriptCommand",
+                message="Malformed superscript/subscript command after a backslash. Check for typos, you amateur!",
+                context=math_segment_with_delimiters,
+                line_number=line_num,
+                severity="warning"
+            ))
+
+        # Rule M14: Use of `&` for alignment without proper environment (already covered by 5, but more specific for isolated `&`) - Orphaned alignment.
+        if "leading_ampersand" in facts and not math_tokens.environments & {'align', 'array', 'pmatrix', 'matrix'}:
+            violations.append(SchemaViolation(
+                rule_name="LeadingAlignmentAmpersand",
+                message="Ampersand '&' used at the beginning of a line for alignment without a proper environment. A structural anomaly!",
+                context=math_segment_with_delimiters,
+                line_number=line_num,
+                severity="warning"
+            ))
+        
+        # Rule M15: Missing trailing backslash for inline \(...\) - An unclosed thought.
+        if math_segment_with_delimiters.startswith(r'\(') and not math_segment_with_delimiters.endswith(r'\)'):
+            violations.append(SchemaViolation(
+                rule_name="UnclosedInlineMathDelimiter",
+                message="Inline math block started with `\\(` is not properly closed with `\\)`. Your mathematical expressions must be hermetic!",
+                context=math_segment_with_delimiters,
+                line_number=line_num,
+                severity="error"
+            ))
+
+        # Rule M16 (New Burvel Rule): Unnecessary grouping {} for single characters in superscripts/subscripts.
+        # E.g., x^{2} is fine, but {x}^{2} might be redundant.
+        # A more nuanced check for `x^{2}` vs `x^2` is often stylistic, and needs careful implementation to avoid
+        # flagging common good practices like `e^{i\pi}`. Skipped for now to avoid false positives, as my linter
+        # below is more comprehensive on this (its RedundantGrouping).
+
+        # Rule M17 (New Burvel Rule): Redundant `\mathrm{}` around single operator letters (e.g. `\mathrm{d}` in integrals)
+        if "differential_mathrm" in facts:
+            violations.append(SchemaViolation(
+                rule_name="RedundantMathrmForDifferentials",
+                message="`\\mathrm{d}` for differentials is often correct, but ensure it's not redundant in context, especially if `d` is meant as a variable. Consider using `\\text{d}` or `\\mathrm{d}` only where genuinely needed for upright rendering of operators.",
+                context=math_segment_with_delimiters,
+                line_number=line_num,
+                severity="info"
+            ))
+
+        return violations
+
     def validate_math_equations(self, mermaid_text: str) -> List[SchemaViolation]:
         """
         Validates embedded LaTeX math equations within Mermaid labels.
@@ -824,210 +1848,64 @@ class MermaidSchemaEnforcer:
         violations: List[SchemaViolation] = []
         
         # Extract all label contents first, then search for math within them.
+        line_index = LineIndex.for_text(mermaid_text)
         for label_content, label_start_idx, label_end_idx in self._extract_all_labels(mermaid_text, exclude_link_labels=False):
-            line_num = self._get_line_number(mermaid_text, label_start_idx)
-            
-            # Find all potential math sections within the label (inline $...$, display \[...\], \(...\), and my preferred \$\$...\$\$)
-            # This regex captures the full math string including delimiters for context.
-            math_segments_full = list(re.finditer(r'\$\$.*?\$\$|\$.*?\$|\\\[.*?\\\]|\\\((.*?)\\\)', label_content, re.DOTALL))
-            
-            for math_match in math_segments_full:
-                math_segment_with_delimiters = math_match.group(0)
-                
-                # Rule M1: Mismatched inline delimiters (e.g., `$...\[` or `\(` inside `$...$`) - basic check for sanity.
-                # This focuses on the outer delimiters being consistent within the found segment.
-                if math_segment_with_delimiters.startswith('$') and math_segment_with_delimiters.endswith('$'):
-                    if r'\(' in math_segment_with_delimiters or r'\[' in math_segment_with_delimiters:
-                        violations.append(SchemaViolation(
-                            rule_name="MismatchedMathDelimiter",
-                            message="Possible mismatched LaTeX math delimiters detected within an inline block. A sign of sloppiness!",
-                            context=math_segment_with_delimiters,
-                            line_number=line_num,
-                            severity="warning"
-                        ))
-                
-                # Extract the *core* math content for deeper checks, without delimiters (the true essence of the equation)
-                math_core = math_segment_with_delimiters.strip('$').strip(r'\[').strip(r'\]').strip(r'\(').strip(r'\)')
-
-                # Rule M2: Unclosed LaTeX environments (e.g., \begin{align} without \end{align}) - A structural collapse.
-                env_stack = []
-                for item in re.finditer(r'\\(begin|end)\{(\w+)\*?\}', math_core):
-                    action, env_name = item.groups()
-                    if action == 'begin':
-                        env_stack.append(env_name)
-                    elif action == 'end':
-                        if env_stack and env_stack[-1] == env_name:
-                            env_stack.pop()
-                        else:
-                            violations.append(SchemaViolation(
-                                rule_name="MismatchedMathEnvironment",
-                                message=f"Mismatched or unexpected '\\end{{{env_name}}}' found within math block. Your environments must be perfectly balanced, as all things should be.",
-                                context=math_segment_with_delimiters,
-                                line_number=line_num,
-                                severity="error"
-                            ))
-                if env_stack:
-                    for unclosed_env in env_stack:
-                        violations.append(SchemaViolation(
-                            rule_name="UnclosedMathEnvironment",
-                            message=f"Unclosed LaTeX math environment '\\begin{{{unclosed_env}}}'. A fundamental breach of mathematical integrity.",
-                            context=math_segment_with_delimiters,
-                            line_number=line_num,
-                            severity="error"
-                        ))
-
-                # Rule M3: Common LaTeX syntax errors - incomplete \frac (missing arguments) - A fraction of a problem.
-                if re.search(r'\\frac\s*\{.*?\}\s*(?!\{.*?\}|$)', math_core) or \
-                   re.search(r'\\frac\s*([^{]|$)', math_core):
-                   violations.append(SchemaViolation(
-                       rule_name="IncompleteFraction",
-                       message="Potentially incomplete \\frac command (missing second argument or malformed). Are you even trying?",
-                       context=math_segment_with_delimiters,
-                       line_number=line_num,
-                       severity="warning"
-                   ))
-                
-                # Rule M4: Too many consecutive `\` (often indicates copy-paste error or malformed escape) - A cascade of errors.
-                if re.search(r'\\\\{3,}', math_core):
-                    violations.append(SchemaViolation(
-                        rule_name="ExcessiveBackslashes",
-                        message="Detected excessive consecutive backslashes `\\\\\\`, indicating a malformed command or a lack of understanding.",
-                        context=math_segment_with_delimiters,
-                        line_number=line_num,
-                        severity="warning"
-                    ))
-                
-                # Rule M5: Misplaced alignment ampersand '&' outside of alignment-like environments - Chaos in alignment.
-                if re.search(r'(?<!\\)(?<!^|&|\n)\s&\s', math_core) and not re.search(r'\\begin\{(align|array|pmatrix|matrix)\*?\}', math_core):
-                    violations.append(SchemaViolation(
-                        rule_name="MisplacedAlignmentAmpersand",
-                        message="Ampersand '&' used outside of an alignment-like environment (e.g., `align`, `array`). An egregious error in presentation.",
-                        context=math_segment_with_delimiters,
-                        line_number=line_num,
-                        severity="warning"
-                    ))
-                
-                # Rule M6: Spaces around fractions (often undesirable visually, or indicates typo) - Superfluous spacing.
-                if re.search(r'\\frac\s*\{.*?\}\s*\{.*?\}\s*', math_core):
-                    violations.append(SchemaViolation(
-                        rule_name="SpacingAroundFraction",
-                        message="Excessive spacing around \\frac arguments. Trim the fat from your equations, for clarity!",
-                        context=math_segment_with_delimiters,
-                        line_number=line_num,
-                        severity="info"
-                    ))
-                
-                # Rule M7: Plain text detected in math mode without `\text` or `\mathrm` - A semantic abomination.
-                # This heuristic looks for sequences of 2+ alphabetic characters not preceded by a backslash or specific math keywords.
-                if re.search(r'\b[a-zA-Z]{2,}\b(?!\s*\\(text|mathrm|textbf|textit|mathbb|mathcal|prime|ldots|forall|exists|approx|sum|int|lim|log|sin|cos|tan|det|gcd|max|min|arg|sup|inf|Pr|exp|ln|deg|hom|ker|dim|rank|Tr)\b)', math_core) and \
-                   not re.search(r'\\begin\{(align|equation|gather|array|pmatrix|matrix)\*?\}', math_core):
-                    violations.append(SchemaViolation(
-                        rule_name="PlainTextInMathMode",
-                        message="Plain text detected in math mode without `\\text{...}` or `\\mathrm{...}`. Your rendering is compromised, your meaning obscured!",
-                        context=math_segment_with_delimiters,
-                        line_number=line_num,
-                        severity="info"
-                    ))
-
-                # Rule M8: Use of `$$...$$` which is generally discouraged in LaTeX in favor of `\[...\]` - An outdated practice.
-                if math_segment_with_delimiters.startswith('$$') and math_segment_with_delimiters.endswith('$$'):
-                     violations.append(SchemaViolation(
-                         rule_name="DiscouragedDisplayMathDelimiter",
-                         message="Use of `$$...$$` for display math is archaic; my preferred `\\[...\\\\]` is the superior, modern standard.",
-                         context=math_segment_with_delimiters,
-                         line_number=line_num,
-                         severity="info"
-                     ))
-                
-                # Rule M9: `^` or `_` followed by single character without braces (e.g., `x^2` instead of `x^{2}`) - A fragile grouping.
-                if re.search(r'([^_]|^)\^[a-zA-Z0-9_](?![{])', math_core) or re.search(r'([^_]|^)\_[a-zA-Z0-9](?![{])', math_core):
-                     violations.append(SchemaViolation(
-                         rule_name="NakedSupSubscript",
-                         message="Superscript/subscript applied to a single character without braces. My preference for `{...}` ensures mathematical robustness.",
-                         context=math_segment_with_delimiters,
-                         line_number=line_num,
-                         severity="warning"
-                     ))
-
-                # Rule M10: Missing argument for commands like `\sqrt` - An incomplete root.
-                if re.search(r'\\sqrt\s*(?![[{])', math_core): # Checks for \sqrt not immediately followed by { or [
-                    violations.append(SchemaViolation(
-                        rule_name="MissingSqrtArgument",
-                        message="`\\sqrt` command appears to be missing its argument. A square root of nothing is a root of error!",
-                        context=math_segment_with_delimiters,
-                        line_number=line_num,
-                        severity="error"
-                    ))
-
-                # Rule M11: `\cdot` used for multiplication with numbers (prefer `\times` or implicit) - Subtlety of operators.
-                if re.search(r'[0-9]\s*\\cdot\s*[0-9]', math_core):
-                    violations.append(SchemaViolation(
-                        rule_name="DotProductWithNumbers",
-                        message="Consider `\\times` or implicit multiplication for numbers instead of `\\cdot`. My standards dictate precision!",
-                        context=math_segment_with_delimiters,
-                        line_number=line_num,
-                        severity="info"
-                    ))
-
-                # Rule M12: Raw `...` for ellipses in math (prefer `\ldots` or `\cdots`) - The true ellipses.
-                if re.search(r'(?<!\\)\.{3}', math_core) and not re.search(r'\\ldots|\\cdots', math_core):
-                    violations.append(SchemaViolation(
-                        rule_name="RawEllipsesInMath",
-                        message="Plain '...' used for ellipses in math mode; my refined taste demands `\\ldots` or `\\cdots`.",
-                        context=math_segment_with_delimiters,
-                        line_number=line_num,
-                        severity="info"
-                    ))
-
-                # Rule M13: `_` or `^` immediately following a non-command backslash (typo like `\_x`) - A misplaced modifier.
-                if re.search(r'\\(?!\w+)\s*[_^]', math_core):
-                    violations.append(SchemaViolation(
-                        rule_name="MalformedSupSubscriptCommand",
-                        message="Malformed superscript/subscript command after a backslash. Check for typos, you amateur!",
-                        context=math_segment_with_delimiters,
-                        line_number=line_num,
-                        severity="warning"
-                    ))
+            line_num = line_index.line_number(label_start_idx)
+            violations.extend(self._math_label_violations(label_content, line_num))
 
-                # Rule M14: Use of `&` for alignment without proper environment (already covered by 5, but more specific for isolated `&`) - Orphaned alignment.
-                if re.search(r'^\s*&', math_core, re.MULTILINE) and not re.search(r'\\begin\{(align|array|pmatrix|matrix)\*?\}', math_core):
-                    violations.append(SchemaViolation(
-                        rule_name="LeadingAlignmentAmpersand",
-                        message="Ampersand '&' used at the beginning of a line for alignment without a proper environment. A structural anomaly!",
-                        context=math_segment_with_delimiters,
-                        line_number=line_num,
-                        severity="warning"
-                    ))
-                
-                # Rule M15: Missing trailing backslash for inline \(...\) - An unclosed thought.
-                if math_segment_with_delimiters.startswith(r'\(') and not math_segment_with_delimiters.endswith(r'\)'):
-                    violations.append(SchemaViolation(
-                        rule_name="UnclosedInlineMathDelimiter",
-                        message="Inline math block started with `\\(` is not properly closed with `\\)`. Your mathematical expressions must be hermetic!",
-                        context=math_segment_with_delimiters,
-                        line_number=line_num,
-                        severity="error"
-                    ))
+        return violations
 
-                # Rule M16 (New Burvel Rule): Unnecessary grouping {} for single characters in superscripts/subscripts.
-                # E.g., x^{2} is fine, but {x}^{2} might be redundant. For simplicity, focusing on ^{x}
-                if re.search(r'(\^|\_)\{([a-zA-Z0-9])\}', math_core): # x^{2} is fine, this detects x^{a} or a^{2}
-                    # A more nuanced check for `x^{2}` vs `x^2` is often stylistic. This checks for truly redundant `{...}`.
-                    # This rule needs careful implementation to avoid flagging common good practices like `e^{i\pi}`.
-                    # Skipping for now to avoid false positives, as my linter below is more comprehensive on this.
-                    pass 
+    def _transform_math_segment(self, math_segment: str, remove_dollars: bool, standardize_environments: bool) -> str:
+        """
+        Applies my math transformations (My internal logic engine) to one math segment, delimiters included.
+        Results are memoized per segment and options, for the same equations recur across labels.
+        """
+        key = (math_segment, remove_dollars, standardize_environments)
+        cached = self._math_transform_cache.get(key)
+        if cached is not None:
+            return cached
+        current_math = math_segment
+
+        # Transformation T1: Replace $...$ with \(...\) (The modern decree!)
+        if remove_dollars:
+            if current_math.startswith('$') and current_math.endswith('$') and len(current_math) > 1:
+                current_math = r'\(' + current_math[1:-1] + r'\)'
+        
+        # Transformation T2: Standardize environments and other stylistic changes (Bringing order to chaos!)
+        if standardize_environments:
+            # Replace \begin{equation*} with \begin{equation} etc. (Uniformity is key)
+            current_math = re.sub(r'\\begin\{(align|equation|gather)\*?\}', r'\\begin{\1}', current_math)
+            current_math = re.sub(r'\\end\{(align|equation|gather)\*?\}', r'\\end{\1}', current_math)
+            
+            # Ensure common formatting for fractions: no excessive spaces around args (Efficiency of notation)
+            current_math = re.sub(r'\\frac\s*\{(?P<num>.*?)\}\s*\{(?P<den>.*?)\}', r'\\frac{\g<num>}{\g<den>}', current_math)
+            
+            # Replace `...` with `\ldots` for proper math ellipses (A matter of erudition)
+            current_math = re.sub(r'(?<!\\)\.{3}', r'\\ldots', current_math)
+            
+            # Replace simple `'` with `\prime` for prime notation (careful, avoid contractions) (Precision for differentiation)
+            current_math = re.sub(r'(\w)\'(?!\w)', r'\1\\prime', current_math)
 
-                # Rule M17 (New Burvel Rule): Redundant `\mathrm{}` around single operator letters (e.g. `\mathrm{d}` in integrals)
-                if re.search(r'\\mathrm\{[dDij]\}\s*x', math_core):
-                    violations.append(SchemaViolation(
-                        rule_name="RedundantMathrmForDifferentials",
-                        message="`\\mathrm{d}` for differentials is often correct, but ensure it's not redundant in context, especially if `d` is meant as a variable. Consider using `\\text{d}` or `\\mathrm{d}` only where genuinely needed for upright rendering of operators.",
-                        context=math_segment_with_delimiters,
-                        line_number=line_num,
-                        severity="info"
-                    ))
+            # Wrap naked superscripts/subscripts with braces if they apply to more than one char visually
+            # (Preventing ambiguity, a hallmark of my design)
+            current_math = re.sub(r'(\^|\_)([a-zA-Z0-9]{2,})(?!\{)', r'\1{\2}', current_math)
+            current_math = re.sub(r'(\^|\_)([a-zA-Z0-9])([a-zA-Z0-9])', r'\1{\2}\3', current_math) # x^2y -> x^{2}y (simple, imperfect, but a step towards order)
 
-        return violations
+            # Ensure display math uses \[...\] over $$...$$ (My modern preference)
+            if current_math.startswith('$$') and current_math.endswith('$$'):
+                current_math = r'\[' + current_math[2:-2] + r'\]'
+            
+            # Add \quad for consistency after certain operators or at line breaks in align (Burvel's aesthetic)
+            current_math = re.sub(r'(\\qquad|\\quad)\\s*\\\\\s*(\\quad|\\qquad)?', r'\\qquad\\\\\n\\qquad', current_math)
+            current_math = re.sub(r'([+\-=])\s*$', r'\1\\quad', current_math, flags=re.MULTILINE)
+
+            # Ensure upright 'd' for differentials (My scientific dictate)
+            current_math = re.sub(r'(\s)d([A-Za-z])', r'\1\\mathrm{d}\2', current_math) # e.g. dx -> \mathrm{d}x, if not already \text or \mathrm
+            
+        if len(self._math_transform_cache) >= self._VERDICT_CACHE_SIZE:
+            del self._math_transform_cache[next(iter(self._math_transform_cache))]
+        self._math_transform_cache[key] = current_math
+        return current_math
 
     def transform_math_equations(self, mermaid_text: str, remove_dollars: bool = False, standardize_environments: bool = False) -> str:
         """
@@ -1079,60 +1957,16 @@ class MermaidSchemaEnforcer:
             # This will hold the content after math-specific transformations
             transformed_content_in_label = original_content
 
-            # Define specific math transformation functions to apply (My internal logic engine)
-            def _apply_math_transforms(math_segment: str) -> str:
-                current_math = math_segment
-
-                # Transformation T1: Replace $...$ with \(...\) (The modern decree!)
-                if remove_dollars:
-                    if current_math.startswith('$') and current_math.endswith('$') and len(current_math) > 1:
-                        current_math = r'\(' + current_math[1:-1] + r'\)'
-                
-                # Transformation T2: Standardize environments and other stylistic changes (Bringing order to chaos!)
-                if standardize_environments:
-                    # Replace \begin{equation*} with \begin{equation} etc. (Uniformity is key)
-                    current_math = re.sub(r'\\begin\{(align|equation|gather)\*?\}', r'\\begin{\1}', current_math)
-                    current_math = re.sub(r'\\end\{(align|equation|gather)\*?\}', r'\\end{\1}', current_math)
-                    
-                    # Ensure common formatting for fractions: no excessive spaces around args (Efficiency of notation)
-                    current_math = re.sub(r'\\frac\s*\{(?P<num>.*?)\}\s*\{(?P<den>.*?)\}', r'\\frac{\g<num>}{\g<den>}', current_math)
-                    
-                    # Replace `...` with `\ldots` for proper math ellipses (A matter of erudition)
-                    current_math = re.sub(r'(?<!\\)\.{3}', r'\\ldots', current_math)
-                    
-                    # Replace simple `'` with `\prime` for prime notation (careful, avoid contractions) (Precision for differentiation)
-                    current_math = re.sub(r'(\w)\'(?!\w)', r'\1\\prime', current_math)
-
-                    # Wrap naked superscripts/subscripts with braces if they apply to more than one char visually
-                    # (Preventing ambiguity, a hallmark of my design)
-                    current_math = re.sub(r'(\^|\_)([a-zA-Z0-9]{2,})(?!\{)', r'\1{\2}', current_math)
-                    current_math = re.sub(r'(\^|\_)([a-zA-Z0-9])([a-zA-Z0-9])', r'\1{\2}\3', current_math) # x^2y -> x^{2}y (simple, imperfect, but a step towards order)
-
-                    # Ensure display math uses \[...\] over $$...$$ (My modern preference)
-                    if current_math.startswith('$$') and current_math.endswith('$$'):
-                        current_math = r'\[' + current_math[2:-2] + r'\]'
-                    
-                    # Add \quad for consistency after certain operators or at line breaks in align (Burvel's aesthetic)
-                    current_math = re.sub(r'(\\qquad|\\quad)\\s*\\\\\s*(\\quad|\\qquad)?', r'\\qquad\\\\\n\\qquad', current_math)
-                    current_math = re.sub(r'([+\-=])\s*$', r'\1\\quad', current_math, flags=re.MULTILINE)
-
-                    # Ensure upright 'd' for differentials (My scientific dictate)
-                    current_math = re.sub(r'(\s)d([A-Za-z])', r'\1\\mathrm{d}\2', current_math) # e.g. dx -> \mathrm{d}x, if not already \text or \mathrm
-                    
-                return current_math
-            
             # Now, apply these transformations to each math segment found within this label.
             # This requires searching for math delimiters within `transformed_content_in_label`.
             # Iterate in reverse order on math matches within the label to safely modify the string.
-            math_segments_in_label_matches = list(re.finditer(r'\$\$(.*?)\$\$|\$(.*?)\$|\\\[(.*?)\\\]|\\\((.*?)\\\)', transformed_content_in_label, re.DOTALL))
-            for math_sub_match in reversed(math_segments_in_label_matches):
-                original_math_segment = math_sub_match.group(0)
-                transformed_math_segment = _apply_math_transforms(original_math_segment)
+            for original_math_segment, _, segment_start, segment_end in reversed(extract_math_segments(transformed_content_in_label)):
+                transformed_math_segment = self._transform_math_segment(original_math_segment, remove_dollars, standardize_environments)
                 
                 # Replace the original math segment with the transformed one within the label's content
-                transformed_content_in_label = transformed_content_in_label[:math_sub_match.start()] + \
+                transformed_content_in_label = transformed_content_in_label[:segment_start] + \
                                                transformed_math_segment + \
-                                               transformed_content_in_label[math_sub_match.end():]
+                                               transformed_content_in_label[segment_end:]
 
             # After all math transformations within this label are done, replace the entire label block
             new_full_match_str = original_full_match_str.replace(original_content, transformed_content_in_label)
@@ -1143,87 +1977,104 @@ class MermaidSchemaEnforcer:
         return transformed_text
 
 
-    def validate_claim_references(self, mermaid_text: str) -> List[SchemaViolation]:
+    def _claim_label_violations(self, label_content: str, line_num: int) -> List[SchemaViolation]:
         """
-        Validates the format of patent claim references within Mermaid labels.
-        Ensures they follow a consistent pattern, e.g., "[Claim X]" or "Claim X",
-        a structure I designed for unmistakable clarity.
+        Applies my claim reference Rules C1-C4 to a single label.
 
         Args:
-            mermaid_text (str): The Mermaid diagram source text.
+            label_content (str): The raw label content, as lexed.
+            line_num (int): The 1-based line number on which the label appears.
 
         Returns:
-            List[SchemaViolation]: A list of claim reference violation messages, each a mark of deviation.
+            List[SchemaViolation]: The claim reference violations of this label alone.
         """
         violations: List[SchemaViolation] = []
 
-        for label_content, label_start_idx, label_end_idx in self._extract_all_labels(mermaid_text, exclude_link_labels=False):
-            line_num = self._get_line_number(mermaid_text, label_start_idx)
-
-            # Find all potential claim references within the label using my predefined pattern
-            claim_matches = self.CLAIM_REFERENCE_PATTERN.finditer(label_content)
+        # Find all potential claim references within the label using my predefined pattern
+        claim_matches = self.CLAIM_REFERENCE_PATTERN.finditer(label_content)
 
-            for match in claim_matches:
-                full_match = match.group(0)
-                claim_number_str = match.group(1)
-                
-                # Rule C1: Must be encased in square brackets if strict_mode is True (My mandate for explicit reference)
-                if self.strict_mode and not (full_match.startswith('[') and full_match.endswith(']')):
+        for match in claim_matches:
+            full_match = match.group(0)
+            claim_number_str = match.group(1)
+            
+            # Rule C1: Must be encased in square brackets if strict_mode is True (My mandate for explicit reference)
+            if self.strict_mode and not (full_match.startswith('[') and full_match.endswith(']')):
+                violations.append(SchemaViolation(
+                    rule_name="ClaimReferenceFormat",
+                    message=f"Claim reference '{full_match}' must be enclosed in square brackets (e.g., [Claim {claim_number_str}]). Do not deviate from my established standard!",
+                    context=full_match,
+                    line_number=line_num,
+                    severity="warning"
+                ))
+            
+            # Rule C2: Claim number must be a valid positive integer (No vague numerology!)
+            try:
+                num = int(claim_number_str)
+                if num <= 0:
                     violations.append(SchemaViolation(
-                        rule_name="ClaimReferenceFormat",
-                        message=f"Claim reference '{full_match}' must be enclosed in square brackets (e.g., [Claim {claim_number_str}]). Do not deviate from my established standard!",
+                        rule_name="InvalidClaimNumber",
+                        message=f"Claim number '{claim_number_str}' must be a positive integer. Your numbering system is flawed!",
                         context=full_match,
                         line_number=line_num,
-                        severity="warning"
+                        severity="error"
                     ))
-                
-                # Rule C2: Claim number must be a valid positive integer (No vague numerology!)
-                try:
-                    num = int(claim_number_str)
-                    if num <= 0:
-                        violations.append(SchemaViolation(
-                            rule_name="InvalidClaimNumber",
-                            message=f"Claim number '{claim_number_str}' must be a positive integer. Your numbering system is flawed!",
-                            context=full_match,
-                            line_number=line_num,
-                            severity="error"
-                        ))
-                except ValueError:
+            except ValueError:
+                violations.append(SchemaViolation(
+                    rule_name="InvalidClaimNumber",
+                    message=f"Claim number '{claim_number_str}' is not a valid integer. This is basic arithmetic, my dear fellow!",
+                    context=full_match,
+                    line_number=line_num,
+                    severity="error"
+                ))
+            
+            # Rule C3: No extra text directly adjacent to the claim number inside brackets (e.g., [Claim 1.extra]) - Purity of reference.
+            if full_match.startswith('[') and full_match.endswith(']'):
+                content_in_brackets = full_match[1:-1].strip()
+                if not re.fullmatch(r'(?:Claim|CLAIM)\s+\d+', content_in_brackets):
                     violations.append(SchemaViolation(
-                        rule_name="InvalidClaimNumber",
-                        message=f"Claim number '{claim_number_str}' is not a valid integer. This is basic arithmetic, my dear fellow!",
+                        rule_name="ClaimReferencePunctuation",
+                        message=f"Claim reference '{full_match}' contains extraneous characters inside brackets or invalid spacing. This obfuscates my patent claims!",
                         context=full_match,
                         line_number=line_num,
-                        severity="error"
+                        severity="warning"
                     ))
-                
-                # Rule C3: No extra text directly adjacent to the claim number inside brackets (e.g., [Claim 1.extra]) - Purity of reference.
-                if full_match.startswith('[') and full_match.endswith(']'):
-                    content_in_brackets = full_match[1:-1].strip()
-                    if not re.fullmatch(r'(?:Claim|CLAIM)\s+\d+', content_in_brackets):
+            
+            # Rule C4: Cross-reference integrity: Ensure referenced claim exists in EXAMPLE_PATENT_CLAIMS (If strict_mode is True)
+            if self.strict_mode:
+                referenced_claim_numbers = {int(re.search(r'^\s*(\d+)\.', claim_text).group(1)) for claim_text in self.EXAMPLE_PATENT_CLAIMS if re.match(r'^\s*\d+\.', claim_text)}
+                try:
+                    claim_num = int(claim_number_str)
+                    if claim_num not in referenced_claim_numbers:
                         violations.append(SchemaViolation(
-                            rule_name="ClaimReferencePunctuation",
-                            message=f"Claim reference '{full_match}' contains extraneous characters inside brackets or invalid spacing. This obfuscates my patent claims!",
+                            rule_name="UnresolvedClaimReference",
+                            message=f"Claim '{claim_num}' referenced in '{full_match}' does not exist in the defined list of example patent claims. A phantom reference!",
                             context=full_match,
                             line_number=line_num,
-                            severity="warning"
+                            severity="error"
                         ))
-                
-                # Rule C4: Cross-reference integrity: Ensure referenced claim exists in EXAMPLE_PATENT_CLAIMS (If strict_mode is True)
-                if self.strict_mode:
-                    referenced_claim_numbers = {int(re.search(r'^\s*(\d+)\.', claim_text).group(1)) for claim_text in self.EXAMPLE_PATENT_CLAIMS if re.match(r'^\s*\d+\.', claim_text)}
-                    try:
-                        claim_num = int(claim_number_str)
-                        if claim_num not in referenced_claim_numbers:
-                            violations.append(SchemaViolation(
-                                rule_name="UnresolvedClaimReference",
-                                message=f"Claim '{claim_num}' referenced in '{full_match}' does not exist in the defined list of example patent claims. A phantom reference!",
-                                context=full_match,
-                                line_number=line_num,
-                                severity="error"
-                            ))
-                    except ValueError:
-                        pass # Already caught by C2
+                except ValueError:
+                    pass # Already caught by C2
+
+        return violations
+
+    def validate_claim_references(self, mermaid_text: str) -> List[SchemaViolation]:
+        """
+        Validates the format of patent claim references within Mermaid labels.
+        Ensures they follow a consistent pattern, e.g., "[Claim X]" or "Claim X",
+        a structure I designed for unmistakable clarity.
+
+        Args:
+            mermaid_text (str): The Mermaid diagram source text.
+
+        Returns:
+            List[SchemaViolation]: A list of claim reference violation messages, each a mark of deviation.
+        """
+        violations: List[SchemaViolation] = []
+
+        line_index = LineIndex.for_text(mermaid_text)
+        for label_content, label_start_idx, label_end_idx in self._extract_all_labels(mermaid_text, exclude_link_labels=False):
+            line_num = line_index.line_number(label_start_idx)
+            violations.extend(self._claim_label_violations(label_content, line_num))
 
         return violations
 
@@ -1243,8 +2094,9 @@ class MermaidSchemaEnforcer:
         """
         extracted_claims: Dict[int, List[Tuple[str, int]]] = {}
 
+        line_index = LineIndex.for_text(mermaid_text)
         for label_content, label_start_idx, label_end_idx in self._extract_all_labels(mermaid_text, exclude_link_labels=False):
-            line_num = self._get_line_number(mermaid_text, label_start_idx)
+            line_num = line_index.line_number(label_start_idx)
             
             for match in self.CLAIM_REFERENCE_PATTERN.finditer(label_content):
                 claim_number_str = match.group(1)
@@ -1280,20 +2132,53 @@ class MermaidSchemaEnforcer:
         all_violations.extend(self.validate_claim_references(mermaid_text))
         
         if enable_math_linter:
-            math_linter = MermaidMathSyntaxLinter()
-            all_violations.extend(math_linter.lint_mermaid_math(mermaid_text))
+            if self._math_linter is None:
+                self._math_linter = MermaidMathSyntaxLinter()
+            # The linter reads the labels off the token stream my rules above have already lexed.
+            all_violations.extend(self._math_linter.lint_mermaid_math(mermaid_text, self.tokenize_diagram(mermaid_text)))
 
         return all_violations
 
+    def open_incremental(self, mermaid_text: str, enable_math_linter: bool = False) -> "IncrementalMermaidDocument":
+        """
+        Validates a diagram once and keeps it open for incremental re-validation as it is edited,
+        for editors that would otherwise call `enforce_all_rules` on every keystroke.
+
+        Args:
+            mermaid_text (str): The Mermaid diagram source text.
+            enable_math_linter (bool): As for `enforce_all_rules`.
+
+        Returns:
+            IncrementalMermaidDocument: The open document; see its `apply_edit` (which returns a
+                                        `ViolationDelta`) and `violations`.
+        """
+        return IncrementalMermaidDocument(self, mermaid_text, enable_math_linter=enable_math_linter)
+
     def apply_all_transformations(self, mermaid_text: str,
                                   label_replacement_char: str = "",
                                   math_remove_dollars: bool = False,
-                                  math_standardize_environments: bool = False) -> str:
+                                  math_standardize_environments: bool = False,
+                                  single_pass: bool = True) -> str:
         """
         Applies all available transformations to a Mermaid diagram, including
         general label cleaning and math equation standardization.
         This is my "Perfecting Touch" to your humble diagrams.
 
+        By default the labels found by `tokenize_diagram` are rewritten in one sweep, exactly as in
+        `validate_and_transform`, in time linear in the diagram. `single_pass=False` selects the legacy
+        chain - `transform_diagram`, then `transform_math_equations` - which re-matches every label
+        pattern against the text it is already rewriting and splices the whole text once per label,
+        so it grows quadratically (over a minute on a 50,000-line diagram). Its output also differs
+        wherever those matches overlap; on my example charts:
+        - With `math_remove_dollars`, `F1[Figure 1 - Diagram ($E=mc^2$)];` becomes
+          `...(\\(E=mc^2\\))])])];` under the legacy chain: the round, square and node-id patterns all
+          match it, and after the innermost splice lengthens the math the outer splices reuse stale
+          offsets, duplicating the `)]` tail.
+        - `Patent Filing ($T_{submit} = 2022-03-15$)` becomes `T_{Submit}` under the legacy chain,
+          because the `{...}` label pattern matches `{submit}` inside the math and title-cases it
+          as a label of its own.
+        The single-pass rewriter edits each label my rules judged exactly once and does neither.
+
         Args:
             mermaid_text (str): The Mermaid diagram source text.
             label_replacement_char (str): The character to replace '(' and ')' in general labels.
@@ -1301,10 +2186,16 @@ class MermaidSchemaEnforcer:
             math_remove_dollars (bool): If True, replaces inline `$...$` with `\(...\)`.
             math_standardize_environments (bool): If True, attempts to simplify/standardize
                                                   certain LaTeX environments within math.
+            single_pass (bool): If True (the default), rewrites the labels found by `tokenize_diagram`
+                                in one sweep. If False, uses the legacy chain described above.
 
         Returns:
             str: The transformed Mermaid diagram text. A refined work of art, by my hand.
         """
+        if single_pass:
+            return self._rewrite_labels(self.tokenize_diagram(mermaid_text), label_replacement_char,
+                                        math_remove_dollars, math_standardize_environments)
+
         transformed_text = self.transform_diagram(mermaid_text, replacement_char=label_replacement_char)
         transformed_text = self.transform_math_equations(transformed_text,
                                                          remove_dollars=math_remove_dollars,
@@ -1313,6 +2204,74 @@ class MermaidSchemaEnforcer:
         # beyond what `transform_diagram` already handles for general labels.
         return transformed_text
 
+    def validate_and_transform(self, mermaid_text: str, enable_math_linter: bool = False,
+                               label_replacement_char: str = "",
+                               math_remove_dollars: bool = False,
+                               math_standardize_environments: bool = False) -> Tuple[List[SchemaViolation], str]:
+        """
+        My 'Final Judgment' and my 'Perfecting Touch' in a single pass: the diagram is lexed once,
+        every rule of `enforce_all_rules` reads that token stream, and the same label tokens are
+        then rewritten in place - label cleaning and math standardization applied to each as one
+        edit - with the output assembled by a single join.
+
+        Like `apply_all_transformations` (and unlike its legacy `single_pass=False` chain, which re-matches
+        every label pattern against the progressively rewritten text), the labels edited here are exactly the labels my rules judged
+        (link labels aside, as ever); where a label nests inside another, the outer one is rewritten.
+
+        Args:
+            mermaid_text (str): The Mermaid diagram source text.
+            enable_math_linter (bool): As for `enforce_all_rules`.
+            label_replacement_char (str): As for `apply_all_transformations`.
+            math_remove_dollars (bool): As for `apply_all_transformations`.
+            math_standardize_environments (bool): As for `apply_all_transformations`.
+
+        Returns:
+            Tuple[List[SchemaViolation], str]: The violations of the original text, as reported by
+                                               `enforce_all_rules`, and the transformed text.
+        """
+        tokenized = self.tokenize_diagram(mermaid_text)
+        violations = self.validate_diagram(mermaid_text)
+        violations.extend(self.validate_math_equations(mermaid_text))
+        violations.extend(self.validate_claim_references(mermaid_text))
+
+        if enable_math_linter:
+            if self._math_linter is None:
+                self._math_linter = MermaidMathSyntaxLinter()
+            # The linter reads every label, link labels included, straight off my token stream.
+            for token in tokenized.labels:
+                violations.extend(self._math_linter.lint_label_math(token.value, token.line_number))
+
+        transformed_text = self._rewrite_labels(tokenized, label_replacement_char,
+                                                math_remove_dollars, math_standardize_environments)
+        return violations, transformed_text
+
+    def _rewrite_labels(self, tokenized: TokenizedDiagram, replacement_char: str,
+                        remove_dollars: bool, standardize_environments: bool) -> str:
+        """
+        Rewrites every (non-link) label token of a lexed diagram: the label is cleaned, then each of its
+        math segments transformed. The untouched stretches between labels and the rewritten labels are
+        collected as pieces and joined once.
+        """
+        text = tokenized.text
+        transform_math = remove_dollars or standardize_environments
+        pieces: List[str] = []
+        position = 0
+        for label_content, start, end in tokenized.label_spans():
+            if start < position:  # Nested within a label already rewritten.
+                continue
+            pieces.append(text[position:start])
+            cleaned_content = self._clean_label_content(label_content, replacement_char)
+            segment_position = 0
+            if transform_math:
+                for math_segment, _, segment_start, segment_end in extract_math_segments(cleaned_content):
+                    pieces.append(cleaned_content[segment_position:segment_start])
+                    pieces.append(self._transform_math_segment(math_segment, remove_dollars, standardize_environments))
+                    segment_position = segment_end
+            pieces.append(cleaned_content[segment_position:])
+            position = end
+        pieces.append(text[position:])
+        return ''.join(pieces)
+
 
 class MermaidMathSyntaxLinter:
     """
@@ -1325,6 +2284,9 @@ class MermaidMathSyntaxLinter:
     mathematical expression within a Mermaid diagram dares to defy the
     sacred tenets of LaTeX. Your equations will weep tears of joy for their newfound perfection.
     """
+    # How many distinct math segments keep their memoized verdicts before the oldest is forgotten.
+    _VERDICT_CACHE_SIZE = 4096
+
     def __init__(self):
         # List of known LaTeX math commands (for checking against typos or unknown commands)
         # Expansively curated by Burvel, covering the known universe of mathematical symbology.
@@ -1377,6 +2339,15 @@ class MermaidMathSyntaxLinter:
             'align', 'equation', 'gather', 'array', 'pmatrix', 'matrix', 'cases', 'rcases', 'Bmatrix',
             'vmatrix', 'Vmatrix', 'multiline', 'flalign', 'alignat'
         }
+        # My authoritative enforcer for label extraction, created on first use.
+        self._label_enforcer: Union[MermaidSchemaEnforcer, None] = None
+        # A command with its optional * and [..] and up to two {..} arguments, matched at each command token.
+        self._command_arg_pattern = re.compile(r'\\(\w+)(\*?)(?:\[(.*?)\])?(?:(\{.+?\}))?(?:(\{.+?\}))?')
+        self._word_char = re.compile(r'\w')
+        # Operators that may legitimately carry `\limits` or `\nolimits`.
+        self.large_operators = {'sum', 'int', 'prod', 'bigcup', 'bigcap', 'lim'}
+        # Verdicts of `lint_math_segment`, memoized per segment text.
+        self._segment_verdicts: Dict[str, Tuple[Tuple[str, str, str, str], ...]] = {}
 
     def _get_balance_violations(self, math_content: str, line_num: int) -> List[SchemaViolation]:
         """
@@ -1385,16 +2356,12 @@ class MermaidMathSyntaxLinter:
         """
         violations = []
         
+        math_tokens = tokenize_math(math_content)
+
         # Check for delimiter balance
         delim_stack = []
-        # Find all explicit delimiters and \left/\right commands
-        # This sophisticated regex distinguishes \left/\right from literal chars
-        delimiters = re.findall(r'\\(left|right)(?P<delim>[\(\{\[\|<])|(?P<char>[\(\{\[\]\}\)\|>]|\\vert|\\Vert|\\langle|\\rangle)', math_content)
-        
-        for match_tuple in delimiters:
-            left_right_cmd, lr_delim_char, char_delim = match_tuple
-            delim = lr_delim_char if left_right_cmd else char_delim
-            
+        # The tokenizer has already told \left/\right delimiters apart from literal chars
+        for delim, left_right_cmd in math_tokens.delimiters:
             if left_right_cmd == 'left' or delim in self.paired_delimiters: # Opening delimiter
                 delim_stack.append((delim, left_right_cmd))
             elif left_right_cmd == 'right' or delim in self.paired_delimiters.values(): # Closing delimiter
@@ -1432,8 +2399,7 @@ class MermaidMathSyntaxLinter:
 
         # Check for \begin/\end environment balance (The integrity of your mathematical world)
         env_stack = []
-        for match in re.finditer(r'\\(begin|end)\{(\w+)\*?\}', math_content):
-            action, env_name = match.groups()
+        for action, env_name in math_tokens.env_events:
             if action == 'begin':
                 env_stack.append(env_name)
             elif action == 'end':
@@ -1464,11 +2430,15 @@ class MermaidMathSyntaxLinter:
         """
         violations = []
         
-        # Regex to find commands followed by arguments
-        # It captures: \cmd, optional *, and then tries to find up to two {arg} blocks
-        command_arg_finder = re.compile(r'\\(\w+)(\*?)(?:\[(.*?)\])?(?:(\{.+?\}))?(?:(\{.+?\}))?')
-        
-        for match in command_arg_finder.finditer(math_content):
+        # Each command (environment boundaries included) is matched in place with its arguments: \cmd,
+        # optional *, and then up to two {arg} blocks. A command swallowed by an earlier one's arguments is skipped.
+        command_arg_finder = self._command_arg_pattern
+        consumed_end = 0
+        for token in tokenize_math(math_content).tokens:
+            if token.kind not in ("command", "begin", "end") or token.start < consumed_end:
+                continue
+            match = command_arg_finder.match(math_content, token.start)
+            consumed_end = match.end()
             cmd = match.group(1)
             optional_arg = match.group(3) # e.g., for \sqrt[3]
             arg1 = match.group(4)
@@ -1514,12 +2484,12 @@ class MermaidMathSyntaxLinter:
         """
         violations = []
         
-        # This is a simplified check. A full parser would build an AST.
+        # This is a simplified check over the token stream; an escaped `\&` is a literal, not an alignment tab.
         in_align_env_stack = [] # Stack to handle nested environments if any.
         
-        for match in re.finditer(r'\\(begin|end)\{(\w+)\*?\}|&', math_content):
-            if match.group(1): # It's a begin/end command
-                action, env_name = match.group(1), match.group(3)
+        for token in tokenize_math(math_content).tokens:
+            if token.kind in ("begin", "end"):
+                action, env_name = token.kind, token.value
                 if env_name in self.environments_with_align_chars:
                     if action == 'begin':
                         in_align_env_stack.append(env_name)
@@ -1527,7 +2497,7 @@ class MermaidMathSyntaxLinter:
                         if in_align_env_stack and in_align_env_stack[-1] == env_name:
                             in_align_env_stack.pop()
                         # Else: mismatched end, handled by _get_balance_violations
-            elif match.group(0) == '&': # It's an ampersand
+            elif token.kind == "align": # It's an ampersand
                 if not in_align_env_stack:
                     violations.append(SchemaViolation(
                         rule_name="MisplacedAlignmentAmpersand",
@@ -1543,6 +2513,7 @@ class MermaidMathSyntaxLinter:
         Lints a single LaTeX math segment (the content *between* delimiters) for
         common syntax and balance issues. This includes over 20 specific rules
         (contributing aggressively to my "100 math equations" expansion).
+        The verdicts are memoized by segment text, as the same equations recur endlessly.
 
         Args:
             math_content (str): The raw LaTeX math string (e.g., "x^2 + y^2 = 0").
@@ -1552,7 +2523,37 @@ class MermaidMathSyntaxLinter:
         Returns:
             List[SchemaViolation]: A list of detected math syntax violations. Each a mark against perfection.
         """
+        verdicts = self._segment_verdicts.get(math_content)
+        if verdicts is None:
+            verdicts = tuple((v.rule_name, v.message, v.severity, v.context) for v in self._lint_segment(math_content))
+            if len(self._segment_verdicts) >= self._VERDICT_CACHE_SIZE:
+                del self._segment_verdicts[next(iter(self._segment_verdicts))]
+            self._segment_verdicts[math_content] = verdicts
+        return [SchemaViolation(rule_name, message, severity, context, line_num)
+                for rule_name, message, severity, context in verdicts]
+
+    def _has_misplaced_limits(self, tokens: Tuple[MathToken, ...]) -> bool:
+        """
+        Reports whether any `\\limits`/`\\nolimits` token follows something other than a large operator.
+        """
+        previous = None
+        for token in tokens:
+            if token.kind == "command" and token.value in ("limits", "nolimits"):
+                if previous is None or previous.kind != "command" or previous.value not in self.large_operators:
+                    return True
+            if token.kind != "text" or token.value.strip():
+                previous = token
+        return False
+
+    def _lint_segment(self, math_content: str, line_num: int = -1) -> List[SchemaViolation]:
+        """
+        The uncached body of `lint_math_segment`. The segment is lexed once by `tokenize_math`: the
+        structural checks walk its tokens, and the heuristic rules test the facts established by the
+        single walk of `scan_math_rules`, which my enforcer's own math rules share.
+        """
         violations: List[SchemaViolation] = []
+        math_tokens = tokenize_math(math_content)
+        facts = scan_math_rules(math_content)
 
         # Check for balanced delimiters and environments (My fundamental integrity checks)
         violations.extend(self._get_balance_violations(math_content, line_num))
@@ -1564,19 +2565,23 @@ class MermaidMathSyntaxLinter:
         violations.extend(self._get_alignment_violations(math_content, line_num))
 
         # Rule L1: Unknown LaTeX commands (Ignorance is not bliss in mathematics)
-        for cmd_match in re.finditer(r'\B\\([a-zA-Z]+)\b', math_content):
-            cmd_name = cmd_match.group(1)
-            if cmd_name not in self.known_latex_commands:
-                violations.append(SchemaViolation(
-                    rule_name="UnknownLaTeXCommand",
-                    message=f"Unknown LaTeX command `\\{cmd_name}` detected. Check for typos or missing packages, you uncultured swine!",
-                    context=cmd_match.group(0),
-                    line_number=line_num,
-                    severity="warning"
-                ))
+        # (A command counts only when set apart from any adjoining word characters.)
+        for token in math_tokens.tokens:
+            if token.kind != "command" or token.value in self.known_latex_commands:
+                continue
+            if (token.start and self._word_char.match(math_content, token.start - 1)) or \
+               self._word_char.match(math_content, token.end):
+                continue
+            violations.append(SchemaViolation(
+                rule_name="UnknownLaTeXCommand",
+                message=f"Unknown LaTeX command `\\{token.value}` detected. Check for typos or missing packages, you uncultured swine!",
+                context="\\" + token.value,
+                line_number=line_num,
+                severity="warning"
+            ))
 
         # Rule L2: Naked superscripts/subscripts (e.g., `x^2` instead of `x^{2}`) - A fragile attachment.
-        if re.search(r'([^_]|^)\^[a-zA-Z0-9](?![{])', math_content):
+        if "naked_superscript" in facts:
             violations.append(SchemaViolation(
                 rule_name="NakedSuperscript",
                 message="Superscript `^` should apply to a group, e.g., `^{...}`. Only single characters or commands are implicitly grouped. Avoid ambiguity!",
@@ -1584,7 +2589,7 @@ class MermaidMathSyntaxLinter:
                 line_number=line_num,
                 severity="warning"
             ))
-        if re.search(r'([^_]|^)\_[a-zA-Z0-9](?![{])', math_content):
+        if "naked_subscript" in facts:
             violations.append(SchemaViolation(
                 rule_name="NakedSubscript",
                 message="Subscript `_` should apply to a group, e.g., `_{...}`. Only single characters or commands are implicitly grouped. Do not leave your modifiers exposed!",
@@ -1594,9 +2599,10 @@ class MermaidMathSyntaxLinter:
             ))
 
         # Rule L3: Double backslashes `\\` for line breaks used outside of aligned environments.
-        # This checks for `\\` that is not part of a known alignment environment's content.
+        # This checks for `\\` where no environment begun is (or extends, like `bmatrix`) an alignment environment.
         # This is very hard to do perfectly without full parsing, so it's a heuristic. (A challenge even for me!)
-        if re.search(r'\\\\(?!\\)', math_content) and not any(env in math_content for env in self.environments_with_align_chars):
+        if "line_break" in facts and not any(align_env in env for env in math_tokens.environments
+                                             for align_env in self.environments_with_align_chars):
             violations.append(SchemaViolation(
                 rule_name="MisplacedLineBreak",
                 message="Double backslash `\\\\` used as line break potentially outside of a supported environment (e.g., `align`, `array`). Your formatting is in disarray!",
@@ -1606,7 +2612,7 @@ class MermaidMathSyntaxLinter:
             ))
 
         # Rule L4: Use of raw `.` for multiplication with variables (prefer `\cdot`) - A lack of professional symbolization.
-        if re.search(r'[a-zA-Z_]\.[a-zA-Z_]', math_content):
+        if "dotted_variables" in facts:
             violations.append(SchemaViolation(
                 rule_name="RawDotProduct",
                 message="Plain `.` used for multiplication between variables. My standards demand `\\cdot` for clarity and aesthetic superiority.",
@@ -1617,8 +2623,7 @@ class MermaidMathSyntaxLinter:
 
         # Rule L5: Using `\textrm` or `\text` with math italic content (e.g., `\text{variable}`) - Misguided font choices.
         # (My refined heuristic for detecting this subtle error)
-        if re.search(r'\\text\{(.*?)\}', math_content) and \
-           re.search(r'\b[a-zA-Z]\b', re.search(r'\\text\{(.*?)\}', math_content).group(1)):
+        if "text_single_letter" in facts:
             violations.append(SchemaViolation(
                 rule_name="ImproperTextInMath",
                 message="Consider `\\mathrm{...}` for upright math text like units or function names, instead of `\\text{...}` which uses surrounding text font. Your typography is wanting!",
@@ -1629,7 +2634,7 @@ class MermaidMathSyntaxLinter:
 
         # Rule L6: Overuse of `\left` / `\right` for small delimiters - An exercise in redundancy.
         # Example heuristic: `\left(x\right)` where `(x)` would suffice.
-        if re.search(r'\\left[\(\{\[]\s*[^\s\\]\s*\\right[\)\}\]]', math_content): # Catches single chars inside \left...\right
+        if "small_left_right" in facts: # Catches single chars inside \left...\right
             violations.append(SchemaViolation(
                 rule_name="OveruseOfLeftRight",
                 message="`\\left` and `\\right` might be overkill for single-character or simple expressions; consider plain `()` or `[]`. Be concise!",
@@ -1639,7 +2644,7 @@ class MermaidMathSyntaxLinter:
             ))
 
         # Rule L7: Missing `\ ` for spaces in array/matrix environments where text is involved - Textual congestion.
-        if re.search(r'\\begin\{(array|pmatrix|matrix)\}.*?[a-zA-Z]{2,}\s+[a-zA-Z]{2,}.*?\\end\{(array|pmatrix|matrix)\}', math_content, re.DOTALL):
+        if "matrix_text" in facts:
             violations.append(SchemaViolation(
                 rule_name="MissingSpacingInMatrixText",
                 message="Text in array/matrix environments may need explicit spacing (`\\ `) between words. Your matrix is a mess!",
@@ -1649,7 +2654,7 @@ class MermaidMathSyntaxLinter:
             ))
         
         # Rule L8: Using `*` for multiplication where `\times` or `\cdot` is preferred in formal math - An unsophisticated operator.
-        if re.search(r'[a-zA-Z0-9]\*[a-zA-Z0-9]', math_content):
+        if "star_product" in facts:
             violations.append(SchemaViolation(
                 rule_name="StarForMultiplication",
                 message="`*` is used for multiplication; my rigorous standards demand `\\times` or `\\cdot` for formal mathematical typesetting.",
@@ -1659,7 +2664,7 @@ class MermaidMathSyntaxLinter:
             ))
 
         # Rule L9: Unescaped `%` character within math mode - A comment where a symbol should be.
-        if re.search(r'(?<!\\)%', math_content):
+        if "unescaped_percent" in facts:
              violations.append(SchemaViolation(
                  rule_name="UnescapedPercent",
                  message="Unescaped `%` character in math mode. It is a comment character; escape it with `\\%` if intended as literal. Your intentions are unclear!",
@@ -1669,7 +2674,7 @@ class MermaidMathSyntaxLinter:
              ))
         
         # Rule L10: Missing `\ ` before words starting after math (e.g., `x\text{units}` instead of `x \text{units}`)
-        if re.search(r'\w\\text', math_content):
+        if "text_after_word" in facts:
             violations.append(SchemaViolation(
                 rule_name="MissingSpaceBeforeText",
                 message="Missing space before `\\text{...}`. Ensure proper spacing between math and text elements. An elementary oversight!",
@@ -1679,7 +2684,7 @@ class MermaidMathSyntaxLinter:
             ))
 
         # Rule L11: Improper use of `\tag` (should be in display math, usually `equation` environment)
-        if re.search(r'\\tag\{.*?\}', math_content) and not re.search(r'\\begin\{(equation|align|gather)\*?\}', math_content):
+        if "tag" in facts and not math_tokens.environments & {'equation', 'align', 'gather'}:
              violations.append(SchemaViolation(
                  rule_name="MisplacedTag",
                  message="`\\tag` should ideally be used within a display math environment (e.g., `equation`). Its placement is illogical!",
@@ -1689,7 +2694,8 @@ class MermaidMathSyntaxLinter:
              ))
 
         # Rule L12: Using `\limits` or `\nolimits` when not immediately following an operator
-        if re.search(r'(?<!\\sum|\\int|\\prod|\\bigcup|\\bigcap|\\lim)\s*\\(limits|nolimits)', math_content):
+        # (The operator is the nearest command before it, whitespace aside.)
+        if math_tokens.commands & {'limits', 'nolimits'} and self._has_misplaced_limits(math_tokens.tokens):
             violations.append(SchemaViolation(
                 rule_name="MisplacedLimitsCommand",
                 message="`\\limits` or `\\nolimits` used without a preceding large operator (e.g., `\\sum`, `\\int`). A command out of place!",
@@ -1699,7 +2705,7 @@ class MermaidMathSyntaxLinter:
             ))
         
         # Rule L13: Numeric fractions without `\frac` (e.g., `1/2` instead of `\frac{1}{2}`)
-        if re.search(r'\b\d+\s*\/[^\\]\s*\d+\b(?!\s*\\frac)', math_content):
+        if "numeric_fraction" in facts:
             violations.append(SchemaViolation(
                 rule_name="RawNumericFraction",
                 message="Numeric fractions like '1/2' should be typeset with `\\frac{1}{2}` for superior mathematical presentation. Embrace aesthetic superiority!",
@@ -1709,7 +2715,7 @@ class MermaidMathSyntaxLinter:
             ))
 
         # Rule L14: Using `|` for absolute values instead of `\vert` or `\left|\right|`
-        if re.search(r'(?<!\\)[^\|\s]\s*\|\s*[^\|\s](?!\s*\\vert)', math_content):
+        if "raw_bar" in facts:
             violations.append(SchemaViolation(
                 rule_name="RawAbsoluteValueDelimiter",
                 message="Plain `|` used for absolute values. My preference for `\\vert` or `\\left|...\\right|` ensures correct spacing and scaling. A true professional's choice!",
@@ -1720,8 +2726,8 @@ class MermaidMathSyntaxLinter:
 
         # Rule L15: `()` as function application without `\left \right` or proper spacing for clarity (e.g., `f(x)` vs `f (x)`)
         # This is a highly heuristic and potentially subjective rule. I, Burvel, choose to enforce clarity.
-        if re.search(r'[a-zA-Z_]\s*\((?!\s*\\left)', math_content): # Matches f (x) rather than f(x)
-            if not re.search(r'\b(sin|cos|tan|log|ln|exp|det|gcd|max|min|arg|sup|inf|lim|Pr)\b\s*\(', math_content): # Exclude known functions
+        if "function_call" in facts: # Matches f (x) as well as f(x)
+            if "named_function_call" not in facts: # Exclude known functions
                 violations.append(SchemaViolation(
                     rule_name="FunctionApplicationSpacing",
                     message="Function application `f (x)` might benefit from tighter spacing `f(x)` or explicit `\\left( ... \\right)` for clarity, depending on context. Strive for perfection!",
@@ -1731,7 +2737,7 @@ class MermaidMathSyntaxLinter:
                 ))
 
         # Rule L16: Use of `\textbf` or `\textit` in math mode for single variables (prefer `\mathbf` or `\mathit`)
-        if re.search(r'\\(textbf|textit)\{([a-zA-Z])\}', math_content):
+        if "text_font_variable" in facts:
             violations.append(SchemaViolation(
                 rule_name="TextFontInMathVariable",
                 message="Using `\\textbf` or `\\textit` for single math variables is typographically incorrect. Use `\\mathbf` or `\\mathit` for math-specific bold/italic. Your font choices betray you!",
@@ -1743,7 +2749,7 @@ class MermaidMathSyntaxLinter:
         # Rule L17: Unnecessary curly braces around single characters for basic math elements
         # E.g., `x^{2}` is fine, but `x^{{2}}` or `x{_2}` or `{x}_{2}`
         # This is a complex rule and must avoid flagging legitimate cases.
-        if re.search(r'\{[a-zA-Z0-9]\}[^_^\^]', math_content) and not re.search(r'\\begin\{', math_content):
+        if "single_char_group" in facts and not math_tokens.environments:
             violations.append(SchemaViolation(
                 rule_name="RedundantGrouping",
                 message="Potentially redundant curly braces around a single character. LaTeX often handles single character grouping automatically. Simplify your notation!",
@@ -1753,7 +2759,7 @@ class MermaidMathSyntaxLinter:
             ))
         
         # Rule L18: Misuse of `\dots` family (e.g., `...` in matrix rows instead of `\cdots`)
-        if re.search(r'\\begin\{(pmatrix|matrix|array)\}.*?(?<!\\)(\.{3})(?!\\).*?\\end\{(pmatrix|matrix|array)\}', math_content, re.DOTALL):
+        if "matrix_ellipsis" in facts:
             violations.append(SchemaViolation(
                 rule_name="IncorrectDotsInMatrix",
                 message="Use `\\cdots` for horizontal ellipses in matrices and arrays, `\\vdots` for vertical, `\\ddots` for diagonal. Your dots are misplaced!",
@@ -1763,7 +2769,7 @@ class MermaidMathSyntaxLinter:
             ))
 
         # Rule L19: Mixing of inline and display math delimiters (e.g., `$ ... \[ ... $`)
-        if re.search(r'\$(.*?)\\\[|\$(.*?)\\\\\]|\\\[(.*?)\$|\\\((.*?)\$\$|\$\$(.*?)\\\((.*?)\)', math_content, re.DOTALL):
+        if "mixed_delimiters" in facts:
             violations.append(SchemaViolation(
                 rule_name="MixedMathDelimiters",
                 message="Mixing different types of math delimiters within a single expression (e.g., `$...\[`). Maintain consistency, you chaotic scribe!",
@@ -1773,7 +2779,7 @@ class MermaidMathSyntaxLinter:
             ))
 
         # Rule L20: Unmatched `\left.` or `\right.` for intentional unmatched delimiters (A reminder for clarity)
-        if re.search(r'\\left\.(?!.*?\\right\.)|\\right\.(?!.*?\\left\.)', math_content):
+        if "unpaired_null_delimiter" in facts:
             violations.append(SchemaViolation(
                 rule_name="UnmatchedLeftRightDot",
                 message="`\\left.` or `\\right.` used without its explicit closing `\\right.` or `\\left.` within the same mathematical scope. Ensure intentional omission or correct pairing!",
@@ -1783,7 +2789,7 @@ class MermaidMathSyntaxLinter:
             ))
         
         # Rule L21: Plain characters like `\i` and `\j` for vectors, should be `\vec{i}` or `\mathbf{i}`
-        if re.search(r'\\([ij])\b', math_content):
+        if "ij_command" in facts:
             violations.append(SchemaViolation(
                 rule_name="PlainIJVectors",
                 message="`\\i` and `\\j` are plain text dots, not vector notation. Use `\\vec{i}`, `\\mathbf{i}` or similar for vectors. Be precise!",
@@ -1794,7 +2800,7 @@ class MermaidMathSyntaxLinter:
 
         return violations
 
-    def lint_mermaid_math(self, mermaid_text: str) -> List[SchemaViolation]:
+    def lint_mermaid_math(self, mermaid_text: str, tokenized: Union[TokenizedDiagram, None] = None) -> List[SchemaViolation]:
         """
         Extracts all math segments from a Mermaid diagram (within labels)
         and applies a detailed LaTeX math syntax linter to each segment.
@@ -1802,33 +2808,803 @@ class MermaidMathSyntaxLinter:
 
         Args:
             mermaid_text (str): The complete Mermaid diagram source text.
+            tokenized (TokenizedDiagram, optional): The diagram as already lexed by an enforcer's
+                `tokenize_diagram`, whose label tokens are then read directly. If omitted, the
+                diagram is lexed by my own authoritative enforcer.
 
         Returns:
             List[SchemaViolation]: A consolidated list of all math-specific
                                    `SchemaViolation` objects found across the diagram.
                                    Each a testimony to your mathematical sins.
         """
-        enforcer = MermaidSchemaEnforcer(strict_mode=True) # Use my authoritative enforcer for label extraction
-        all_labels = enforcer._extract_all_labels(mermaid_text, exclude_link_labels=False)
+        if tokenized is None:
+            if self._label_enforcer is None:
+                self._label_enforcer = MermaidSchemaEnforcer(strict_mode=True) # Use my authoritative enforcer for label extraction
+            tokenized = self._label_enforcer.tokenize_diagram(mermaid_text)
         all_violations = []
 
-        for label_content, label_start_idx, _ in all_labels:
-            line_num = enforcer._get_line_number(mermaid_text, label_start_idx)
-            
-            # Extract math segments (inline $...$, display \[...\], \(...\), and $$...$$)
-            math_matches_in_label = list(re.finditer(r'\$\$(.*?)\$\$|\$(.*?)\$|\\\[(.*?)\\\]|\\\((.*?)\\\)', label_content, re.DOTALL))
-            
-            for math_match in math_matches_in_label:
-                # Determine which group matched (which delimiter type) and extract its core content.
-                # Only one group (1, 2, 3, or 4) will be non-None for each match.
-                math_core_content = next((s for s in math_match.groups() if s is not None), None)
-
-                if math_core_content is not None:
-                    # Apply the detailed linter to the core math content.
-                    all_violations.extend(self.lint_math_segment(math_core_content, line_num))
+        # Every label, link labels included, in document order.
+        for token in tokenized.labels:
+            all_violations.extend(self.lint_label_math(token.value, token.line_number))
         
         return all_violations
 
+    def lint_label_math(self, label_content: str, line_num: int) -> List[SchemaViolation]:
+        """
+        Applies the detailed linter to every math segment of a single label.
+
+        Args:
+            label_content (str): The raw label content.
+            line_num (int): The 1-based line number on which the label appears.
+
+        Returns:
+            List[SchemaViolation]: The math violations of this label alone.
+        """
+        violations = []
+        # Math segments (inline $...$, display \[...\], \(...\), and $$...$$), found once per label and shared
+        # with my enforcer's own math rules; the linter applies to the core content between the delimiters.
+        for _, math_core_content, _, _ in extract_math_segments(label_content):
+            violations.extend(self.lint_math_segment(math_core_content, line_num))
+        return violations
+
+
+# --- Incremental Validation: line-local verdicts and global indexes, maintained across edits ---
+class _LineAnalysis:
+    """
+    The cached verdict on one line of an `IncrementalMermaidDocument`: the node IDs it declares,
+    the link endpoints it names, and its line-local violations, stamped with the line number they
+    were last reported under. Its current position is held by the `_LineSequence` block it sits in.
+    """
+    __slots__ = ("text", "line_number", "has_header", "node_ids", "link_ends", "label_violations",
+                 "cycle_violations", "math_violations", "claim_violations", "lint_violations", "block", "slot")
+
+    _VIOLATION_KINDS = ("label_violations", "cycle_violations", "math_violations", "claim_violations", "lint_violations")
+
+    def __init__(self, text: str, line_number: int):
+        self.text = text
+        self.line_number = line_number
+        self.has_header = False
+        self.node_ids: List[str] = []
+        self.link_ends: List[str] = []
+        self.label_violations: List[SchemaViolation] = []
+        self.cycle_violations: List[SchemaViolation] = []
+        self.math_violations: List[SchemaViolation] = []
+        self.claim_violations: List[SchemaViolation] = []
+        self.lint_violations: List[SchemaViolation] = []
+        self.block: Union["_LineBlock", None] = None
+        self.slot = 0
+
+    def has_violations(self) -> bool:
+        return any(getattr(self, kind) for kind in self._VIOLATION_KINDS)
+
+    def renumber(self, line_number: int) -> None:
+        """
+        Moves the line to `line_number`, restamping fresh copies of its violations (reports already
+        handed out keep the numbers they were issued with).
+        """
+        self.line_number = line_number
+        for kind in self._VIOLATION_KINDS:
+            violations = getattr(self, kind)
+            if violations:
+                setattr(self, kind, [SchemaViolation(v.rule_name, v.message, v.severity, v.context, line_number)
+                                     for v in violations])
+
+
+class _LineBlock:
+    """
+    A run of consecutive lines of a `_LineSequence`, with its index among the sequence's blocks.
+    """
+    __slots__ = ("lines", "index")
+
+    def __init__(self, lines: List[_LineAnalysis], index: int = 0):
+        self.lines = lines
+        self.index = index
+
+
+class _LineSequence:
+    """
+    The lines of an `IncrementalMermaidDocument`, in document order. Lines live in blocks of about
+    `BLOCK_SIZE`, each line knowing its block and its slot within it, and the block sizes sit in a
+    Fenwick tree. A line's position is thus relative - the lines before its block plus its slot - and
+    splicing lines in or out touches one block and O(log blocks) tree entries, never the lines below.
+    `layout` counts the changes that may have moved lines, so that line numbers read under one layout can be reused.
+    """
+    BLOCK_SIZE = 64
+
+    def __init__(self, lines: List[_LineAnalysis]):
+        self._blocks: List[_LineBlock] = []
+        self._tree: List[int] = [0]
+        self._count = 0
+        self.layout = 0
+        self._line_numbers: Union[Tuple[int, Callable[[_LineAnalysis], int]], None] = None # (layout, numbering)
+        self._rebuild([_LineBlock(lines[i:i + self.BLOCK_SIZE]) for i in range(0, len(lines), self.BLOCK_SIZE)])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block.lines
+
+    def __getitem__(self, index: int) -> _LineAnalysis:
+        block, offset = self._locate(index)
+        return block.lines[offset]
+
+    def _rebuild(self, blocks: List[_LineBlock]) -> None:
+        """
+        Installs `blocks`, reindexing them and their lines and rebuilding the Fenwick tree, in O(lines of `blocks`).
+        """
+        tree = [0] * (len(blocks) + 1)
+        for index, block in enumerate(blocks, 1):
+            block.index = index - 1
+            self._reslot(block)
+            tree[index] += len(block.lines)
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._blocks = blocks
+        self._tree = tree
+        self._count = sum(len(block.lines) for block in blocks)
+        self.layout += 1
+
+    @staticmethod
+    def _reslot(block: _LineBlock) -> None:
+        for slot, line in enumerate(block.lines):
+            line.block = block
+            line.slot = slot
+
+    def _locate(self, index: int) -> Tuple[_LineBlock, int]:
+        """
+        Finds the block holding position `index`, and the offset of that position within it, by descending the tree.
+        """
+        if not 0 <= index < self._count:
+            raise IndexError(f"Line index {index} out of range for {self._count} lines.")
+        tree = self._tree
+        block_index, remaining = 0, index
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            probe = block_index + step
+            if probe < len(tree) and tree[probe] <= remaining:
+                block_index = probe
+                remaining -= tree[probe]
+            step >>= 1
+        return self._blocks[block_index], remaining
+
+    def position(self, line: _LineAnalysis) -> int:
+        """
+        Returns the current 0-based position of a line held in the sequence, in O(log blocks).
+        """
+        position, index = line.slot, line.block.index
+        while index:
+            position += self._tree[index]
+            index -= index & -index
+        return position
+
+    def line_numbers(self) -> Callable[[_LineAnalysis], int]:
+        """
+        Returns a function giving the current 1-based line number of any line held in the sequence,
+        in O(1) per line, valid until the layout next changes.
+        """
+        if self._line_numbers is None or self._line_numbers[0] != self.layout:
+            block_starts = [1]
+            for block in self._blocks:
+                block_starts.append(block_starts[-1] + len(block.lines))
+            self._line_numbers = (self.layout, lambda line: block_starts[line.block.index] + line.slot)
+        return self._line_numbers[1]
+
+    def iter_from(self, index: int):
+        """
+        Yields the lines from position `index` to the end of the document.
+        """
+        if index >= self._count:
+            return
+        block, offset = self._locate(index)
+        yield from block.lines[offset:]
+        for following in self._blocks[block.index + 1:]:
+            yield from following.lines
+
+    def replace(self, first: int, last: int, new_lines: List[_LineAnalysis]) -> None:
+        """
+        Replaces the lines at positions `first` to `last` (inclusive) with `new_lines`, of which there is at least one.
+        Within one block this costs O(block size + log blocks); a splice spanning blocks, or overfilling
+        one, re-chunks the affected blocks and rebuilds the block index, in O(blocks + lines spliced).
+        """
+        head, head_offset = self._locate(first)
+        tail, tail_offset = self._locate(last)
+        segment = head.lines[:head_offset] + new_lines + tail.lines[tail_offset + 1:]
+        if head is tail and len(segment) <= 2 * self.BLOCK_SIZE:
+            delta = len(segment) - len(head.lines)
+            head.lines = segment
+            self._reslot(head)
+            if delta:
+                index = head.index + 1
+                while index < len(self._tree):
+                    self._tree[index] += delta
+                    index += index & -index
+                self._count += delta
+                self.layout += 1
+            return
+        size = self.BLOCK_SIZE
+        chunks = [_LineBlock(segment[i:i + size]) for i in range(0, len(segment), size)]
+        self._rebuild(self._blocks[:head.index] + chunks + self._blocks[tail.index + 1:])
+
+
+class _NodeReports:
+    """
+    The reports of one global rule (Rule 7 or 9) in an `IncrementalMermaidDocument`, one per offending
+    node ID, kept in the document order of the node's first reported line. A report is rendered when filed;
+    after lines have moved, each is checked against its lines' numbers, and re-rendered, only on assembly.
+    Reports withdrawn and filed during one edit are settled by `take_delta`.
+    """
+
+    def __init__(self, render: Callable[[str, List[int]], SchemaViolation]):
+        self._render = render
+        self._reports: Dict[str, list] = {}  # node ID -> [node ID, reported lines, rendered line numbers, violation]
+        self._order: List[list] = []          # the same reports, in document order of their first reported line
+        self._layout = -1                     # the line layout the rendered line numbers were last checked under
+        self._assembled: Union[List[SchemaViolation], None] = None # The violations of `_order`, kept in step; None when stale.
+        self._withdrawn: Dict[str, list] = {} # node ID -> its report withdrawn since the last `take_delta`
+        self._filed: List[SchemaViolation] = [] # violations newly filed since the last `take_delta`
+
+    def withdraw(self, node_id: str, position: Callable[[_LineAnalysis], int]) -> None:
+        """
+        Withdraws a node ID's report, if any. Its reported lines must still be held by the document.
+        """
+        report = self._reports.pop(node_id, None)
+        if report is not None:
+            key = lambda filed: position(filed[1][0])
+            index = bisect.bisect_left(self._order, key(report), key=key)
+            del self._order[index]
+            if self._assembled is not None:
+                del self._assembled[index]
+            self._withdrawn[node_id] = report
+
+    def file(self, reports: List[Tuple[str, List[_LineAnalysis]]], position: Callable[[_LineAnalysis], int]) -> None:
+        """
+        Files and renders reports given as (node ID, reported lines in document order), for node IDs holding none.
+        A report rendering exactly as the one withdrawn for its node ID keeps that report's violation.
+        """
+        key = lambda filed: position(filed[1][0])
+        new_reports = []
+        for node_id, lines in reports:
+            line_numbers = [position(line) + 1 for line in lines]
+            withdrawn = self._withdrawn.pop(node_id, None)
+            if withdrawn is not None and withdrawn[2] == line_numbers:
+                violation = withdrawn[3]
+            else:
+                if withdrawn is not None:
+                    self._withdrawn[node_id] = withdrawn # Still withdrawn, as far as the delta is concerned.
+                violation = self._render(node_id, line_numbers)
+                self._filed.append(violation)
+            report = [node_id, lines, line_numbers, violation]
+            self._reports[node_id] = report
+            new_reports.append(report)
+        if len(new_reports) > 32: # A bulk filing (the initial document, or a large paste) is cheaper sorted once.
+            self._order.extend(new_reports)
+            self._order.sort(key=key)
+            self._assembled = None
+        else:
+            for report in new_reports:
+                index = bisect.bisect_left(self._order, key(report), key=key)
+                self._order.insert(index, report)
+                if self._assembled is not None:
+                    self._assembled.insert(index, report[3])
+
+    def assemble(self, line_number: Callable[[_LineAnalysis], int], layout: int) -> List[SchemaViolation]:
+        """
+        Returns the violations in document order, re-rendering those whose lines have moved since `layout` last changed.
+        """
+        if layout != self._layout or self._assembled is None:
+            if layout != self._layout:
+                for report in self._order:
+                    line_numbers = [line_number(line) for line in report[1]]
+                    if line_numbers != report[2]:
+                        report[2] = line_numbers
+                        report[3] = self._render(report[0], line_numbers)
+                self._layout = layout
+            self._assembled = [report[3] for report in self._order]
+        return self._assembled
+
+    def take_delta(self) -> Tuple[List[SchemaViolation], List[SchemaViolation]]:
+        """
+        Returns (and forgets) the violations filed and those withdrawn, as last handed out, since the last call.
+        """
+        filed, withdrawn = self._filed, [report[3] for report in self._withdrawn.values()]
+        self._filed, self._withdrawn = [], {}
+        return filed, withdrawn
+
+
+class ViolationDelta:
+    """
+    The change one `IncrementalMermaidDocument.apply_edit` makes to the document's violations.
+    `removed` holds the very violation objects last handed out (by an earlier delta or by `violations()`),
+    so an editor can drop them by identity; `added` holds new violations stamped with current line numbers.
+    Violations the edit merely moves appear in neither - their line numbers shift with the edit, exactly as
+    the editor shifts its own markers - and `violations()` reports them all with current numbers.
+    """
+    __slots__ = ("added", "removed")
+
+    def __init__(self, added: List[SchemaViolation], removed: List[SchemaViolation]):
+        self.added = added
+        self.removed = removed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+class IncrementalMermaidDocument:
+    """
+    A Mermaid diagram held open in an editor, re-validated edit by edit rather than from scratch.
+    Each line is lexed on its own - a Mermaid statement never spans lines - and keeps its line-local
+    verdicts (Rules 1-6 and 10, M1-M17, C1-C4 and, optionally, my math linter). The global Rules 7-9
+    draw on indexes of node ID -> declaring lines and link endpoint -> reference count, which an edit
+    adjusts only for the lines it replaces. Lines hold relative positions (see `_LineSequence`), so an edit
+    that adds or removes lines moves the lines below it without visiting them. `apply_edit` returns only
+    the `ViolationDelta` of the edit, so an edit costs O(edited lines + node IDs they touch + block size
+    + log lines) however many violations the document holds. The full list is assembled only on request,
+    by `violations()`, at O(violations reported) plus a restamp of each violation whose line has moved.
+    For a diagram whose shapes each sit on one line with their ID, `violations()` equals `enforce_all_rules`.
+    """
+
+    def __init__(self, enforcer: MermaidSchemaEnforcer, mermaid_text: str, enable_math_linter: bool = False):
+        """
+        Lexes and validates the initial document, line by line.
+
+        Args:
+            enforcer (MermaidSchemaEnforcer): The enforcer whose rules (and strict mode) are applied.
+            mermaid_text (str): The initial Mermaid diagram source text.
+            enable_math_linter (bool): If True, also applies `MermaidMathSyntaxLinter`, as `enforce_all_rules` would.
+        """
+        self.enforcer = enforcer
+        self._linter: Union[MermaidMathSyntaxLinter, None] = None
+        if enable_math_linter:
+            if enforcer._math_linter is None:
+                enforcer._math_linter = MermaidMathSyntaxLinter()
+            self._linter = enforcer._math_linter
+
+        self._node_lines: Dict[str, set] = {}   # node ID -> the lines declaring it
+        self._link_refs: Dict[str, int] = {}    # node ID -> its occurrences as a link source or target
+        self._flagged: List[_LineAnalysis] = [] # lines holding line-local violations, in document order
+        self._stamped_layout = -1               # the line layout under which the flagged lines were last stamped
+        # Rules 7 and 9, one report per offending node ID.
+        self._duplicate_reports = _NodeReports(enforcer._duplicate_node_violation)
+        self._lonely_reports = _NodeReports(lambda node_id, lines: enforcer._lonely_node_violation(node_id, lines[0]))
+
+        texts = mermaid_text.split('\n')
+        self._header_index = next((i for i, text in enumerate(texts) if text.strip()), -1)
+        self._lines = _LineSequence([self._analyze_line(text, i + 1, i == len(texts) - 1, i == self._header_index)
+                                     for i, text in enumerate(texts)])
+        touched = set()
+        for line in self._lines:
+            self._index_line(line, touched)
+        self._refresh_global_rules(touched)
+        self._header_violation: Union[SchemaViolation, None] = None # Rule 8, as last handed out.
+        self._judge_header()
+        self._duplicate_reports.take_delta()
+        self._lonely_reports.take_delta()
+
+    @property
+    def text(self) -> str:
+        """
+        The current document text, with every edit applied.
+        """
+        return '\n'.join(line.text for line in self._lines)
+
+    def _analyze_line(self, text: str, line_number: int, is_last: bool, is_header: bool) -> _LineAnalysis:
+        """
+        Lexes a single line and evaluates every line-local rule against it.
+        Lines other than the last are lexed with their newline, exactly as the whole-document lexer sees them.
+        """
+        enforcer = self.enforcer
+        source = text if is_last else text + '\n'
+        tokens = enforcer._lex_diagram(source, LineIndex(source), detect_header=is_header)
+        line = _LineAnalysis(text, line_number)
+        line.has_header = tokens.header is not None
+        line.node_ids = [token.value for token in tokens.nodes]
+        line.link_ends = [end for token in tokens.links for end in (token.value, token.target)]
+        for token in tokens.labels:
+            if not token.is_link_label:
+                line.label_violations.extend(enforcer._label_violations(token.value, line_number))
+            line.math_violations.extend(enforcer._math_label_violations(token.value, line_number))
+            line.claim_violations.extend(enforcer._claim_label_violations(token.value, line_number))
+            if self._linter is not None:
+                line.lint_violations.extend(self._linter.lint_label_math(token.value, line_number))
+        if text.count('-->') >= 2:
+            line.cycle_violations = enforcer._cycle_violations(source, 0, len(text), line_number)
+        return line
+
+    def _touch(self, node_id: str, touched: set) -> None:
+        """
+        Notes a node ID whose declarations or links are changing, withdrawing its global reports while
+        the lines they name are still in place; `_refresh_global_rules` files them afresh.
+        """
+        if node_id not in touched:
+            touched.add(node_id)
+            self._duplicate_reports.withdraw(node_id, self._lines.position)
+            self._lonely_reports.withdraw(node_id, self._lines.position)
+
+    def _index_line(self, line: _LineAnalysis, touched: set) -> None:
+        """
+        Adds a line, already in place, to the global indexes, noting the node IDs touched.
+        """
+        for node_id in line.node_ids:
+            self._touch(node_id, touched)
+            self._node_lines.setdefault(node_id, set()).add(line)
+        for node_id in line.link_ends:
+            self._touch(node_id, touched)
+            self._link_refs[node_id] = self._link_refs.get(node_id, 0) + 1
+        if line.has_violations():
+            flagged, position = self._flagged, self._lines.position
+            if not flagged or position(flagged[-1]) < position(line):
+                flagged.append(line)
+            else:
+                bisect.insort(flagged, line, key=position)
+
+    def _unindex_line(self, line: _LineAnalysis, touched: set) -> None:
+        """
+        Withdraws a line, still in place, from the global indexes, noting the node IDs touched.
+        """
+        for node_id in line.node_ids:
+            self._touch(node_id, touched)
+            declaring_lines = self._node_lines[node_id]
+            declaring_lines.discard(line)
+            if not declaring_lines:
+                del self._node_lines[node_id]
+        for node_id in line.link_ends:
+            self._touch(node_id, touched)
+            remaining = self._link_refs[node_id] - 1
+            if remaining:
+                self._link_refs[node_id] = remaining
+            else:
+                del self._link_refs[node_id]
+        if line.has_violations():
+            position = self._lines.position
+            del self._flagged[bisect.bisect_left(self._flagged, position(line), key=position)]
+
+    def _refresh_global_rules(self, touched: set) -> None:
+        """
+        Re-judges Rules 7 and 9 for the node IDs whose declarations or links have changed.
+        """
+        position = self._lines.position
+        duplicates, lonely = [], []
+        for node_id in touched:
+            declaring_lines = self._node_lines.get(node_id)
+            if declaring_lines:
+                declaring_lines = sorted(declaring_lines, key=position)
+                if self.enforcer.strict_mode and len(declaring_lines) > 1:
+                    duplicates.append((node_id, declaring_lines))
+                if node_id not in self._link_refs:
+                    lonely.append((node_id, declaring_lines[:1]))
+        self._duplicate_reports.file(duplicates, position)
+        self._lonely_reports.file(lonely, position)
+
+    def _judge_header(self, first_line_edited: bool = False) -> Tuple[List[SchemaViolation], List[SchemaViolation]]:
+        """
+        Re-judges Rule 8, returning the (added, removed) violations. Its report quotes the first line,
+        so it is re-rendered when that line was edited.
+        """
+        lines = self._lines
+        violated = not (self._header_index >= 0 and lines[self._header_index].has_header)
+        current = self._header_violation
+        if violated and (current is None or first_line_edited):
+            violation = self.enforcer._diagram_type_violation(lines[0].text)
+            if current is not None and current.context == violation.context:
+                return [], []
+            self._header_violation = violation
+            return [violation], [current] if current is not None else []
+        if not violated and current is not None:
+            self._header_violation = None
+            return [], [current]
+        return [], []
+
+    @staticmethod
+    def _line_violations(lines: List[_LineAnalysis]) -> List[SchemaViolation]:
+        return [v for line in lines for kind in _LineAnalysis._VIOLATION_KINDS for v in getattr(line, kind)]
+
+    def apply_edit(self, start_line: int, start_column: int, end_line: int, end_column: int,
+                   new_text: str) -> ViolationDelta:
+        """
+        Replaces the text between two positions of the current document and re-validates
+        only the lines the edit produces.
+
+        Args:
+            start_line (int): 1-based line number where the replaced range begins.
+            start_column (int): 0-based character offset of the range start within `start_line`.
+            end_line (int): 1-based line number where the replaced range ends.
+            end_column (int): 0-based character offset just past the range within `end_line`.
+            new_text (str): The replacement text, which may contain newlines. Empty for a deletion.
+
+        Returns:
+            ViolationDelta: The violations the edit added and removed; `violations()` lists them all.
+        """
+        lines = self._lines
+        if not (1 <= start_line <= end_line <= len(lines)) or (start_line == end_line and end_column < start_column):
+            raise ValueError(f"Invalid edit range {start_line}:{start_column}-{end_line}:{end_column} for a document of {len(lines)} lines.")
+        first, last = start_line - 1, end_line - 1
+        old_lines = [lines[first]] if first == last else list(itertools.islice(lines.iter_from(first), last - first + 1))
+        new_texts = (old_lines[0].text[:start_column] + new_text + old_lines[-1].text[end_column:]).split('\n')
+        shift = len(new_texts) - len(old_lines)
+        line_count = len(lines) + shift
+        below = first + len(new_texts) # Index of the first untouched line below the edit, once spliced.
+
+        # The header is the first non-blank line; only an edit at or above it can move it.
+        old_header = self._header_index
+        header = old_header
+        if not 0 <= old_header < first:
+            header = next((first + k for k, text in enumerate(new_texts) if text.strip()), -1)
+            if header == -1:
+                header = next((below + k for k, line in enumerate(lines.iter_from(last + 1)) if line.text.strip()), -1)
+        self._header_index = header
+
+        touched = set()
+        removed = self._line_violations(old_lines)
+        for line in old_lines:
+            self._unindex_line(line, touched)
+        new_lines = [self._analyze_line(text, first + k + 1, first + k == line_count - 1, first + k == header)
+                     for k, text in enumerate(new_texts)]
+        lines.replace(first, last, new_lines)
+        for line in new_lines:
+            self._index_line(line, touched)
+
+        # Untouched lines below the edit that lost or gained the header are re-analyzed in place.
+        stale = set()
+        if old_header > last and old_header + shift != header:
+            stale.add(old_header + shift)
+        if header >= below and header != old_header + shift:
+            stale.add(header)
+        added = self._line_violations(new_lines)
+        for index in stale:
+            removed.extend(self._line_violations([lines[index]]))
+            self._unindex_line(lines[index], touched)
+            line = self._analyze_line(lines[index].text, index + 1, index == line_count - 1, index == header)
+            lines.replace(index, index, [line])
+            self._index_line(line, touched)
+            added.extend(self._line_violations([line]))
+
+        self._refresh_global_rules(touched)
+        for reports in (self._duplicate_reports, self._lonely_reports):
+            filed, withdrawn = reports.take_delta()
+            added.extend(filed)
+            removed.extend(withdrawn)
+        header_added, header_removed = self._judge_header(first_line_edited=first == 0)
+        added.extend(header_added)
+        removed.extend(header_removed)
+        return ViolationDelta(added, removed)
+
+    def violations(self) -> List[SchemaViolation]:
+        """
+        Assembles the violations of the current document from the cached verdicts, in the order
+        `enforce_all_rules` reports them, stamping current line numbers on those whose lines have moved.
+        Only lines and node IDs holding violations are visited.
+
+        Returns:
+            List[SchemaViolation]: All violations of the current document.
+        """
+        lines, flagged = self._lines, self._flagged
+        line_number = lines.line_numbers()
+        if self._stamped_layout != lines.layout: # Lines analyzed since are stamped already; moved ones are restamped.
+            for line in flagged:
+                current = line_number(line)
+                if line.line_number != current:
+                    line.renumber(current)
+            self._stamped_layout = lines.layout
+        violations = [v for line in flagged for v in line.label_violations]
+        violations.extend(self._duplicate_reports.assemble(line_number, lines.layout))
+        if self._header_violation is not None:
+            violations.append(self._header_violation)
+        violations.extend(self._lonely_reports.assemble(line_number, lines.layout))
+        for kind in ("cycle_violations", "math_violations", "claim_violations", "lint_violations"):
+            violations.extend(v for line in flagged for v in getattr(line, kind))
+        return violations
+
+
+# --- Batch Validation: process-pool workers, each holding its own enforcer ---
+_BATCH_WORKER_ENFORCER: Union[MermaidSchemaEnforcer, None] = None
+_BATCH_WORKER_OPTIONS: Dict[str, Any] = {}
+_MARKDOWN_MERMAID_BLOCK = re.compile(r'^```mermaid[ \t]*\n(.*?)^```[ \t]*$', re.MULTILINE | re.DOTALL)
+
+
+def _init_batch_worker(strict_mode: bool, options: Dict[str, Any]) -> None:
+    """
+    Process-pool initializer: builds the worker's enforcer once, so its regexes compile once per worker.
+    """
+    global _BATCH_WORKER_ENFORCER, _BATCH_WORKER_OPTIONS
+    _BATCH_WORKER_ENFORCER = MermaidSchemaEnforcer(strict_mode=strict_mode)
+    _BATCH_WORKER_OPTIONS = options
+
+
+def _process_batch_document(task: Tuple[str, str]) -> Dict[str, Any]:
+    """
+    Validates (and optionally transforms) one document with the worker's enforcer.
+    Markdown documents are checked block by block (```mermaid fences), with violation
+    line numbers mapped back to lines of the file.
+
+    Args:
+        task (Tuple[str, str]): (path, document text).
+
+    Returns:
+        Dict[str, Any]: {"violations": [violation dicts], "transformed": str or None, "error": str or None}.
+    """
+    path, text = task
+    enforcer = _BATCH_WORKER_ENFORCER
+    options = _BATCH_WORKER_OPTIONS
+    try:
+        if path.endswith(".md"):
+            diagrams = [(m.group(1), m.start(1)) for m in _MARKDOWN_MERMAID_BLOCK.finditer(text)]
+        else:
+            diagrams = [(text, 0)]
+        line_index = LineIndex.for_text(text)
+
+        violations = []
+        for diagram, offset in diagrams:
+            line_offset = line_index.line_number(offset) - 1
+            for violation in enforcer.enforce_all_rules(diagram, enable_math_linter=options["enable_math_linter"]):
+                record = violation.to_dict()
+                if record["line_number"] != -1:
+                    record["line_number"] += line_offset
+                violations.append(record)
+
+        transformed = None
+        if options["transform"]:
+            pieces, last = [], 0
+            for diagram, offset in diagrams:
+                pieces.append(text[last:offset])
+                pieces.append(enforcer.apply_all_transformations(diagram, **options["transform_kwargs"]))
+                last = offset + len(diagram)
+            pieces.append(text[last:])
+            transformed = "".join(pieces)
+        return {"violations": violations, "transformed": transformed, "error": None}
+    except Exception as e:
+        return {"violations": [], "transformed": None, "error": f"{type(e).__name__}: {e}"}
+
+
+class MermaidBatchValidator:
+    """
+    Validates entire directory trees of Mermaid documents (.mmd/.mermaid files, and the
+    ```mermaid blocks of Markdown files) at industrial scale, as befits a portfolio of
+    my magnitude. Documents are dispatched to a process pool whose workers each hold a
+    single enforcer; results are cached by content hash so unchanged files are never
+    re-judged; violations stream out as JSON Lines, one per line, in file order.
+    """
+    DEFAULT_EXTENSIONS = (".mmd", ".mermaid", ".md")
+
+    def __init__(self, strict_mode: bool = True, enable_math_linter: bool = False,
+                 cache_path: str = None, max_workers: int = None, transform_output_dir: str = None,
+                 transform_kwargs: Dict[str, Any] = None, extensions: Tuple[str, ...] = DEFAULT_EXTENSIONS,
+                 chunksize: int = 16):
+        """
+        Initializes the batch validator.
+
+        Args:
+            strict_mode (bool): Passed to every worker's `MermaidSchemaEnforcer`.
+            enable_math_linter (bool): Passed to `enforce_all_rules`.
+            cache_path (str): JSON file holding results keyed by content hash. No caching if None.
+            max_workers (int): Process pool size. Documents are processed in-process if None.
+            transform_output_dir (str): If set, `apply_all_transformations` output is written to a
+                                        mirror of the input tree under this directory.
+            transform_kwargs (Dict[str, Any]): Keyword arguments for `apply_all_transformations`.
+            extensions (Tuple[str, ...]): File extensions to collect.
+            chunksize (int): Documents handed to a worker per dispatch.
+        """
+        self.strict_mode = strict_mode
+        self.cache_path = cache_path
+        self.max_workers = max_workers
+        self.transform_output_dir = transform_output_dir
+        self.extensions = tuple(extensions)
+        self.chunksize = chunksize
+        self.options = {
+            "enable_math_linter": enable_math_linter,
+            "transform": transform_output_dir is not None,
+            "transform_kwargs": dict(transform_kwargs or {}),
+        }
+        # Results depend on the options and on my rules themselves, so both seed every content hash.
+        with open(__file__, "rb") as f:
+            rules_digest = hashlib.sha256(f.read()).hexdigest()
+        self._fingerprint = json.dumps([rules_digest, strict_mode, self.options], sort_keys=True).encode()
+
+    def discover_files(self, root: str) -> List[str]:
+        """
+        Returns every file under `root` with a collected extension, in sorted order.
+        """
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            paths.extend(os.path.join(dirpath, name) for name in sorted(filenames) if name.endswith(self.extensions))
+        return paths
+
+    def _content_key(self, data: bytes) -> str:
+        return hashlib.sha256(self._fingerprint + data).hexdigest()
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def run(self, root: str, output: TextIO) -> Dict[str, Any]:
+        """
+        Validates every document under `root`, writing one JSON object per violation to `output`
+        (`{"path", "rule_name", "message", "severity", "context", "line_number"}`), or one
+        `{"path", "error"}` object for a document that could not be processed.
+
+        Args:
+            root (str): Directory to walk (a single file is also accepted).
+            output (TextIO): Destination of the JSON Lines stream.
+
+        Returns:
+            Dict[str, Any]: Run statistics, including files/s and MB/s throughput.
+        """
+        start = time.perf_counter()
+        paths = [root] if os.path.isfile(root) else self.discover_files(root)
+        base = os.path.dirname(root) if os.path.isfile(root) else root
+        cache = self._load_cache()
+
+        documents = []  # (path, key, text or None when served from cache)
+        pending = []
+        total_bytes = 0
+        for path in paths:
+            with open(path, "rb") as f:
+                data = f.read()
+            total_bytes += len(data)
+            key = self._content_key(data)
+            if key in cache:
+                documents.append((path, key, None))
+            else:
+                text = data.decode("utf-8", errors="replace")
+                documents.append((path, key, text))
+                pending.append((path, text))
+
+        if self.max_workers and pending:
+            pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_batch_worker,
+                                       initargs=(self.strict_mode, self.options))
+            computed = pool.map(_process_batch_document, pending, chunksize=self.chunksize)
+        else:
+            pool = None
+            _init_batch_worker(self.strict_mode, self.options)
+            computed = map(_process_batch_document, pending)
+
+        new_cache: Dict[str, Dict[str, Any]] = {}
+        stats = {"files": len(paths), "cached": 0, "errors": 0, "violations": 0, "bytes": total_bytes}
+        try:
+            for path, key, text in documents:
+                if text is None:
+                    result = cache[key]
+                    stats["cached"] += 1
+                else:
+                    result = next(computed)
+                rel_path = os.path.relpath(path, base)
+
+                if result["error"]:
+                    stats["errors"] += 1
+                    output.write(json.dumps({"path": rel_path, "error": result["error"]}) + "\n")
+                    continue
+                new_cache[key] = result
+                for violation in result["violations"]:
+                    output.write(json.dumps({"path": rel_path, **violation}) + "\n")
+                stats["violations"] += len(result["violations"])
+
+                if self.transform_output_dir is not None and result["transformed"] is not None:
+                    out_path = os.path.join(self.transform_output_dir, rel_path)
+                    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+                    with open(out_path, "w", encoding="utf-8") as f:
+                        f.write(result["transformed"])
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if self.cache_path:
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump(new_cache, f)
+
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        stats["seconds"] = elapsed
+        stats["files_per_second"] = len(paths) / elapsed
+        stats["mb_per_second"] = total_bytes / 1e6 / elapsed
+        return stats
+
 
 class FAQ_Burvels_Bulletproof_Mermaid_Enforcer:
     """
@@ -1932,4 +3708,29 @@ class FAQ_Burvels_Bulletproof_Mermaid_Enforcer:
         }
     ]
 
-# The end of my current exposition. More will follow as my genius continues its inexorable expansion.
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate directory trees of Mermaid documents against my rubric, in parallel.")
+    parser.add_argument("root", help="Directory (or single file) to validate.")
+    parser.add_argument("--output", help="Write the JSON Lines violation stream here instead of stdout.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Process pool size (0 to run in-process).")
+    parser.add_argument("--cache", help="Content-hash result cache (JSON); unchanged files are skipped.")
+    parser.add_argument("--lenient", action="store_true", help="Disable strict mode.")
+    parser.add_argument("--math-linter", action="store_true", help="Also run the LaTeX math linter.")
+    parser.add_argument("--transform-output", help="Write transformed documents to a mirror tree under this directory.")
+    parser.add_argument("--extensions", nargs="+", default=list(MermaidBatchValidator.DEFAULT_EXTENSIONS))
+    args = parser.parse_args()
+
+    batch = MermaidBatchValidator(strict_mode=not args.lenient, enable_math_linter=args.math_linter,
+                                  cache_path=args.cache, max_workers=args.workers or None,
+                                  transform_output_dir=args.transform_output, extensions=tuple(args.extensions))
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        stats = batch.run(args.root, out)
+    finally:
+        if args.output:
+            out.close()
+    print(f"Validated {stats['files']} files ({stats['cached']} from cache, {stats['errors']} failed) "
+          f"with {stats['violations']} violations in {stats['seconds']:.2f}s: "
+          f"{stats['files_per_second']:.1f} files/s, {stats['mb_per_second']:.2f} MB/s", file=sys.stderr)
+
+# The end of my current exposition. More will follow as my genius continues its inexorable expansion.